@@ -6,5 +6,43 @@
 from .browser import BrowserManager
 from .auth import AuthManager
 from .video import VideoManager
+from .probe import PageSelectors, PageState
+from .journal import ProgressJournal
+from .blocking import ResourceBlocker
+from .media import LowBitrateProfile
+from .session import SessionSnapshot
+from .keepalive import SessionKeepAlive
+from .discovery import LinkDiscovery
+from .pipeline import PlaybackPipeline
+from .scheduler import MakespanScheduler
+from .coordinator import ShardCoordinator, ShardSettings
+from .batch import AccountBatch, BatchSettings
+from .clock import RealClock, VirtualClock
+from .timing import PhaseTimings
+from .profiler import RuntimeProfiler
+from .watchdog import TabMemoryWatchdog
 
-__all__ = ['BrowserManager', 'AuthManager', 'VideoManager']
+__all__ = [
+    'BrowserManager',
+    'AuthManager',
+    'VideoManager',
+    'PageSelectors',
+    'PageState',
+    'ProgressJournal',
+    'ResourceBlocker',
+    'LowBitrateProfile',
+    'SessionSnapshot',
+    'SessionKeepAlive',
+    'LinkDiscovery',
+    'PlaybackPipeline',
+    'MakespanScheduler',
+    'ShardCoordinator',
+    'ShardSettings',
+    'AccountBatch',
+    'BatchSettings',
+    'RealClock',
+    'VirtualClock',
+    'PhaseTimings',
+    'RuntimeProfiler',
+    'TabMemoryWatchdog',
+]
@@ -3,25 +3,112 @@
 负责Cookie管理和登录验证
 """
 
-import json
 import asyncio
 from pathlib import Path
 from typing import Optional
 from playwright.async_api import Page, BrowserContext
 from urllib.parse import urlparse
+from .keepalive import SessionKeepAlive
+from .session import SessionSnapshot
+from .timing import timings
 
 
 class AuthManager:
     """认证管理器"""
 
-    def __init__(self, page: Page, context: BrowserContext):
+    def __init__(self, page: Page, context: BrowserContext,
+                 login_host: Optional[str] = None,
+                 guest_block_text: str = "访客不能访问此课程",
+                 session: Optional[SessionSnapshot] = None):
         """
         初始化认证管理器
         :param page: Playwright页面对象
         :param context: 浏览器上下文
+        :param login_host: SSO登录页所在主机名，页面被重定向到该主机即视为Cookie失效
+        :param guest_block_text: Cookie失效时课程页面显示的提示文字
+        :param session: 上下文当前使用的会话快照（可选）
         """
         self.page = page
         self.context = context
+        self.login_host = login_host
+        self.guest_block_text = guest_block_text
+        self.session = session
+        self.keepalive: Optional[SessionKeepAlive] = None
+        self._keepalive_listener = None
+        # 缓存的Cookie有效性判断，仅在页面导航后才需要重新检查
+        self._session_valid = True
+        self._verdict_stale = False
+        self._listen(page)
+
+    def _listen(self, page: Page):
+        """监听页面导航与响应，维护缓存的Cookie有效性判断"""
+        page.on("framenavigated", self._on_frame_navigated)
+        page.on("response", self._on_response)
+
+    def set_page(self, page: Page):
+        """
+        切换到同一上下文中的新页面（如旧页面因内存占用过高被回收），保留会话与保活配置
+        :param page: Playwright页面对象
+        """
+        self.page = page
+        self._listen(page)
+
+    def for_page(self, page: Page) -> 'AuthManager':
+        """
+        为同一上下文中的另一个页面创建认证管理器（沿用相同配置）
+        :param page: Playwright页面对象
+        :return: 新的认证管理器
+        """
+        manager = AuthManager(page, self.context, self.login_host, self.guest_block_text, self.session)
+        if self.keepalive:
+            manager.use_keepalive(self.keepalive)
+        return manager
+
+    def use_keepalive(self, keepalive: SessionKeepAlive):
+        """
+        改由上下文共享的保活任务延长会话，refresh_cookies 不再逐个标签页轮询
+        :param keepalive: 会话保活任务
+        """
+        self.keepalive = keepalive
+        self._keepalive_listener = lambda: self.update_validity(True)
+        keepalive.subscribe(self._keepalive_listener)
+
+    def close(self):
+        """页面不再使用时取消保活通知（由 for_page 创建的认证管理器随标签页关闭时调用）"""
+        if self.keepalive and self._keepalive_listener:
+            self.keepalive.unsubscribe(self._keepalive_listener)
+        self._keepalive_listener = None
+
+    def _is_login_url(self, url: str) -> bool:
+        """判断URL是否指向SSO登录主机"""
+        return bool(self.login_host) and urlparse(url).netloc == self.login_host
+
+    def _on_frame_navigated(self, frame):
+        """主框架导航后使缓存的判断失效；跳转到SSO登录页则直接判定为失效"""
+        if frame.parent_frame is not None:
+            return
+        if self._is_login_url(frame.url):
+            self._session_valid = False
+            self._verdict_stale = False
+        else:
+            self._verdict_stale = True
+
+    def _on_response(self, response):
+        """主框架文档请求被重定向到SSO登录页时判定为失效"""
+        request = response.request
+        if not request.is_navigation_request() or request.frame.parent_frame is not None:
+            return
+        if 300 <= response.status < 400 and self._is_login_url(response.headers.get('location', '')):
+            self._session_valid = False
+            self._verdict_stale = False
+
+    def update_validity(self, valid: bool):
+        """
+        记录外部（如页面状态探测）得到的Cookie有效性判断
+        :param valid: Cookie是否有效
+        """
+        self._session_valid = valid
+        self._verdict_stale = False
 
     async def load_cookies(self, cookie_file: str = "cookies.json") -> bool:
         """
@@ -35,9 +122,11 @@ class AuthManager:
             return False
 
         try:
-            with open(cookie_file, 'r', encoding='utf-8') as f:
-                cookies = json.load(f)
-            await self.context.add_cookies(cookies)
+            session = SessionSnapshot.load(cookie_file)
+            if session is None:
+                return False
+            await session.apply(self.context)
+            self.session = session
             print(f"✓ Cookie已从文件加载: {cookie_file}")
             return True
         except Exception as e:
@@ -46,12 +135,13 @@ class AuthManager:
 
     async def save_cookies(self, cookie_file: str = "cookies.json"):
         """
-        保存当前浏览器的Cookie到文件
+        保存当前浏览器的Cookie到文件（同时更新内存中的会话快照）
         :param cookie_file: Cookie文件路径
         """
-        cookies = await self.context.cookies()
-        with open(cookie_file, 'w', encoding='utf-8') as f:
-            json.dump(cookies, f, indent=2, ensure_ascii=False)
+        if self.session is None:
+            self.session = SessionSnapshot()
+        await self.session.capture(self.context)
+        self.session.save(cookie_file)
         print(f"✓ Cookie已保存到: {cookie_file}")
 
     async def refresh_cookies(self, cookie_file: str = "cookies.json"):
@@ -59,47 +149,72 @@ class AuthManager:
         刷新并保存当前浏览器的Cookie到文件
         :param cookie_file: Cookie文件路径
         """
+        # 已启用共享保活任务时由其统一续期和写入文件
+        if self.keepalive:
+            return
+
         refresh_button = self.page.get_by_role('button', name='延长会话')
 
         # 检查按钮是否存在
         if await refresh_button.count() > 0:
             print("✓ 检测到延长会话按钮，正在点击以刷新Cookie...")
             await refresh_button.click()
-            await asyncio.sleep(1)  # 等待cookie更新
+            with timings.phase("idle_sleep"):
+                await asyncio.sleep(1)  # 等待cookie更新
+            # 上下文中的Cookie已是最新，只需写回文件，无需再读回
             await self.save_cookies(cookie_file)
-            await self.load_cookies(cookie_file)
 
     async def check_cookie_validity(self) -> bool:
         """
         检查Cookie是否有效
-        通过检查页面内容是否包含"访客不能访问此课程"来判断
+        优先使用由导航/响应事件维护的缓存判断；页面导航后才在主要内容区域中
+        查找"访客不能访问此课程"，不再序列化整个页面
         :return: True表示Cookie有效，False表示Cookie已失效
         """
         try:
-            page_content = await self.page.content()
-            if "访客不能访问此课程" in page_content:
+            if self._is_login_url(self.page.url):
+                self._session_valid = False
+                self._verdict_stale = False
+            elif self._verdict_stale:
+                blocked = await self.page.evaluate(
+                    """text => {
+                        const main = document.querySelector('#region-main, [role=main]') || document.body;
+                        return main ? main.textContent.includes(text) : false;
+                    }""",
+                    self.guest_block_text
+                )
+                self.update_validity(not blocked)
+
+            if not self._session_valid:
                 print("❌ 检测到Cookie已失效")
-                return False
-            return True
+            return self._session_valid
         except Exception as e:
             print(f"⚠ Cookie有效性检测出错: {e}")
             return True  # 检测失败时默认认为有效，避免误判
 
-    async def login_with_cookies(self, base_url: str, cookie_file: str = "cookies.json") -> bool:
+    async def login_with_cookies(self, base_url: str, cookie_file: str = "cookies.json",
+                                 preloaded: bool = False) -> bool:
         """
         使用Cookie登录
         :param base_url: 网站首页或任意需要登录的页面URL
         :param cookie_file: Cookie文件路径
+        :param preloaded: 上下文创建时是否已应用该文件的会话快照（是则不再重复加载）
         :return: 是否登录成功
         """
         print("正在使用Cookie登录...")
 
         # 加载Cookie
-        if not await self.load_cookies(cookie_file):
-            print("\n❌ Cookie加载失败!")
-            return False
+        if preloaded:
+            print(f"✓ 已使用会话快照: {cookie_file}")
+        else:
+            with timings.phase("cookie_load"):
+                loaded = await self.load_cookies(cookie_file)
+            if not loaded:
+                print("\n❌ Cookie加载失败!")
+                return False
         # 检查登录状态
-        return await self.check_login_status(base_url)
+        with timings.phase("login_check"):
+            return await self.check_login_status(base_url)
 
     async def check_login_status(self, base_url: str) -> bool:
         """
@@ -108,8 +223,8 @@ class AuthManager:
         :return: 是否登录成功
         """
         # 访问页面验证Cookie是否有效
-        await self.page.goto(base_url, wait_until='networkidle')
-        await asyncio.sleep(2)
+        # 服务端重定向在 load 事件前即已完成，无需等待网络空闲
+        await self.page.goto(base_url, wait_until='load')
 
         # 检查是否发生重定向（登录失败会被重定向到登录页）
         current_url = self.page.url
@@ -0,0 +1,191 @@
+"""
+多账号批量模块
+所有账号共用一个浏览器进程，每个账号使用独立的浏览器上下文（Cookie、缓存互相隔离）并发观看，
+所有账号的播放标签页共享一个全局名额上限
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlparse
+from .auth import AuthManager
+from .browser import BrowserManager
+from .journal import ProgressJournal
+from .keepalive import SessionKeepAlive
+from .media import LowBitrateProfile
+from .probe import PageSelectors
+from .session import SessionSnapshot
+from .video import VideoManager
+from .watchdog import TabMemoryWatchdog
+
+
+@dataclass
+class Account:
+    """一个待批量观看的账号"""
+    name: str
+    cookie_file: str
+    # 该账号要观看的课程页面，留空则使用全局配置的课程
+    course_urls: List[str] = field(default_factory=list)
+
+
+def load_accounts(path: str) -> List[Account]:
+    """
+    读取账号列表
+    目录：其中每个 *.json 文件是一个账号的Cookie文件，文件名即账号名
+    清单文件：JSON 数组，元素为Cookie文件路径，或 {"name", "cookie_file", "course_urls"} 对象，
+    相对路径以清单文件所在目录为准
+    :param path: 目录或清单文件路径
+    :return: 账号列表
+    """
+    source = Path(path)
+    if source.is_dir():
+        return [Account(file.stem, str(file)) for file in sorted(source.glob("*.json"))]
+
+    with open(source, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError(f"账号清单应为 JSON 数组: {path}")
+
+    accounts = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'cookie_file': entry}
+        cookie_file = source.parent / entry['cookie_file']
+        accounts.append(Account(
+            entry.get('name') or cookie_file.stem,
+            str(cookie_file),
+            list(entry.get('course_urls') or [])
+        ))
+    return accounts
+
+
+@dataclass
+class BatchSettings:
+    """批量观看的公共配置"""
+    base_url: str
+    course_urls: List[str]
+    url_pattern: str
+    login_host: Optional[str] = None
+    selectors: PageSelectors = field(default_factory=PageSelectors)
+    default_wait_time: int = 60
+    tabs_per_account: int = 1
+    tab_budget: int = 4
+    prescan_concurrency: int = 8
+    link_cache_ttl: float = 3600
+    keepalive_interval: float = 300
+    media_profile: Optional[LowBitrateProfile] = None
+    watchdog: Optional[TabMemoryWatchdog] = None
+
+
+class AccountBatch:
+    """多账号批量观看"""
+
+    def __init__(self, browser_manager: BrowserManager, settings: BatchSettings):
+        """
+        初始化批量观看
+        :param browser_manager: 已启动的浏览器管理器（所有账号共用其浏览器进程）
+        :param settings: 公共配置
+        """
+        self.browser_manager = browser_manager
+        self.settings = settings
+        self.tab_budget = asyncio.Semaphore(max(settings.tab_budget, 1))
+
+    async def run(self, accounts: List[Account]):
+        """
+        并发运行所有账号，单个账号失败不影响其他账号，结束后打印汇总
+        :param accounts: 账号列表
+        """
+        print(f"\n👥 批量模式: {len(accounts)} 个账号, 全局播放标签页上限 {self.settings.tab_budget}")
+        results = await asyncio.gather(
+            *(self.run_account(account) for account in accounts),
+            return_exceptions=True
+        )
+
+        print(f"\n{'='*60}")
+        print("👥 批量观看结束:")
+        for account, result in zip(accounts, results):
+            if isinstance(result, BaseException):
+                print(f"  ❌ {account.name}: {result}")
+            else:
+                completed, failures = result
+                print(f"  ✓ {account.name}: 成功 {len(completed)} 个, 失败 {len(failures)} 个")
+
+    async def run_account(self, account: Account):
+        """
+        在独立上下文中登录并观看一个账号的所有视频
+        :param account: 账号
+        :return: (成功的视频链接列表, [(失败的视频链接, 原因), ...])
+        """
+        settings = self.settings
+        session = SessionSnapshot.load(account.cookie_file)
+        if session is None:
+            raise Exception(f"Cookie文件不存在或无法读取: {account.cookie_file}")
+
+        context = await self.browser_manager.new_context(session)
+        keepalive = None
+        try:
+            page = await context.new_page()
+            auth_manager = AuthManager(
+                page,
+                context,
+                login_host=settings.login_host,
+                guest_block_text=settings.selectors.guest_block_text,
+                session=session
+            )
+            print(f"\n[{account.name}] 正在登录...")
+            if not await auth_manager.login_with_cookies(settings.base_url, account.cookie_file, preloaded=True):
+                raise Exception("Cookie已失效，请重新获取Cookie")
+
+            keepalive = SessionKeepAlive(context, session, account.cookie_file, interval=settings.keepalive_interval,
+                                         session_host=urlparse(settings.base_url).hostname)
+            await keepalive.start()
+            auth_manager.use_keepalive(keepalive)
+
+            # 各账号的完成状态和可见的课程内容不同，进度记录和链接缓存按账号分开保存在Cookie文件旁
+            # （多个账号同时写同一个缓存文件会互相覆盖）
+            journal_path = Path(account.cookie_file).with_suffix('.progress.jsonl')
+            link_cache_path = Path(account.cookie_file).with_suffix('.links.json')
+            video_manager = VideoManager(
+                page,
+                auth_manager,
+                settings.selectors,
+                ProgressJournal(str(journal_path)),
+                settings.media_profile,
+                watchdog=settings.watchdog
+            )
+
+            video_links = await video_manager.discover_video_links(
+                account.course_urls or settings.course_urls,
+                settings.url_pattern,
+                str(link_cache_path),
+                settings.link_cache_ttl
+            )
+            video_links = video_manager.journal.plan(video_links)
+            if video_links and settings.prescan_concurrency > 0:
+                video_links = await video_manager.prescan_videos(video_links, settings.prescan_concurrency)
+            if not video_links:
+                print(f"\n[{account.name}] ✓ 所有视频均已完成")
+                return [], []
+
+            tab_count = min(settings.tabs_per_account, settings.tab_budget, len(video_links))
+            print(f"\n[{account.name}] 开始观看 {len(video_links)} 个视频 (标签页: {tab_count})")
+            queue: asyncio.Queue = asyncio.Queue()
+            for i, link in enumerate(video_links, 1):
+                queue.put_nowait((i, link))
+            for _ in range(tab_count):
+                queue.put_nowait(None)
+            return await video_manager.run_playback_workers(
+                queue,
+                tab_count,
+                settings.selectors.video,
+                settings.selectors.play_button,
+                settings.default_wait_time,
+                total=len(video_links),
+                tab_budget=self.tab_budget
+            )
+        finally:
+            if keepalive:
+                await keepalive.stop()
+            await context.close()
@@ -0,0 +1,81 @@
+"""
+请求拦截模块
+在浏览器上下文上拦截视频播放不需要的资源（图片、字体、统计脚本等），减少导航耗时和流量
+"""
+
+from collections import Counter
+from typing import Iterable
+from playwright.async_api import BrowserContext, Route, Response
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "font")
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "hm.baidu.com",
+    "cnzz.com",
+)
+
+
+class ResourceBlocker:
+    """资源拦截器"""
+
+    def __init__(self,
+                 blocked_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+                 blocked_url_patterns: Iterable[str] = DEFAULT_BLOCKED_URL_PATTERNS,
+                 allowed_url_patterns: Iterable[str] = ()):
+        """
+        初始化资源拦截器
+        :param blocked_resource_types: 需要拦截的资源类型（image, font, stylesheet, media 等）
+        :param blocked_url_patterns: URL中包含任一片段即拦截
+        :param allowed_url_patterns: URL中包含任一片段即放行（优先于拦截规则）
+        """
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.blocked_url_patterns = tuple(blocked_url_patterns)
+        self.allowed_url_patterns = tuple(allowed_url_patterns)
+        self.blocked = Counter()
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+
+    async def attach(self, context: BrowserContext):
+        """
+        在浏览器上下文上启用拦截
+        :param context: 浏览器上下文
+        """
+        await context.route("**/*", self._handle_route)
+        context.on("response", self._on_response)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """
+        判断请求是否需要拦截
+        :param url: 请求URL
+        :param resource_type: 请求的资源类型
+        :return: 是否拦截
+        """
+        if any(pattern in url for pattern in self.allowed_url_patterns):
+            return False
+        return (resource_type in self.blocked_resource_types
+                or any(pattern in url for pattern in self.blocked_url_patterns))
+
+    async def _handle_route(self, route: Route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.blocked[request.resource_type] += 1
+            await route.abort("blockedbyclient")
+        else:
+            # 交给其他路由处理器（如有），否则正常发出请求
+            await route.fallback()
+
+    def _on_response(self, response: Response):
+        """统计放行请求的传输字节数（取自 Content-Length，无需额外往返）"""
+        self.allowed_requests += 1
+        length = response.headers.get('content-length')
+        if length and length.isdigit():
+            self.allowed_bytes += int(length)
+
+    def report(self):
+        """打印拦截统计"""
+        total_blocked = sum(self.blocked.values())
+        print(f"\n🛡️ 资源拦截统计: 已拦截 {total_blocked} 个请求, "
+              f"放行 {self.allowed_requests} 个请求 (约 {self.allowed_bytes / 1024 / 1024:.1f} MB)")
+        for resource_type, count in self.blocked.most_common():
+            print(f"  - {resource_type}: {count}")
@@ -3,48 +3,206 @@
 负责浏览器的启动、配置和关闭
 """
 
+import shutil
+from pathlib import Path
+from typing import Optional
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from .blocking import ResourceBlocker
+from .media import LowBitrateProfile
+from .session import SessionSnapshot
+
+# 启动浏览器时使用的命令行参数
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',  # 防止网站检测自动化
+    '--mute-audio'  # 静音浏览器
+]
+
+# "bulk" 启动配置：大量静音标签页在后台同时播放时使用
+# 默认情况下非前台标签页的定时器会被节流、媒体会被暂停，只有当前标签页能正常播放
+BULK_PLAYBACK_ARGS = [
+    '--disable-background-timer-throttling',  # 后台标签页的定时器不节流
+    '--disable-backgrounding-occluded-windows',  # 被遮挡或最小化的窗口不降级为后台
+    '--disable-renderer-backgrounding',  # 后台标签页的渲染进程保持正常优先级
+    '--disable-background-media-suspend',  # 后台标签页的媒体不被挂起
+    '--autoplay-policy=no-user-gesture-required',  # 新标签页无需用户操作即可开始播放
+]
+
+# 无头模式下画面无人观看，GPU进程和合成只会占用资源
+HEADLESS_BULK_ARGS = [
+    '--disable-gpu',
+    '--disable-software-rasterizer',
+]
+
+LAUNCH_PROFILES = ("default", "bulk")
+
+
+def launch_args(profile: str = "default", headless: bool = False) -> list:
+    """
+    获取启动配置对应的浏览器命令行参数
+    :param profile: 启动配置名称 (default, bulk)
+    :param headless: 是否使用无头模式
+    :return: 命令行参数列表
+    """
+    if profile not in LAUNCH_PROFILES:
+        raise ValueError(f"未知的启动配置: {profile}，可选值: {', '.join(LAUNCH_PROFILES)}")
+    args = list(LAUNCH_ARGS)
+    if profile == "bulk":
+        args += BULK_PLAYBACK_ARGS
+        if headless:
+            args += HEADLESS_BULK_ARGS
+    return args
 
 
 class BrowserManager:
     """浏览器管理器"""
 
-    def __init__(self, browser_type: str = "msedge", headless: bool = False):
+    def __init__(self, browser_type: str = "msedge", headless: bool = False,
+                 resource_blocker: Optional[ResourceBlocker] = None,
+                 media_profile: Optional[LowBitrateProfile] = None,
+                 user_data_dir: Optional[str] = None,
+                 cache_size_mb: Optional[int] = None,
+                 endpoint: Optional[str] = None,
+                 session: Optional[SessionSnapshot] = None,
+                 launch_profile: str = "default"):
         """
         初始化浏览器管理器
         :param browser_type: 浏览器类型 (chrome, msedge, firefox)
         :param headless: 是否使用无头模式
+        :param resource_blocker: 资源拦截器，启用后拦截播放不需要的资源（可选）
+        :param media_profile: 最低码率播放配置，启用后改写 HLS/DASH 清单（可选）
+        :param user_data_dir: 持久化浏览器配置目录，设置后会话状态和HTTP缓存在多次运行间保留（可选）
+        :param cache_size_mb: 持久化配置下HTTP磁盘缓存的上限(MB)
+        :param endpoint: 已运行浏览器的连接地址，设置后直接连接而不启动新浏览器（可选）
+                         http(s):// 或 ws://.../devtools/browser/... 使用CDP连接，其他 ws:// 地址视为 Playwright 浏览器服务
+        :param session: 会话快照，创建上下文时直接应用其中的Cookie和localStorage（可选）
+        :param launch_profile: 启动配置，"bulk" 适用于多个标签页同时在后台播放（连接已运行的浏览器时不生效）
         """
         self.browser_type = browser_type
         self.headless = headless
+        self.resource_blocker = resource_blocker
+        self.media_profile = media_profile
+        self.user_data_dir = user_data_dir
+        self.cache_size_mb = cache_size_mb
+        self.endpoint = endpoint
+        self.session = session
+        self.launch_profile = launch_profile
         self.playwright = None
         self.browser: Browser = None
         self.context: BrowserContext = None
         self.page: Page = None
+        self._context_closed = False
+        self._context_options = {
+            'viewport': {'width': 1920, 'height': 1080},
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        }
 
     async def setup(self):
         """启动浏览器并创建页面"""
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            channel=self.browser_type,
-            headless=self.headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',  # 防止网站检测自动化
-                '--mute-audio'  # 静音浏览器
-            ]
-        )
-        self.context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
-        self.page = await self.context.new_page()
-        print("✓ 浏览器启动成功 (已静音)")
+        args = launch_args(self.launch_profile, self.headless)
+        if self.endpoint:
+            # 连接已运行的浏览器，只新建独立的上下文，退出时浏览器保持运行
+            if self.endpoint.startswith(('http://', 'https://')) or '/devtools/browser/' in self.endpoint:
+                self.browser = await self.playwright.chromium.connect_over_cdp(self.endpoint)
+            else:
+                self.browser = await self.playwright.chromium.connect(self.endpoint)
+            self.context = await self._create_context(self.session)
+        elif self.user_data_dir:
+            # 持久化配置：Cookie、localStorage 和HTTP磁盘缓存在多次运行间保留
+            if self.resource_blocker or self.media_profile:
+                # 上下文启用请求拦截(context.route)后 Playwright 会禁用HTTP缓存
+                print("⚠ 资源拦截(BLOCK_RESOURCES)或最低码率(LOW_BITRATE)已启用，"
+                      "浏览器将不使用HTTP缓存，持久化配置目录只保留登录状态")
+            if self.cache_size_mb:
+                args.append(f'--disk-cache-size={self.cache_size_mb * 1024 * 1024}')
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                self.user_data_dir,
+                channel=self.browser_type,
+                headless=self.headless,
+                args=args,
+                **self._context_options
+            )
+            self.browser = self.context.browser  # 持久化上下文没有独立的 Browser 对象时为 None
+            # 持久化上下文无法在创建时传入 storage_state，启动后再应用快照
+            if self.session:
+                await self.session.apply(self.context)
+        else:
+            self.browser = await self.playwright.chromium.launch(
+                channel=self.browser_type,
+                headless=self.headless,
+                args=args
+            )
+            self.context = await self._create_context(self.session)
+        self.context.on("close", lambda _: setattr(self, '_context_closed', True))
+        await self._attach_profiles(self.context)
+        # 持久化上下文启动时自带一个空白页，直接复用
+        self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        if self.endpoint:
+            print(f"✓ 已连接到运行中的浏览器: {self.endpoint}")
+        else:
+            print("✓ 浏览器启动成功 (已静音)")
+
+    async def _create_context(self, session: Optional[SessionSnapshot]) -> BrowserContext:
+        """创建上下文，有会话快照时直接应用"""
+        if session:
+            return await session.new_context(self.browser, **self._context_options)
+        return await self.browser.new_context(**self._context_options)
+
+    async def _attach_profiles(self, context: BrowserContext):
+        """在上下文上启用资源拦截和码率配置"""
+        if self.resource_blocker:
+            await self.resource_blocker.attach(context)
+        if self.media_profile:
+            await self.media_profile.attach(context)
+
+    async def new_context(self, session: Optional[SessionSnapshot] = None) -> BrowserContext:
+        """
+        在同一浏览器中创建一个新的独立上下文（与主上下文使用相同的配置）
+        :param session: 会话快照，默认使用初始化时传入的快照
+        :return: 新的浏览器上下文
+        """
+        if not self.browser:
+            raise Exception("持久化配置模式下无法创建额外的独立上下文")
+        context = await self._create_context(session or self.session)
+        await self._attach_profiles(context)
+        return context
 
     async def close(self):
         """关闭浏览器"""
-        if self.browser:
+        if self.resource_blocker:
+            self.resource_blocker.report()
+        if self.endpoint:
+            # 只关闭本次创建的上下文，共享的浏览器继续运行供下次连接
+            if self.context and not self._context_closed:
+                await self.context.close()
+            print("\n✓ 已断开与浏览器的连接 (浏览器保持运行)")
+        elif self.browser:
             await self.browser.close()
             print("\n✓ 浏览器已关闭")
+        elif self.context and not self._context_closed:
+            await self.context.close()
+            print("\n✓ 浏览器已关闭")
+
+    def is_attached(self) -> bool:
+        """是否连接的是外部运行的浏览器"""
+        return bool(self.endpoint)
+
+    def is_connected(self) -> bool:
+        """浏览器是否仍在运行"""
+        if self.browser:
+            return self.browser.is_connected()
+        return self.context is not None and not self._context_closed
+
+    @staticmethod
+    def clear_cache(user_data_dir: str):
+        """
+        清除持久化配置目录中的HTTP缓存（保留Cookie等会话状态）
+        :param user_data_dir: 持久化浏览器配置目录
+        """
+        profile = Path(user_data_dir) / "Default"
+        for name in ("Cache", "Code Cache", "GPUCache"):
+            shutil.rmtree(profile / name, ignore_errors=True)
+        print(f"✓ 已清除浏览器缓存: {user_data_dir}")
 
     def get_page(self) -> Page:
         """获取当前页面对象"""
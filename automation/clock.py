@@ -0,0 +1,129 @@
+"""
+时钟模块
+播放与调度代码通过可注入的时钟获取时间和等待，真实运行时使用事件循环时间，
+模拟时使用虚拟时钟在几秒内跑完数百小时的播放流程
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+
+
+def format_time(seconds: float) -> str:
+    """
+    将秒数格式化为友好的时分秒格式
+    :param seconds: 秒数
+    :return: 格式化后的字符串，如 "1:23:45" 或 "12:34"
+    """
+    seconds = int(seconds)
+    if seconds < 0:
+        return "0:00"
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+class RealClock:
+    """真实时钟：事件循环的单调时间和 asyncio.sleep"""
+
+    def time(self) -> float:
+        """当前时间(秒，单调递增)"""
+        return asyncio.get_running_loop().time()
+
+    def wall_time(self) -> float:
+        """当前的日历时间(Unix 时间戳)，用于显示预计完成时刻"""
+        return time.time()
+
+    async def sleep(self, seconds: float):
+        """等待指定时间(秒)"""
+        await asyncio.sleep(seconds)
+
+    async def wait_for(self, awaitable, timeout: float):
+        """
+        等待可等待对象完成，超时抛出 asyncio.TimeoutError
+        :param awaitable: 可等待对象
+        :param timeout: 最长等待时间(秒)
+        :return: 可等待对象的结果
+        """
+        return await asyncio.wait_for(awaitable, timeout)
+
+
+class VirtualClock(RealClock):
+    """
+    虚拟时钟：sleep 不真正等待，所有任务都在等待时钟时直接跳到最早的唤醒时间
+    被测代码中除时钟外不应有真实的IO等待
+    """
+
+    # 推进时间前让已就绪的任务运行的轮数（覆盖队列交接等不经过时钟的等待链）
+    SETTLE_ROUNDS = 20
+
+    def __init__(self, start: float = 0.0):
+        """
+        初始化虚拟时钟
+        :param start: 起始时间(秒)
+        """
+        self.now = start
+        self._start = start
+        self._epoch = time.time()
+        self._sleepers = []
+        self._sequence = itertools.count()
+
+    def time(self) -> float:
+        return self.now
+
+    def wall_time(self) -> float:
+        return self._epoch + (self.now - self._start)
+
+    async def sleep(self, seconds: float):
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + seconds, next(self._sequence), future))
+        await future
+
+    async def wait_for(self, awaitable, timeout: float):
+        task = asyncio.ensure_future(awaitable)
+        timer = asyncio.ensure_future(self.sleep(timeout))
+        try:
+            await asyncio.wait((task, timer), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            timer.cancel()
+            if not task.done():
+                task.cancel()
+        if not task.done() or task.cancelled():
+            raise asyncio.TimeoutError()
+        return task.result()
+
+    async def run(self, coro):
+        """
+        运行协程直到结束，期间每当所有任务都在等待时钟就推进虚拟时间
+        :param coro: 要运行的协程
+        :return: 协程的返回值
+        """
+        task = asyncio.ensure_future(coro)
+        while not task.done():
+            for _ in range(self.SETTLE_ROUNDS):
+                await asyncio.sleep(0)
+                if task.done():
+                    break
+            if task.done():
+                break
+            # 已被取消的等待（如 wait_for 先于超时完成）不再参与推进时间
+            while self._sleepers and self._sleepers[0][2].done():
+                heapq.heappop(self._sleepers)
+            if not self._sleepers:
+                task.cancel()
+                raise Exception(f"模拟已停滞: 没有任务在等待时钟 (虚拟时间 {self.now:.0f} 秒)")
+
+            # 跳到最早的唤醒时间，并唤醒同一时刻的所有任务
+            wake_at = self._sleepers[0][0]
+            self.now = max(self.now, wake_at)
+            while self._sleepers and self._sleepers[0][0] <= self.now:
+                _, _, future = heapq.heappop(self._sleepers)
+                if not future.done():
+                    future.set_result(None)
+        return task.result()
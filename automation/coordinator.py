@@ -0,0 +1,288 @@
+"""
+多进程分片模块
+将待观看的视频分成若干分片，每个分片由独立的工作进程（各自的事件循环和浏览器）播放，
+协调进程通过进程间队列汇总进度、失败和完成记录
+"""
+
+import asyncio
+import multiprocessing
+import queue as queue_module
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from .auth import AuthManager
+from .blocking import ResourceBlocker
+from .browser import BrowserManager
+from .journal import ProgressJournal, ProgressRecord
+from .keepalive import SessionKeepAlive
+from .media import LowBitrateProfile
+from .probe import PageSelectors
+from .session import SessionSnapshot
+from .video import VideoManager
+from .timing import timings
+from .watchdog import TabMemoryWatchdog
+
+# 工作进程发送给协调进程的消息类型，消息格式为 (类型, 分片序号, 内容)
+MSG_READY = "ready"
+MSG_PROGRESS = "progress"
+MSG_DONE = "done"
+MSG_ERROR = "error"
+MSG_TIMING = "timing"
+
+
+@dataclass
+class ShardSettings:
+    """工作进程的启动参数（需可序列化，在进程间传递）"""
+    browser_type: str = "msedge"
+    headless: bool = True
+    cookie_file: str = "cookies.json"
+    progress_file: str = "progress.jsonl"
+    base_url: str = ""
+    login_host: Optional[str] = None
+    selectors: PageSelectors = field(default_factory=PageSelectors)
+    default_wait_time: int = 60
+    tabs: int = 1
+    keepalive_interval: float = 300
+    block_rules: Optional[Tuple[list, list, list]] = None
+    low_bitrate: bool = False
+    launch_profile: str = "default"
+    tab_heap_limit_mb: float = 0
+    tab_node_limit: int = 0
+
+
+class _ForwardingJournal(ProgressJournal):
+    """工作进程使用的进度日志：只在内存中更新，由协调进程统一写入文件"""
+
+    def __init__(self, path: str, shard_index: int, messages):
+        super().__init__(path)
+        self.shard_index = shard_index
+        self.messages = messages
+
+    def _append(self, record: ProgressRecord):
+        self.messages.put((MSG_PROGRESS, self.shard_index, {
+            'url': record.url,
+            'completed': record.completed,
+            'duration': record.duration,
+            'watched': record.watched,
+        }))
+
+
+def split_shards(video_links: List[str], shard_count: int) -> List[List[str]]:
+    """
+    轮流分配视频链接，每个分片内保持原有顺序
+    :param video_links: 视频链接列表
+    :param shard_count: 分片数量
+    :return: 非空分片列表
+    """
+    shards = [video_links[k::shard_count] for k in range(shard_count)]
+    return [shard for shard in shards if shard]
+
+
+def run_shard(shard_index: int, video_links: List[str], settings: ShardSettings, messages):
+    """
+    工作进程入口：运行独立的事件循环播放一个分片
+    :param shard_index: 分片序号
+    :param video_links: 该分片的视频链接
+    :param settings: 启动参数
+    :param messages: 发往协调进程的消息队列
+    """
+    try:
+        completed, failures = asyncio.run(_play_shard(shard_index, video_links, settings, messages))
+        result = (MSG_DONE, shard_index, {'completed': completed, 'failures': failures})
+    except BaseException as e:
+        result = (MSG_ERROR, shard_index, str(e) or type(e).__name__)
+    # 阶段耗时记录在本进程内，结束前发回协调进程汇总到同一份报告
+    messages.put((MSG_TIMING, shard_index, timings.export()))
+    messages.put(result)
+
+
+async def _play_shard(shard_index: int, video_links: List[str], settings: ShardSettings,
+                      messages) -> Tuple[List[str], List[tuple]]:
+    session = SessionSnapshot.load(settings.cookie_file)
+    if session is None:
+        raise Exception(f"Cookie文件不存在或无法读取: {settings.cookie_file}")
+
+    browser_manager = BrowserManager(
+        browser_type=settings.browser_type,
+        headless=settings.headless,
+        resource_blocker=ResourceBlocker(*settings.block_rules) if settings.block_rules else None,
+        media_profile=LowBitrateProfile() if settings.low_bitrate else None,
+        session=session,
+        launch_profile=settings.launch_profile
+    )
+    keepalive = None
+    watchdog = None
+    if settings.tab_heap_limit_mb > 0:
+        watchdog = TabMemoryWatchdog(settings.tab_heap_limit_mb, settings.tab_node_limit)
+    try:
+        await browser_manager.setup()
+        page = browser_manager.get_page()
+        context = browser_manager.get_context()
+        auth_manager = AuthManager(
+            page,
+            context,
+            login_host=settings.login_host,
+            guest_block_text=settings.selectors.guest_block_text,
+            session=session
+        )
+        if not await auth_manager.login_with_cookies(settings.base_url, settings.cookie_file, preloaded=True):
+            raise Exception("Cookie已失效，请重新获取Cookie")
+
+        keepalive = SessionKeepAlive(context, session, settings.cookie_file, interval=settings.keepalive_interval,
+                                     session_host=urlparse(settings.base_url).hostname)
+        await keepalive.start()
+        auth_manager.use_keepalive(keepalive)
+
+        video_manager = VideoManager(
+            page,
+            auth_manager,
+            settings.selectors,
+            _ForwardingJournal(settings.progress_file, shard_index, messages),
+            browser_manager.media_profile,
+            watchdog=watchdog
+        )
+        messages.put((MSG_READY, shard_index, {}))
+
+        tab_count = min(settings.tabs, len(video_links))
+        queue: asyncio.Queue = asyncio.Queue()
+        for i, link in enumerate(video_links, 1):
+            queue.put_nowait((i, link))
+        for _ in range(tab_count):
+            queue.put_nowait(None)
+        return await video_manager.run_playback_workers(
+            queue,
+            tab_count,
+            settings.selectors.video,
+            settings.selectors.play_button,
+            settings.default_wait_time,
+            total=len(video_links)
+        )
+    finally:
+        if watchdog:
+            watchdog.print_report()
+        if keepalive:
+            await keepalive.stop()
+        await browser_manager.close()
+        if browser_manager.playwright:
+            await browser_manager.playwright.stop()
+
+
+class ShardCoordinator:
+    """多进程分片协调器"""
+
+    # 等待消息的轮询间隔(秒)，超时后检查是否有工作进程异常退出
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, settings: ShardSettings, shard_count: int,
+                 journal: Optional[ProgressJournal] = None):
+        """
+        初始化协调器
+        :param settings: 工作进程的启动参数
+        :param shard_count: 工作进程数量
+        :param journal: 观看进度日志，工作进程的进度记录统一由协调进程写入
+        """
+        self.settings = settings
+        self.shard_count = shard_count
+        self.journal = journal
+        # 收到完成记录的视频，工作进程异常退出时据此区分已完成和未完成的视频
+        self._completed_urls = set()
+
+    async def run(self, video_links: List[str]) -> Tuple[List[str], List[tuple]]:
+        """
+        启动工作进程播放所有视频，等待全部结束并打印汇总
+        :param video_links: 视频链接列表
+        :return: (成功的视频链接列表, [(失败的视频链接, 原因), ...])
+        """
+        if self.journal:
+            # 与单进程模式一致：跳过已完成的视频，已看过一部分的视频优先分配
+            planned = self.journal.plan(video_links)
+            if len(planned) < len(video_links):
+                print(f"\n📒 根据进度记录跳过 {len(video_links) - len(planned)} 个已完成的视频")
+            video_links = planned
+            if not video_links:
+                print("✓ 所有视频均已完成，无需观看")
+                return [], []
+        shards = split_shards(video_links, self.shard_count)
+        print(f"\n🧩 将 {len(video_links)} 个视频分为 {len(shards)} 个分片, "
+              f"每个工作进程 {self.settings.tabs} 个标签页")
+
+        # 统一使用 spawn：各平台行为一致，且子进程不会继承父进程的事件循环和浏览器连接
+        mp_context = multiprocessing.get_context('spawn')
+        messages = mp_context.Queue()
+        processes = {}
+        for index, shard in enumerate(shards, 1):
+            process = mp_context.Process(
+                target=run_shard,
+                args=(index, shard, self.settings, messages),
+                name=f"shard-{index}",
+                daemon=True
+            )
+            process.start()
+            processes[index] = process
+
+        started_at = time.perf_counter()
+        completed: List[str] = []
+        failures: List[tuple] = []
+        finished: Dict[int, bool] = {}
+        loop = asyncio.get_running_loop()
+        try:
+            while len(finished) < len(shards):
+                message = await loop.run_in_executor(None, self._next_message, messages)
+                if message is None:
+                    # 工作进程未发送结束消息就退出（如崩溃），按整个分片失败处理
+                    for index, process in processes.items():
+                        if index not in finished and not process.is_alive():
+                            finished[index] = False
+                            reason = f"工作进程异常退出 (退出码 {process.exitcode})"
+                            self._fail_shard(shards[index - 1], reason, completed, failures)
+                            print(f"\n[分片 {index}] ❌ {reason}")
+                    continue
+                self._handle(message, shards, completed, failures, finished)
+        finally:
+            for process in processes.values():
+                process.join(timeout=10)
+                if process.is_alive():
+                    process.terminate()
+
+        print(f"\n⏱️ 分片播放耗时 {VideoManager.format_time(time.perf_counter() - started_at)}")
+        VideoManager.print_playback_summary(completed, failures)
+        return completed, failures
+
+    def _next_message(self, messages):
+        try:
+            return messages.get(timeout=self.POLL_INTERVAL)
+        except queue_module.Empty:
+            return None
+
+    def _handle(self, message, shards: List[List[str]], completed: List[str],
+                failures: List[tuple], finished: Dict[int, bool]):
+        kind, index, payload = message
+        if kind == MSG_READY:
+            print(f"\n[分片 {index}] ✓ 工作进程已就绪, 共 {len(shards[index - 1])} 个视频")
+        elif kind == MSG_PROGRESS:
+            if self.journal:
+                self.journal.record(payload['url'], payload['completed'], payload['duration'], payload['watched'])
+            if payload['completed']:
+                self._completed_urls.add(payload['url'])
+                print(f"\n[分片 {index}] ✓ 已完成: {payload['url']}")
+        elif kind == MSG_TIMING:
+            timings.merge(payload)
+        elif kind == MSG_DONE:
+            finished[index] = True
+            completed.extend(payload['completed'])
+            failures.extend(tuple(failure) for failure in payload['failures'])
+            print(f"\n[分片 {index}] 🏁 分片结束: 成功 {len(payload['completed'])} 个, "
+                  f"失败 {len(payload['failures'])} 个")
+        elif kind == MSG_ERROR:
+            finished[index] = False
+            self._fail_shard(shards[index - 1], payload, completed, failures)
+            print(f"\n[分片 {index}] ❌ 工作进程出错: {payload}")
+
+    def _fail_shard(self, shard: List[str], reason: str, completed: List[str], failures: List[tuple]):
+        """工作进程未正常结束时，已收到完成记录的视频计为成功，其余计为失败"""
+        for link in shard:
+            if link in self._completed_urls:
+                completed.append(link)
+            else:
+                failures.append((link, reason))
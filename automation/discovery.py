@@ -0,0 +1,198 @@
+"""
+视频链接发现模块
+以纯HTTP方式并行抓取多个课程页面提取视频链接，并在本地缓存（支持 TTL 与 ETag/Last-Modified 重新验证）
+"""
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from playwright.async_api import BrowserContext
+from .journal import resource_id
+from .session import write_json_atomic
+
+_SECTION_ID_RE = re.compile(r'^section-(\d+)$')
+
+
+@dataclass
+class VideoLink:
+    """课程页面中的一个视频链接"""
+    url: str
+    course_index: int = 0
+    section: int = 0
+
+    @property
+    def sort_key(self) -> Tuple[int, int, int]:
+        """按课程、章节、资源ID（数值）排序"""
+        rid = resource_id(self.url)
+        return self.course_index, self.section, int(rid) if rid and rid.isdigit() else 0
+
+
+def sort_links(links: List[str]) -> List[str]:
+    """
+    去重并按资源ID的数值排序（避免字符串排序把 id=10 排在 id=9 之前）
+    :param links: 视频链接列表
+    :return: 排序后的链接列表
+    """
+    return [link.url for link in sorted((VideoLink(url) for url in set(links)), key=lambda l: l.sort_key)]
+
+
+class _CourseLinkParser(HTMLParser):
+    """提取课程页面中匹配模式的链接，并记录所在章节（Moodle 章节元素的 id 为 section-N）"""
+
+    def __init__(self, page_url: str, url_pattern: str):
+        super().__init__(convert_charrefs=True)
+        self.page_url = page_url
+        self.url_pattern = url_pattern
+        self.section = 0
+        self.links: List[Tuple[str, int]] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        match = _SECTION_ID_RE.match(attrs.get('id') or '')
+        if match:
+            self.section = int(match.group(1))
+        if tag == 'a' and attrs.get('href'):
+            url = urljoin(self.page_url, attrs['href'])
+            if self.url_pattern in url:
+                self.links.append((url, self.section))
+
+
+def extract_video_links(html: str, page_url: str, url_pattern: str) -> List[Tuple[str, int]]:
+    """
+    从课程页面HTML中提取视频链接
+    :param html: 课程页面HTML
+    :param page_url: 课程页面URL（用于补全相对链接）
+    :param url_pattern: 视频链接的URL模式
+    :return: [(视频链接, 章节编号), ...]，按页面中出现的顺序
+    """
+    parser = _CourseLinkParser(page_url, url_pattern)
+    parser.feed(html)
+    parser.close()
+    return parser.links
+
+
+class LinkDiscovery:
+    """视频链接发现器"""
+
+    def __init__(self, context: BrowserContext, cache_file: str = "link_cache.json",
+                 ttl: float = 3600, concurrency: int = 4, login_host: Optional[str] = None,
+                 guest_block_text: str = "访客不能访问此课程"):
+        """
+        初始化链接发现器
+        :param context: 已登录的浏览器上下文（共享其Cookie发起HTTP请求）
+        :param cache_file: 链接缓存文件路径
+        :param ttl: 缓存有效期(秒)，过期后通过 ETag/Last-Modified 重新验证
+        :param concurrency: 同时抓取的课程页面数量
+        :param login_host: SSO登录页所在主机名
+        :param guest_block_text: Cookie失效时课程页面显示的提示文字
+        """
+        self.context = context
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.login_host = login_host
+        self.guest_block_text = guest_block_text
+        self.cache: Dict[str, dict] = self._load_cache()
+
+    def _load_cache(self) -> Dict[str, dict]:
+        if not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache(self):
+        """将链接缓存写入文件"""
+        write_json_atomic(str(self.cache_file), self.cache)
+
+    async def fetch_course(self, course_url: str, url_pattern: str) -> List[Tuple[str, int]]:
+        """
+        获取单个课程页面的视频链接（优先使用缓存）
+        :param course_url: 课程页面URL
+        :param url_pattern: 视频链接的URL模式
+        :return: [(视频链接, 章节编号), ...]
+        """
+        entry = self.cache.get(course_url)
+        # 没有链接的记录不可信（可能是会话失效时的访客页面），总是重新获取
+        if entry and (entry.get('url_pattern') != url_pattern or not entry.get('links')):
+            entry = None
+        if entry and time.time() - entry['fetched_at'] < self.ttl:
+            return [tuple(link) for link in entry['links']]
+
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        response = await self.context.request.get(course_url, headers=headers, max_redirects=0)
+        if 300 <= response.status < 400 and response.status != 304:
+            location = response.headers.get('location', '')
+            if self.login_host and urlparse(location).netloc == self.login_host:
+                raise Exception("Cookie已失效，请重新获取Cookie")
+            raise Exception(f"课程页面被重定向到: {location}")
+
+        if response.status == 304 and entry:
+            entry['fetched_at'] = time.time()
+            return [tuple(link) for link in entry['links']]
+        if not response.ok:
+            raise Exception(f"HTTP {response.status}")
+
+        html = await response.text()
+        # 会话失效时课程页面仍返回200，但只显示访客提示
+        if self.guest_block_text and self.guest_block_text in html:
+            raise Exception("Cookie已失效，请重新获取Cookie")
+
+        links = extract_video_links(html, course_url, url_pattern)
+        if not links:
+            self.cache.pop(course_url, None)
+            return links
+        self.cache[course_url] = {
+            'url_pattern': url_pattern,
+            'etag': response.headers.get('etag'),
+            'last_modified': response.headers.get('last-modified'),
+            'fetched_at': time.time(),
+            'links': links,
+        }
+        return links
+
+    async def discover(self, course_urls: List[str], url_pattern: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        并行获取多个课程页面的视频链接
+        :param course_urls: 课程页面URL列表
+        :param url_pattern: 视频链接的URL模式
+        :return: (按课程、章节、资源ID排序的视频链接列表, [(获取失败的课程URL, 原因), ...])
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(url: str):
+            async with semaphore:
+                return await self.fetch_course(url, url_pattern)
+
+        results = await asyncio.gather(*(fetch(url) for url in course_urls), return_exceptions=True)
+
+        seen = set()
+        links: List[VideoLink] = []
+        failed: List[Tuple[str, str]] = []
+        for course_index, (course_url, result) in enumerate(zip(course_urls, results)):
+            if isinstance(result, BaseException):
+                if "Cookie已失效" in str(result):
+                    raise result
+                failed.append((course_url, str(result)))
+                continue
+            for url, section in result:
+                if url not in seen:
+                    seen.add(url)
+                    links.append(VideoLink(url, course_index, section))
+
+        self.save_cache()
+        links.sort(key=lambda link: link.sort_key)
+        return [link.url for link in links], failed
@@ -0,0 +1,120 @@
+"""
+观看进度记录模块
+以追加写入的 JSONL 文件记录每个视频的完成状态，程序重启后可跳过已完成的视频
+"""
+
+import json
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+
+def resource_id(url: str) -> Optional[str]:
+    """
+    提取视频链接中的资源ID（view.php?id= 的值）
+    :param url: 视频页面URL
+    :return: 资源ID，链接中没有 id 参数时返回 None
+    """
+    values = parse_qs(urlparse(url).query).get('id')
+    return values[0] if values else None
+
+
+@dataclass
+class ProgressRecord:
+    """单个视频的观看进度"""
+    resource_id: str
+    url: str
+    completed: bool
+    duration: Optional[float] = None
+    watched: Optional[float] = None
+    updated_at: float = 0.0
+
+
+class ProgressJournal:
+    """观看进度日志"""
+
+    def __init__(self, path: str = "progress.jsonl"):
+        """
+        初始化进度日志，并读取已有记录
+        :param path: 日志文件路径
+        """
+        self.path = Path(path)
+        self.records: Dict[str, ProgressRecord] = {}
+        self._load()
+
+    def _load(self):
+        """读取日志文件，同一视频以最后一条记录为准"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = ProgressRecord(**json.loads(line))
+                except (ValueError, TypeError):
+                    # 进程中途退出可能留下不完整的最后一行，直接忽略
+                    continue
+                self.records[record.resource_id] = record
+
+    def get(self, url: str) -> Optional[ProgressRecord]:
+        """
+        获取视频的最新进度记录
+        :param url: 视频页面URL
+        :return: 进度记录，没有记录时返回 None
+        """
+        rid = resource_id(url)
+        return self.records.get(rid) if rid else None
+
+    def record(self, url: str, completed: bool,
+               duration: Optional[float] = None,
+               watched: Optional[float] = None):
+        """
+        追加一条进度记录
+        :param url: 视频页面URL
+        :param completed: 是否已完成
+        :param duration: 视频总时长(秒)
+        :param watched: 已观看时长(秒)
+        """
+        rid = resource_id(url)
+        if not rid:
+            return
+        previous = self.records.get(rid)
+        record = ProgressRecord(
+            resource_id=rid,
+            url=url,
+            completed=completed,
+            duration=duration if duration is not None else (previous.duration if previous else None),
+            watched=watched,
+            updated_at=time.time(),
+        )
+        self.records[rid] = record
+        self._append(record)
+
+    def _append(self, record: ProgressRecord):
+        """将一条记录追加到日志文件"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(asdict(record), ensure_ascii=False) + '\n')
+
+    def plan(self, video_links: List[str]) -> List[str]:
+        """
+        根据已有记录整理待观看列表：跳过已完成的视频，已看过一部分的视频排在最前
+        :param video_links: 视频链接列表
+        :return: 待观看的视频链接列表
+        """
+        partial = []
+        pending = []
+        for link in video_links:
+            record = self.get(link)
+            if record is None:
+                pending.append(link)
+            elif record.completed:
+                continue
+            elif record.watched:
+                partial.append(link)
+            else:
+                pending.append(link)
+        return partial + pending
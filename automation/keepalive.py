@@ -0,0 +1,199 @@
+"""
+会话保活模块
+每个浏览器上下文运行一个后台任务统一延长会话，替代每个标签页轮询"延长会话"按钮
+"""
+
+import asyncio
+import time
+from typing import Callable, List, Optional
+from playwright.async_api import BrowserContext, Page
+from .session import SessionSnapshot
+from .timing import timings
+
+WARNING_BINDING_NAME = "__flySessionWarning"
+# Moodle 会话Cookie的名称（站点配置了 sessioncookie 后缀时以此开头）
+SESSION_COOKIE_PREFIX = "MoodleSession"
+
+# 监听页面中出现"延长会话"按钮（Moodle 会话即将超时的提示），出现时立即通知保活任务
+_WARNING_SCRIPT = """
+(() => {
+    if (window.__flySessionWarningInstalled) return;
+    window.__flySessionWarningInstalled = true;
+    let pending = false;
+    const check = () => {
+        pending = false;
+        const found = [...document.querySelectorAll('button')].some(b => b.textContent.includes('延长会话'));
+        if (found && typeof window.%(binding)s === 'function') window.%(binding)s().catch(() => {});
+    };
+    const start = () => new MutationObserver(() => {
+        if (!pending) { pending = true; setTimeout(check, 1000); }
+    }).observe(document.documentElement, { childList: true, subtree: true });
+    if (document.documentElement) start(); else document.addEventListener('DOMContentLoaded', start);
+})();
+""" % {'binding': WARNING_BINDING_NAME}
+
+# 通过 Moodle 的 core_session_touch 接口延长会话，无需点击任何按钮
+_SESSION_TOUCH_SCRIPT = """
+async () => {
+    if (!window.M || !M.cfg || !M.cfg.sesskey) return false;
+    const response = await fetch(
+        M.cfg.wwwroot + '/lib/ajax/service.php?sesskey=' + M.cfg.sesskey + '&info=core_session_touch',
+        {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify([{ index: 0, methodname: 'core_session_touch', args: {} }]),
+        }
+    );
+    const data = await response.json();
+    return Array.isArray(data) && !!data[0] && !data[0].error;
+}
+"""
+
+
+class SessionKeepAlive:
+    """会话保活任务"""
+
+    def __init__(self, context: BrowserContext, session: SessionSnapshot,
+                 cookie_file: str = "cookies.json",
+                 interval: float = 300, expiry_margin: float = 120, save_delay: float = 2,
+                 session_host: Optional[str] = None):
+        """
+        初始化会话保活任务
+        :param context: 浏览器上下文
+        :param session: 上下文使用的会话快照，续期后更新并写回文件
+        :param cookie_file: Cookie文件路径
+        :param interval: 最长续期间隔(秒)
+        :param expiry_margin: 在Cookie过期前提前多少秒续期
+        :param save_delay: 写入Cookie文件的防抖延迟(秒)
+        :param session_host: Moodle 站点的主机名，只根据该主机的会话Cookie计算续期时间（为空则不限主机）
+        """
+        self.context = context
+        self.session = session
+        self.cookie_file = cookie_file
+        self.interval = interval
+        self.expiry_margin = expiry_margin
+        self.save_delay = save_delay
+        self.session_host = session_host
+        self.renewals = 0
+        self._listeners: List[Callable[[], None]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._save_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """注册会话超时提示监听并启动后台任务"""
+        await self.context.expose_binding(WARNING_BINDING_NAME, lambda source: self._wakeup.set())
+        await self.context.add_init_script(_WARNING_SCRIPT)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """停止后台任务，并立即写入尚未保存的Cookie"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
+            try:
+                await self._save()
+            except Exception as e:
+                print(f"⚠ 保存Cookie失败: {e}")
+
+    def subscribe(self, listener: Callable[[], None]):
+        """
+        注册会话续期通知
+        :param listener: 每次续期成功后调用的函数
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[], None]):
+        """
+        取消会话续期通知（标签页关闭时调用，避免回调随打开过的标签页累积）
+        :param listener: subscribe 注册的函数
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _is_session_cookie(self, cookie: dict) -> bool:
+        """是否为 Moodle 站点的会话Cookie（其他域名的第三方Cookie与会话是否过期无关）"""
+        if not cookie.get('name', '').startswith(SESSION_COOKIE_PREFIX):
+            return False
+        if not self.session_host:
+            return True
+        domain = cookie.get('domain', '')
+        host = self.session_host
+        return host == domain.lstrip('.') or (domain.startswith('.') and host.endswith(domain))
+
+    def next_delay(self) -> float:
+        """根据 Moodle 会话Cookie的过期时间计算下一次续期前的等待时间(秒)，没有可用的过期时间时使用最长间隔"""
+        now = time.time()
+        delay = self.interval
+        for cookie in self.session.cookies:
+            expires = cookie.get('expires', -1)
+            # 浏览器会话期Cookie(-1)没有过期时间；已过期的Cookie续期也无法挽回，不应让续期循环空转
+            if not self._is_session_cookie(cookie) or not expires or expires <= now:
+                continue
+            delay = min(delay, expires - self.expiry_margin - now)
+        return max(delay, 10)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.next_delay())
+                print("\n⚠️ 检测到会话即将超时提示")
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"\n⚠ 延长会话失败: {e}")
+
+    def _pick_page(self) -> Optional[Page]:
+        """选择一个仍打开的页面执行续期"""
+        for page in self.context.pages:
+            if not page.is_closed() and page.url.startswith('http'):
+                return page
+        return None
+
+    async def refresh(self) -> bool:
+        """
+        立即延长一次会话
+        :return: 是否续期成功
+        """
+        page = self._pick_page()
+        if page is None:
+            return False
+
+        with timings.phase("keepalive_refresh"):
+            refresh_button = page.get_by_role('button', name='延长会话')
+            if await refresh_button.count() > 0:
+                await refresh_button.first.click()
+                renewed = True
+            else:
+                renewed = await page.evaluate(_SESSION_TOUCH_SCRIPT)
+        if not renewed:
+            return False
+
+        self.renewals += 1
+        print("\n✓ 会话已延长")
+        self._schedule_save()
+        for listener in self._listeners:
+            listener()
+        return True
+
+    def _schedule_save(self):
+        """防抖写入：短时间内多次续期只写一次文件"""
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
+        self._save_task = asyncio.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(self.save_delay)
+        await self._save()
+
+    async def _save(self):
+        await self.session.capture(self.context)
+        self.session.save(self.cookie_file)
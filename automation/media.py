@@ -0,0 +1,136 @@
+"""
+媒体码率模块
+强制播放标签页使用最低码率的视频流，减少无头静音播放时浪费的带宽和解码CPU
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict
+from playwright.async_api import APIResponse, BrowserContext, Page, Route
+
+_HLS_ROUTE = re.compile(r"\.m3u8(\?|$)")
+_DASH_ROUTE = re.compile(r"\.mpd(\?|$)")
+_BANDWIDTH_RE = re.compile(r"BANDWIDTH=(\d+)")
+_DASH_NS = "urn:mpeg:dash:schema:mpd:2011"
+
+# 通过 video.js 的 quality levels 接口只保留最低画质
+_PLAYER_QUALITY_SCRIPT = """
+() => {
+    if (!window.videojs || !window.videojs.getPlayers) return 0;
+    let changed = 0;
+    for (const player of Object.values(window.videojs.getPlayers())) {
+        if (!player || typeof player.qualityLevels !== 'function') continue;
+        const levels = player.qualityLevels();
+        if (!levels || levels.length < 2) continue;
+        let lowest = 0;
+        for (let i = 1; i < levels.length; i++) {
+            const a = levels[i].bitrate || levels[i].height || 0;
+            const b = levels[lowest].bitrate || levels[lowest].height || 0;
+            if (a < b) lowest = i;
+        }
+        for (let i = 0; i < levels.length; i++) levels[i].enabled = (i === lowest);
+        changed++;
+    }
+    return changed;
+}
+"""
+
+
+def select_lowest_hls_variant(playlist: str) -> str:
+    """
+    将 HLS 主播放列表精简为只包含带宽最低的一个视频流
+    :param playlist: m3u8 文本
+    :return: 改写后的 m3u8 文本（非主播放列表原样返回）
+    """
+    lines = playlist.splitlines()
+    variants = []
+    for i, line in enumerate(lines):
+        if line.startswith('#EXT-X-STREAM-INF') and i + 1 < len(lines):
+            match = _BANDWIDTH_RE.search(line)
+            variants.append((int(match.group(1)) if match else 0, i))
+    if len(variants) < 2:
+        return playlist
+
+    _, keep = min(variants)
+    drop = {i for _, i in variants if i != keep}
+    drop |= {i + 1 for i in drop}
+    return '\n'.join(line for i, line in enumerate(lines) if i not in drop) + '\n'
+
+
+def select_lowest_dash_representation(manifest: str) -> str:
+    """
+    将 DASH MPD 中每个视频 AdaptationSet 精简为只包含带宽最低的 Representation
+    :param manifest: mpd 文本
+    :return: 改写后的 mpd 文本（解析失败时原样返回）
+    """
+    ET.register_namespace('', _DASH_NS)
+    try:
+        root = ET.fromstring(manifest)
+    except ET.ParseError:
+        return manifest
+
+    changed = False
+    for adaptation in root.iter(f'{{{_DASH_NS}}}AdaptationSet'):
+        representations = adaptation.findall(f'{{{_DASH_NS}}}Representation')
+        is_video = (adaptation.get('contentType') == 'video'
+                    or (adaptation.get('mimeType') or '').startswith('video')
+                    or any((r.get('mimeType') or '').startswith('video') for r in representations))
+        if not is_video or len(representations) < 2:
+            continue
+        lowest = min(representations, key=lambda r: int(r.get('bandwidth') or 0))
+        for representation in representations:
+            if representation is not lowest:
+                adaptation.remove(representation)
+        changed = True
+
+    if not changed:
+        return manifest
+    return ET.tostring(root, encoding='unicode', xml_declaration=True)
+
+
+class LowBitrateProfile:
+    """最低码率播放配置"""
+
+    async def attach(self, context: BrowserContext):
+        """
+        在浏览器上下文上改写 HLS/DASH 清单
+        :param context: 浏览器上下文
+        """
+        await context.route(_HLS_ROUTE, self._rewrite_hls)
+        await context.route(_DASH_ROUTE, self._rewrite_dash)
+
+    @staticmethod
+    def _rewritten_headers(response: APIResponse) -> Dict[str, str]:
+        """
+        改写后的清单沿用原响应头，但去掉原长度和压缩编码（新内容是未压缩的文本，长度也已改变），
+        否则浏览器会按原长度截断或按 gzip 解码失败
+        :param response: 原始响应
+        :return: 响应头
+        """
+        return {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in ('content-length', 'content-encoding')
+        }
+
+    async def _rewrite_hls(self, route: Route):
+        response = await route.fetch()
+        body = await response.text()
+        await route.fulfill(response=response, headers=self._rewritten_headers(response),
+                            body=select_lowest_hls_variant(body))
+
+    async def _rewrite_dash(self, route: Route):
+        response = await route.fetch()
+        body = await response.text()
+        await route.fulfill(response=response, headers=self._rewritten_headers(response),
+                            body=select_lowest_dash_representation(body))
+
+    async def apply_player_quality(self, page: Page) -> int:
+        """
+        通过播放器的画质接口切换到最低画质（适用于 video.js 自行解析清单的情况）
+        :param page: Playwright页面对象
+        :return: 已切换的播放器数量
+        """
+        try:
+            return await page.evaluate(_PLAYER_QUALITY_SCRIPT)
+        except Exception:
+            return 0
@@ -0,0 +1,242 @@
+"""
+资源占用统计模块
+通过 CDP 会话统计单个标签页的网络流量和CPU耗时，以及多标签页播放时的内存占用和播放速率
+（仅 Chromium 内核浏览器可用）
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+from playwright.async_api import Browser, BrowserContext, Page, CDPSession
+
+try:
+    import psutil
+except ImportError:
+    # psutil 为可选依赖，未安装时在 Linux 上读取 /proc
+    psutil = None
+
+
+class TabFootprint:
+    """标签页资源占用统计"""
+
+    def __init__(self, page: Page):
+        """
+        初始化统计器
+        :param page: Playwright页面对象
+        """
+        self.page = page
+        self.bytes_received = 0
+        self._session: Optional[CDPSession] = None
+        self._baseline = (0, 0.0)
+
+    async def _ensure_session(self) -> bool:
+        """按需创建 CDP 会话，非 Chromium 浏览器返回 False"""
+        if self._session is None:
+            try:
+                self._session = await self.page.context.new_cdp_session(self.page)
+                await self._session.send("Performance.enable")
+                await self._session.send("Network.enable")
+                self._session.on("Network.loadingFinished", self._on_loading_finished)
+            except Exception:
+                return False
+        return True
+
+    def _on_loading_finished(self, params: dict):
+        self.bytes_received += int(params.get('encodedDataLength') or 0)
+
+    async def get_metrics(self) -> dict:
+        """
+        获取页面的性能指标
+        :return: {指标名: 数值}，不可用时返回空字典
+        """
+        if not await self._ensure_session():
+            return {}
+        try:
+            result = await self._session.send("Performance.getMetrics")
+        except Exception:
+            return {}
+        return {metric['name']: metric['value'] for metric in result.get('metrics', [])}
+
+    async def begin(self):
+        """记录统计起点"""
+        metrics = await self.get_metrics()
+        self._baseline = (self.bytes_received, metrics.get('TaskDuration', 0.0))
+
+    async def end(self) -> Optional[dict]:
+        """
+        计算自起点以来的资源占用
+        :return: {bytes, cpu_seconds}，不可用时返回 None
+        """
+        metrics = await self.get_metrics()
+        if not metrics:
+            return None
+        return {
+            'bytes': self.bytes_received - self._baseline[0],
+            'cpu_seconds': metrics.get('TaskDuration', 0.0) - self._baseline[1],
+        }
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """
+    获取进程的常驻内存(RSS)
+    :param pid: 进程ID
+    :return: 字节数，无法获取时返回 None
+    """
+    if psutil:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def available_memory() -> Optional[int]:
+    """
+    获取系统当前可用内存
+    :return: 字节数，无法获取时返回 None
+    """
+    if psutil:
+        return psutil.virtual_memory().available
+    try:
+        with open("/proc/meminfo", 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+# 读取页面中视频的播放位置
+_PLAYBACK_SCRIPT = """
+sel => {
+    const video = document.querySelector(sel);
+    if (!video) return null;
+    return { currentTime: video.currentTime, playing: !video.paused && !video.ended };
+}
+"""
+
+
+class PlaybackSampler:
+    """多标签页播放采样：定期统计每个标签页的播放速率和浏览器各进程的内存占用"""
+
+    def __init__(self, browser: Optional[Browser], context: BrowserContext,
+                 video_selector: str = "video", interval: float = 60):
+        """
+        初始化采样器
+        :param browser: 浏览器对象（持久化上下文模式下为 None，此时只统计播放速率）
+        :param context: 要统计的浏览器上下文
+        :param video_selector: 视频元素的CSS选择器
+        :param interval: 采样间隔(秒)
+        """
+        self.browser = browser
+        self.context = context
+        self.video_selector = video_selector
+        self.interval = interval
+        self._positions: Dict[Page, tuple] = {}
+        self._session: Optional[CDPSession] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """启动后台采样任务"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """停止后台采样任务"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.print_report(await self.sample())
+            except Exception as e:
+                print(f"\n⚠ 播放采样失败: {e}")
+
+    async def playback_rates(self) -> List[float]:
+        """
+        计算上次采样以来每个正在播放的标签页的播放速率（媒体时间 / 实际时间，1.0 表示全速）
+        :return: 播放速率列表
+        """
+        now = time.monotonic()
+        rates = []
+        positions = {}
+        for page in self.context.pages:
+            if page.is_closed():
+                continue
+            try:
+                state = await page.evaluate(_PLAYBACK_SCRIPT, self.video_selector)
+            except Exception:
+                continue
+            if not state or not state['playing']:
+                continue
+            positions[page] = (now, state['currentTime'])
+            previous = self._positions.get(page)
+            # 播放位置回退说明标签页已切换到下一个视频，本次不计算
+            if previous and now > previous[0] and state['currentTime'] >= previous[1]:
+                rates.append((state['currentTime'] - previous[1]) / (now - previous[0]))
+        self._positions = positions
+        return rates
+
+    async def process_memory(self) -> Dict[str, List[int]]:
+        """
+        获取浏览器各进程的常驻内存
+        :return: {进程类型(browser/renderer/GPU等): [RSS字节数, ...]}，无法获取时返回空字典
+        """
+        if self.browser is None:
+            return {}
+        try:
+            if self._session is None:
+                self._session = await self.browser.new_browser_cdp_session()
+            info = await self._session.send("SystemInfo.getProcessInfo")
+        except Exception:
+            return {}
+        memory: Dict[str, List[int]] = {}
+        for process in info.get('processInfo', []):
+            rss = process_rss(process['id'])
+            if rss is not None:
+                memory.setdefault(process['type'], []).append(rss)
+        return memory
+
+    async def sample(self) -> dict:
+        """
+        采样一次
+        :return: {rates, playing_tabs, renderer_rss, total_rss, available}
+        """
+        rates = await self.playback_rates()
+        memory = await self.process_memory()
+        return {
+            'rates': rates,
+            'playing_tabs': len(self._positions),
+            'renderer_rss': memory.get('renderer', []),
+            'total_rss': sum(sum(values) for values in memory.values()),
+            'available': available_memory(),
+        }
+
+    @staticmethod
+    def print_report(sample: dict):
+        """打印采样结果，并按渲染进程的平均占用估计剩余内存还能容纳多少个标签页"""
+        parts = [f"{sample['playing_tabs']} 个标签页播放中"]
+        if sample['rates']:
+            rates = sample['rates']
+            parts.append(f"播放速率 平均 {sum(rates) / len(rates):.2f}x / 最低 {min(rates):.2f}x")
+        renderer_rss = sample['renderer_rss']
+        if renderer_rss:
+            per_tab = sum(renderer_rss) / len(renderer_rss)
+            parts.append(f"渲染进程 RSS 平均 {per_tab / 1024 / 1024:.0f} MB")
+            parts.append(f"浏览器总 RSS {sample['total_rss'] / 1024 / 1024:.0f} MB")
+            if sample['available']:
+                parts.append(f"剩余内存约可再容纳 {int(sample['available'] // per_tab)} 个标签页")
+        print(f"\n📊 {', '.join(parts)}")
@@ -0,0 +1,119 @@
+"""
+播放监听模块
+通过页面绑定接收 <video> 元素的事件推送，替代定时轮询
+"""
+
+import asyncio
+from typing import Optional
+from playwright.async_api import Page
+from .clock import RealClock
+
+BINDING_NAME = "__flyVideoEvent"
+
+# 在文档上以捕获阶段监听媒体事件（媒体事件不冒泡，但捕获阶段可以收到），
+# 因此无需等待 <video> 元素出现，也无需每次导航后重新注入。
+# 每次上报都是一次 页面→驱动→Python 的往返，因此只上报状态变化（播放/暂停/结束/停滞）；
+# timeupdate 仅在需要显示进度条时按 progress_interval 毫秒节流上报，0 表示不上报
+_LISTENER_SCRIPT = """
+(() => {
+    if (window.__flyVideoMonitorInstalled) return;
+    window.__flyVideoMonitorInstalled = true;
+    const progressInterval = %(progress_interval)d;
+    let lastTimeupdate = 0;
+    const report = (event) => {
+        const el = event.target;
+        if (!(el instanceof HTMLMediaElement)) return;
+        if (event.type === 'timeupdate') {
+            const now = Date.now();
+            if (now - lastTimeupdate < progressInterval) return;
+            lastTimeupdate = now;
+        }
+        const binding = window.%(binding)s;
+        if (typeof binding !== 'function') return;
+        binding({
+            type: event.type,
+            currentTime: el.currentTime,
+            duration: isFinite(el.duration) ? el.duration : 0,
+            paused: el.paused,
+            ended: el.ended,
+        }).catch(() => {});
+    };
+    const types = ['play', 'pause', 'ended', 'stalled'];
+    if (progressInterval > 0) types.push('timeupdate');
+    for (const type of types) {
+        document.addEventListener(type, report, true);
+    }
+})();
+"""
+
+
+class PlaybackMonitor:
+    """视频播放事件监听器，每个页面一个实例"""
+
+    def __init__(self, page: Page, clock: Optional[RealClock] = None):
+        """
+        初始化播放监听器
+        :param page: Playwright页面对象
+        :param clock: 等待事件超时使用的时钟，默认使用真实时钟（模拟时注入虚拟时钟）
+        """
+        self.page = page
+        self.clock = clock or RealClock()
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.closed = asyncio.Event()
+        self.last_state: Optional[dict] = None
+        self._attached = False
+        self._browser = None
+
+    async def attach(self, progress_interval: float = 0):
+        """
+        注册页面绑定与监听脚本（对之后的所有导航生效，重复调用无副作用）
+        :param progress_interval: 上报播放进度(timeupdate)的最短间隔(秒)，0 表示只上报状态变化
+        """
+        if self._attached:
+            return
+        await self.page.expose_binding(BINDING_NAME, self._on_media_event)
+        await self.page.add_init_script(_LISTENER_SCRIPT % {
+            'binding': BINDING_NAME,
+            'progress_interval': int(progress_interval * 1000),
+        })
+        self.page.on("close", lambda _: self._on_closed())
+        self._browser = self.page.context.browser
+        if self._browser:
+            self._browser.on("disconnected", self._on_disconnected)
+        self._attached = True
+
+    def detach(self):
+        """取消浏览器断开连接的监听（页面关闭或被替换时调用，浏览器上的监听不会随页面释放）"""
+        if self._browser:
+            self._browser.remove_listener("disconnected", self._on_disconnected)
+            self._browser = None
+
+    def reset(self):
+        """切换到新视频前清空上一个视频遗留的事件"""
+        while not self.events.empty():
+            self.events.get_nowait()
+        self.last_state = None
+
+    async def next_event(self, timeout: float) -> Optional[dict]:
+        """
+        等待下一个播放事件
+        :param timeout: 最长等待时间(秒)
+        :return: 事件字典 {type, currentTime, duration, paused, ended}，超时返回 None
+        """
+        try:
+            return await self.clock.wait_for(self.events.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _on_media_event(self, source, payload: dict):
+        """页面端推送的媒体事件"""
+        self.last_state = payload
+        self.events.put_nowait(payload)
+
+    def _on_disconnected(self, browser):
+        self._on_closed()
+
+    def _on_closed(self):
+        """页面关闭或浏览器断开连接"""
+        self.closed.set()
+        self.events.put_nowait({'type': 'close'})
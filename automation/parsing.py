@@ -0,0 +1,121 @@
+"""
+HTML解析模块
+在不启动浏览器渲染的情况下，从页面源码中按简单CSS选择器提取文本
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+# 不会有结束标签的空元素
+_VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'source', 'track', 'wbr',
+}
+
+_COMPOUND_RE = re.compile(r'([a-zA-Z][\w-]*)|\.([\w-]+)|#([\w-]+)')
+
+
+def _parse_compound(text: str) -> Tuple[Optional[str], set, Optional[str]]:
+    """解析形如 tag.class#id 的简单选择器"""
+    tag, classes, element_id = None, set(), None
+    for name, cls, eid in _COMPOUND_RE.findall(text):
+        if name:
+            tag = name.lower()
+        elif cls:
+            classes.add(cls)
+        elif eid:
+            element_id = eid
+    return tag, classes, element_id
+
+
+def parse_selector(selector: str) -> List[Tuple[str, tuple]]:
+    """
+    解析CSS选择器（仅支持 tag/.class/#id 组合，以及后代 " " 与子元素 ">" 组合符）
+    :param selector: CSS选择器
+    :return: [(与前一部分的组合符, (tag, classes, id)), ...]
+    """
+    parts = []
+    combinator = ' '
+    for token in re.findall(r'>|[^\s>]+', selector):
+        if token == '>':
+            combinator = '>'
+            continue
+        parts.append((combinator, _parse_compound(token)))
+        combinator = ' '
+    return parts
+
+
+def _element_matches(element: tuple, compound: tuple) -> bool:
+    tag, classes, element_id = element
+    want_tag, want_classes, want_id = compound
+    return ((want_tag is None or want_tag == tag)
+            and want_classes <= classes
+            and (want_id is None or want_id == element_id))
+
+
+def _stack_matches(stack: List[tuple], parts: List[Tuple[str, tuple]]) -> bool:
+    """判断当前元素栈的栈顶元素是否匹配选择器"""
+    def match(stack_index: int, part_index: int) -> bool:
+        if not _element_matches(stack[stack_index], parts[part_index][1]):
+            return False
+        if part_index == 0:
+            return True
+        combinator = parts[part_index][0]
+        if combinator == '>':
+            return stack_index > 0 and match(stack_index - 1, part_index - 1)
+        return any(match(i, part_index - 1) for i in range(stack_index - 1, -1, -1))
+
+    return bool(parts) and bool(stack) and match(len(stack) - 1, len(parts) - 1)
+
+
+class _SelectorTextParser(HTMLParser):
+    """记录每个选择器第一个匹配元素的文本内容"""
+
+    def __init__(self, selectors: Dict[str, str]):
+        super().__init__(convert_charrefs=True)
+        self.selectors = {name: parse_selector(sel) for name, sel in selectors.items()}
+        self.results: Dict[str, Optional[str]] = {name: None for name in selectors}
+        self.stack: List[tuple] = []
+        self.capturing: Dict[str, int] = {}
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        element = (tag.lower(), set((attrs.get('class') or '').split()), attrs.get('id'))
+        if tag.lower() in _VOID_TAGS:
+            return
+        self.stack.append(element)
+        for name, parts in self.selectors.items():
+            if self.results[name] is None and _stack_matches(self.stack, parts):
+                self.results[name] = ''
+                self.capturing[name] = len(self.stack)
+
+    def handle_endtag(self, tag):
+        tag = tag.lower()
+        if tag in _VOID_TAGS:
+            return
+        # 容错处理未闭合的标签：弹出直到遇到同名标签
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                break
+        for name, depth in list(self.capturing.items()):
+            if depth > len(self.stack):
+                del self.capturing[name]
+
+    def handle_data(self, data):
+        for name in self.capturing:
+            self.results[name] += data
+
+
+def extract_texts(html: str, selectors: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """
+    从HTML源码中提取各选择器第一个匹配元素的文本
+    :param html: 页面HTML源码
+    :param selectors: {名称: CSS选择器}
+    :return: {名称: 文本}，未匹配的选择器对应 None
+    """
+    parser = _SelectorTextParser(selectors)
+    parser.feed(html)
+    parser.close()
+    return parser.results
@@ -0,0 +1,175 @@
+"""
+流水线模块
+链接发现、完成状态预扫描和播放三个阶段通过 asyncio 队列同时运行，
+首个视频无需等待所有课程页面解析完毕即可开始播放
+"""
+
+import asyncio
+import time
+from typing import List, Optional, Set
+from .discovery import LinkDiscovery, VideoLink
+from .prescan import fetch_prescan_result
+
+
+class PlaybackPipeline:
+    """发现 → 预扫描 → 播放 流水线"""
+
+    def __init__(self, video_manager, discovery: LinkDiscovery, url_pattern: str,
+                 tab_count: int = 1, prescan_concurrency: int = 0, queue_size: int = 16):
+        """
+        初始化流水线
+        :param video_manager: 视频管理器（提供标签页播放池）
+        :param discovery: 链接发现器
+        :param url_pattern: 视频链接的URL模式
+        :param tab_count: 同时播放的标签页数量
+        :param prescan_concurrency: 预扫描的并发请求数，0表示跳过预扫描阶段
+        :param queue_size: 阶段之间队列的容量（队列满时上游暂停，形成背压）
+        """
+        self.video_manager = video_manager
+        self.discovery = discovery
+        self.url_pattern = url_pattern
+        self.tab_count = tab_count
+        self.prescan_concurrency = prescan_concurrency
+        # 出错时需要一次性放入所有结束标记，因此容量不小于标签页数量
+        self.queue_size = max(queue_size, tab_count)
+        self.discovered_count = 0
+        self._seen: Set[str] = set()
+        self._started_at = 0.0
+        self._first_ready = False
+        self._error: Optional[BaseException] = None
+
+    async def run(self, course_urls: List[str], video_selector: str = "video",
+                  play_button_selector: Optional[str] = None, default_wait_time: int = 60):
+        """
+        运行流水线直到所有视频处理完毕
+        :param course_urls: 课程页面URL列表
+        :param video_selector: 视频元素的CSS选择器
+        :param play_button_selector: 播放按钮的CSS选择器
+        :param default_wait_time: 默认等待时间(秒)
+        """
+        print(f"\n🚚 流水线启动: {len(course_urls)} 个课程, {self.tab_count} 个播放标签页")
+        self._started_at = time.perf_counter()
+        discovered: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        playable: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        stop_event = asyncio.Event()
+
+        upstream = asyncio.create_task(self._feed(course_urls, discovered, playable, stop_event))
+        try:
+            completed, failures = await self.video_manager.run_playback_workers(
+                playable,
+                self.tab_count,
+                video_selector,
+                play_button_selector,
+                default_wait_time,
+                stop_event=stop_event
+            )
+        finally:
+            if not upstream.done():
+                upstream.cancel()
+
+        if self._error:
+            raise self._error
+        print(f"\n共发现 {self.discovered_count} 个待处理视频")
+        self.video_manager.print_playback_summary(completed, failures, stop_event)
+
+    async def _feed(self, course_urls: List[str], discovered: asyncio.Queue,
+                    playable: asyncio.Queue, stop_event: asyncio.Event):
+        """运行发现与预扫描阶段，结束后通知所有播放标签页"""
+        semaphore = asyncio.Semaphore(self.discovery.concurrency)
+        producers = [
+            asyncio.create_task(self._guard(self._discover_course(index, url, discovered, semaphore), stop_event))
+            for index, url in enumerate(course_urls)
+        ]
+        filters = [
+            asyncio.create_task(self._guard(self._filter(discovered, playable), stop_event))
+            for _ in range(max(self.prescan_concurrency, 1))
+        ]
+
+        async def close_discovered():
+            await asyncio.gather(*producers)
+            for _ in filters:
+                await discovered.put(None)
+
+        # 任一阶段出错时立即返回，而不是等待其他阶段：预扫描全部出错后发现阶段会阻塞在已满的队列上
+        stages = producers + filters + [asyncio.create_task(close_discovered())]
+        failed = True
+        try:
+            done, _ = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+            failed = any(not task.cancelled() and task.exception() for task in done)
+        finally:
+            for task in stages:
+                task.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            self.discovery.save_cache()
+            if failed:
+                stop_event.set()
+                # 出错时清空队列，保证结束标记可以立即放入（失败原因由 _guard 记录，由 run 抛出）
+                while not playable.empty():
+                    playable.get_nowait()
+                for _ in range(self.tab_count):
+                    playable.put_nowait(None)
+        if not failed:
+            for _ in range(self.tab_count):
+                await playable.put(None)
+
+    async def _guard(self, coro, stop_event: asyncio.Event):
+        """阶段任务出错时记录原因并立即通知播放标签页停止"""
+        try:
+            await coro
+        except Exception as e:
+            if self._error is None:
+                self._error = e
+            stop_event.set()
+            raise
+
+    async def _discover_course(self, course_index: int, course_url: str,
+                               discovered: asyncio.Queue, semaphore: asyncio.Semaphore):
+        """发现阶段：获取一个课程页面的链接并逐个放入队列"""
+        async with semaphore:
+            try:
+                links = await self.discovery.fetch_course(course_url, self.url_pattern)
+            except Exception as e:
+                if "Cookie已失效" in str(e):
+                    raise
+                print(f"⚠ 获取课程页面失败 {course_url}: {e}")
+                return
+
+        journal = self.video_manager.journal
+        for link in sorted((VideoLink(url, course_index, section) for url, section in links),
+                           key=lambda l: l.sort_key):
+            if link.url in self._seen:
+                continue
+            self._seen.add(link.url)
+            record = journal.get(link.url) if journal else None
+            if record and record.completed:
+                continue
+            self.discovered_count += 1
+            await discovered.put((self.discovered_count, link.url))
+
+    async def _filter(self, discovered: asyncio.Queue, playable: asyncio.Queue):
+        """预扫描阶段：筛除已完成的视频，其余交给播放标签页"""
+        video_manager = self.video_manager
+        while True:
+            item = await discovered.get()
+            if item is None:
+                return
+            _, link = item
+
+            if self.prescan_concurrency > 0:
+                result = await fetch_prescan_result(
+                    video_manager.page.context,
+                    link,
+                    video_manager.selectors,
+                    video_manager.auth_manager.login_host
+                )
+                if not result.session_valid:
+                    video_manager.auth_manager.update_validity(False)
+                    raise Exception("Cookie已失效，请重新获取Cookie")
+                if result.completed:
+                    video_manager.record_progress(link, True)
+                    continue
+
+            if not self._first_ready:
+                self._first_ready = True
+                print(f"⏱️ 首个待播放视频已就绪 (启动后 {time.perf_counter() - self._started_at:.1f} 秒)")
+            await playable.put(item)
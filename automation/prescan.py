@@ -0,0 +1,82 @@
+"""
+完成状态预扫描模块
+使用浏览器上下文的 APIRequestContext 以纯HTTP方式批量获取视频页面，
+在打开标签页之前筛除已完成的视频
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext
+from .parsing import extract_texts
+from .probe import PageSelectors
+
+
+@dataclass
+class PrescanResult:
+    """单个视频页面的预扫描结果"""
+    url: str
+    completion_text: Optional[str] = None
+    watched_text: Optional[str] = None
+    session_valid: bool = True
+    error: Optional[str] = None
+
+    @property
+    def completed(self) -> bool:
+        """页面是否已标记为"已完成\""""
+        return bool(self.completion_text and "已完成" in self.completion_text.strip())
+
+
+async def fetch_prescan_result(context: BrowserContext, url: str, selectors: PageSelectors,
+                               login_host: Optional[str] = None) -> PrescanResult:
+    """
+    以HTTP方式获取单个视频页面并解析完成状态
+    :param context: 已登录的浏览器上下文（共享其Cookie）
+    :param url: 视频页面URL
+    :param selectors: 页面选择器配置
+    :param login_host: SSO登录页所在主机名
+    :return: 预扫描结果
+    """
+    try:
+        response = await context.request.get(url, max_redirects=0)
+        if 300 <= response.status < 400:
+            location = response.headers.get('location', '')
+            if login_host and urlparse(location).netloc == login_host:
+                return PrescanResult(url, session_valid=False)
+            return PrescanResult(url, error=f"页面被重定向到: {location}")
+        if not response.ok:
+            return PrescanResult(url, error=f"HTTP {response.status}")
+
+        html = await response.text()
+        if selectors.guest_block_text in html:
+            return PrescanResult(url, session_valid=False)
+        texts = extract_texts(html, {
+            'completion': selectors.completion,
+            'watched': selectors.watched_time,
+        })
+        return PrescanResult(url, texts['completion'], texts['watched'])
+    except Exception as e:
+        return PrescanResult(url, error=str(e))
+
+
+async def prescan_completion(context: BrowserContext, video_links: List[str],
+                             selectors: PageSelectors, concurrency: int = 8,
+                             login_host: Optional[str] = None) -> Dict[str, PrescanResult]:
+    """
+    并发预扫描所有视频页面
+    :param context: 已登录的浏览器上下文
+    :param video_links: 视频链接列表
+    :param selectors: 页面选择器配置
+    :param concurrency: 最大并发请求数
+    :param login_host: SSO登录页所在主机名
+    :return: {视频链接: 预扫描结果}
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url: str) -> PrescanResult:
+        async with semaphore:
+            return await fetch_prescan_result(context, url, selectors, login_host)
+
+    results = await asyncio.gather(*(fetch(url) for url in video_links))
+    return {result.url: result for result in results}
@@ -0,0 +1,137 @@
+"""
+页面状态探测模块
+通过一次 evaluate 调用收集视频页面的全部状态，减少 Playwright 往返次数
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+
+@dataclass
+class PageSelectors:
+    """视频页面相关的CSS选择器，统一在此配置"""
+    video: str = "video"
+    play_button: Optional[str] = ".vjs-big-play-button"
+    completion: str = ".tips-completion"
+    watched_time: str = ".num-gksc > span"
+    guest_block_text: str = "访客不能访问此课程"
+
+
+@dataclass
+class PageState:
+    """一次探测得到的页面状态"""
+    title: str = ""
+    completion_text: Optional[str] = None
+    has_play_button: bool = False
+    has_video: bool = False
+    video_duration: Optional[float] = None
+    current_time: float = 0.0
+    paused: bool = True
+    ended: bool = False
+    watched_text: Optional[str] = None
+    guest_blocked: bool = False
+
+    @property
+    def completed(self) -> bool:
+        """页面是否已标记为"已完成\""""
+        return bool(self.completion_text and "已完成" in self.completion_text.strip())
+
+
+# 视频页面就绪条件：完成提示、播放按钮、已加载元数据的视频或Cookie失效提示任一出现
+_VIDEO_PAGE_READY_SCRIPT = """
+sel => {
+    if (document.querySelector(sel.completion)) return true;
+    if (sel.playButton && document.querySelector(sel.playButton)) return true;
+    const video = document.querySelector(sel.video);
+    if (video && video.readyState >= 1) return true;
+    const main = document.querySelector('#region-main, [role=main]');
+    return !!(main && main.textContent.includes(sel.guestBlockText));
+}
+"""
+
+# 在页面内一次性读取所有状态；可选等待视频元数据加载以获取时长
+_PROBE_SCRIPT = """
+async ([sel, metadataTimeout]) => {
+    const video = document.querySelector(sel.video);
+    if (video && !(video.duration > 0) && metadataTimeout > 0) {
+        await new Promise(resolve => {
+            const timer = setTimeout(resolve, metadataTimeout);
+            video.addEventListener('loadedmetadata', () => {
+                clearTimeout(timer);
+                resolve();
+            }, { once: true });
+        });
+    }
+    const completion = document.querySelector(sel.completion);
+    const watched = document.querySelector(sel.watchedTime);
+    const main = document.querySelector('#region-main, [role=main]') || document.body;
+    return {
+        title: document.title,
+        completionText: completion ? completion.textContent : null,
+        hasPlayButton: sel.playButton ? !!document.querySelector(sel.playButton) : false,
+        hasVideo: !!video,
+        videoDuration: video && video.duration > 0 && isFinite(video.duration) ? video.duration : null,
+        currentTime: video ? video.currentTime : 0,
+        paused: video ? video.paused : true,
+        ended: video ? video.ended : false,
+        watchedText: watched ? watched.textContent : null,
+        guestBlocked: main ? main.textContent.includes(sel.guestBlockText) : false,
+    };
+}
+"""
+
+
+def _selectors_arg(selectors: PageSelectors) -> dict:
+    """将选择器配置转换为传给页面脚本的参数"""
+    return {
+        'video': selectors.video,
+        'playButton': selectors.play_button,
+        'completion': selectors.completion,
+        'watchedTime': selectors.watched_time,
+        'guestBlockText': selectors.guest_block_text,
+    }
+
+
+async def wait_for_video_page_ready(page: Page, selectors: PageSelectors, timeout: float) -> bool:
+    """
+    等待视频页面的关键元素出现，替代固定等待和 networkidle
+    :param page: Playwright页面对象
+    :param selectors: 页面选择器配置
+    :param timeout: 最长等待时间(秒)
+    :return: 是否在超时前就绪
+    """
+    try:
+        await page.wait_for_function(
+            _VIDEO_PAGE_READY_SCRIPT,
+            arg=_selectors_arg(selectors),
+            timeout=timeout * 1000,
+            polling=100
+        )
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def probe_page_state(page: Page, selectors: PageSelectors,
+                           metadata_timeout: float = 0) -> PageState:
+    """
+    通过单次 evaluate 调用获取视频页面状态
+    :param page: Playwright页面对象
+    :param selectors: 页面选择器配置
+    :param metadata_timeout: 视频元数据未加载时最多等待的时间(秒)，0表示不等待
+    :return: 页面状态
+    """
+    raw = await page.evaluate(_PROBE_SCRIPT, [_selectors_arg(selectors), int(metadata_timeout * 1000)])
+    return PageState(
+        title=raw['title'],
+        completion_text=raw['completionText'],
+        has_play_button=raw['hasPlayButton'],
+        has_video=raw['hasVideo'],
+        video_duration=raw['videoDuration'],
+        current_time=raw['currentTime'] or 0.0,
+        paused=raw['paused'],
+        ended=raw['ended'],
+        watched_text=raw['watchedText'],
+        guest_blocked=raw['guestBlocked'],
+    )
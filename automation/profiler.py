@@ -0,0 +1,136 @@
+"""
+运行时性能分析模块
+定期采样事件循环延迟，并统计视频、认证等模块发出的 Playwright 调用的往返耗时，
+用于判断标签页增多后瓶颈在事件循环还是浏览器。仅在启用时替换 Playwright 方法，关闭时没有任何开销
+"""
+
+import asyncio
+import functools
+import time
+from typing import List, Optional, Tuple
+from playwright.async_api import APIRequestContext, BrowserContext, Locator, Page
+from .timing import PhaseTimings
+
+# 统计的 Playwright 调用：(类, 方法名, 报告中的名称)
+# 即 VideoManager、AuthManager、SessionKeepAlive、probe 模块以及链接发现/预扫描实际发出的调用
+PROFILED_CALLS = (
+    # 页面导航与就绪等待
+    (Page, 'goto', 'page.goto'),
+    (Page, 'wait_for_function', 'page.wait_for_function'),
+    (Page, 'wait_for_selector', 'page.wait_for_selector'),
+    # 页面状态探测、会话续期脚本与浏览器关闭检测
+    (Page, 'evaluate', 'page.evaluate'),
+    (Page, 'title', 'page.title'),
+    (Page, 'click', 'page.click'),
+    # 空闲时的播放状态检查、会话刷新按钮与链接提取
+    (Locator, 'count', 'locator.count'),
+    (Locator, 'evaluate', 'locator.evaluate'),
+    (Locator, 'evaluate_all', 'locator.evaluate_all'),
+    (Locator, 'click', 'locator.click'),
+    # 登录状态快照的保存与恢复
+    (BrowserContext, 'storage_state', 'context.storage_state'),
+    (BrowserContext, 'add_cookies', 'context.add_cookies'),
+    # 链接发现与预扫描的 HTTP 请求
+    (APIRequestContext, 'get', 'request.get'),
+)
+
+# 延迟直方图的桶上限(毫秒)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class RuntimeProfiler:
+    """事件循环延迟与 Playwright 调用耗时分析器"""
+
+    # 事件循环延迟超过该值(毫秒)视为一次卡顿
+    STALL_THRESHOLD_MS = 100
+
+    def __init__(self, lag_interval: float = 0.1):
+        """
+        初始化分析器
+        :param lag_interval: 事件循环延迟的采样间隔(秒)
+        """
+        self.lag_interval = lag_interval
+        self.latencies = PhaseTimings()
+        self.loop_lag: List[float] = []
+        self._originals: List[Tuple[type, str, object]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._started = 0.0
+
+    def start(self):
+        """替换需要统计的 Playwright 方法并启动事件循环延迟采样（需在事件循环中调用）"""
+        self._started = time.perf_counter()
+        for owner, method, name in PROFILED_CALLS:
+            original = getattr(owner, method)
+            self._originals.append((owner, method, original))
+            setattr(owner, method, self._wrap(name, original))
+        self._task = asyncio.create_task(self._sample_loop_lag())
+
+    async def stop(self):
+        """停止采样并恢复原始方法"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for owner, method, original in reversed(self._originals):
+            setattr(owner, method, original)
+        self._originals.clear()
+
+    def _wrap(self, name: str, func):
+        latencies = self.latencies
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                latencies.add(name, time.perf_counter() - started)
+
+        return wrapper
+
+    async def _sample_loop_lag(self):
+        """每次定时唤醒比预期晚多少即为事件循环被占用的时间"""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag.append(max(loop.time() - expected, 0.0))
+
+    @staticmethod
+    def histogram(values: List[float]) -> str:
+        """按毫秒桶统计次数，只显示非空的桶"""
+        counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for value in values:
+            ms = value * 1000
+            index = next((i for i, bucket in enumerate(LATENCY_BUCKETS_MS) if ms <= bucket), len(LATENCY_BUCKETS_MS))
+            counts[index] += 1
+        labels = [f"≤{bucket}ms" for bucket in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return "  ".join(f"{label}:{count}" for label, count in zip(labels, counts) if count)
+
+    def print_report(self, top: int = 10):
+        """
+        打印分析报告：事件循环延迟和总耗时最多的前 N 类 Playwright 调用
+        :param top: 显示的调用类型数量
+        """
+        print(f"\n🔬 性能分析报告 (运行 {time.perf_counter() - self._started:.1f} 秒)")
+        if self.loop_lag:
+            ordered = sorted(self.loop_lag)
+            stalls = sum(1 for lag in ordered if lag * 1000 > self.STALL_THRESHOLD_MS)
+            print(f"   事件循环延迟: 采样 {len(ordered)} 次, 平均 {sum(ordered) / len(ordered) * 1000:.1f} ms, "
+                  f"p95 {ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000:.1f} ms, "
+                  f"最大 {ordered[-1] * 1000:.1f} ms, 超过 {self.STALL_THRESHOLD_MS} ms 共 {stalls} 次")
+            print(f"      {self.histogram(ordered)}")
+
+        summary = self.latencies.summary()
+        if not summary:
+            print("   未记录到 Playwright 调用")
+            return
+        print(f"   Playwright 调用 (按总耗时前 {min(top, len(summary))} 类):")
+        for name, stats in list(summary.items())[:top]:
+            print(f"   {name:<16} {stats['count']:>6} 次  共 {stats['total']:>8.1f} 秒  "
+                  f"平均 {stats['mean'] * 1000:>7.1f} ms  p50 {stats['p50'] * 1000:>7.1f} ms  "
+                  f"p95 {stats['p95'] * 1000:>7.1f} ms  最大 {stats['max'] * 1000:>7.1f} ms")
+            print(f"      {self.histogram(self.latencies.durations[name])}")
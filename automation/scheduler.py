@@ -0,0 +1,191 @@
+"""
+播放调度模块
+多标签页并发播放时按剩余时长从长到短（LPT）分配视频，使总耗时接近理论下限，
+并根据实际完成情况实时修正预计完成时间
+"""
+
+import asyncio
+import heapq
+from datetime import datetime
+from typing import Dict, List, Optional
+from playwright.async_api import Page
+from .clock import RealClock, format_time
+from .probe import PageSelectors, probe_page_state, wait_for_video_page_ready
+from .timing import timings
+
+
+def parse_watched(watched_text: Optional[str]) -> float:
+    """
+    解析页面显示的已观看时长(秒)，无法解析时视为0
+    :param watched_text: 已观看时长元素的文本
+    :return: 已观看时长(秒)
+    """
+    try:
+        return max(float((watched_text or '').strip()), 0.0)
+    except ValueError:
+        return 0.0
+
+
+def projected_makespan(estimates: List[float], tab_count: int,
+                       busy: Optional[List[float]] = None) -> float:
+    """
+    按给定顺序将视频依次分配给最早空闲的标签页，计算全部完成还需的时间
+    :param estimates: 待播放视频的预计时长(秒)，按分配顺序排列
+    :param tab_count: 标签页数量
+    :param busy: 各标签页当前视频的剩余时间(秒)，未提供的标签页视为空闲
+    :return: 预计总耗时(秒)
+    """
+    free_at = list(busy or [])[:tab_count]
+    free_at += [0.0] * (tab_count - len(free_at))
+    heapq.heapify(free_at)
+    for estimate in estimates:
+        heapq.heappush(free_at, heapq.heappop(free_at) + estimate)
+    return max(free_at) if free_at else 0.0
+
+
+def makespan_lower_bound(estimates: List[float], tab_count: int) -> float:
+    """
+    总耗时的理论下限：最长的单个视频与平均分摊后的时长两者取大
+    :param estimates: 各视频的预计时长(秒)
+    :param tab_count: 标签页数量
+    :return: 理论最短总耗时(秒)
+    """
+    if not estimates:
+        return 0.0
+    return max(max(estimates), sum(estimates) / tab_count)
+
+
+class MakespanScheduler:
+    """最长剩余时长优先（LPT）调度器"""
+
+    # 探测视频页面时等待页面就绪和视频元数据的最长时间(秒)
+    PROBE_READY_TIMEOUT = 15
+    PROBE_METADATA_TIMEOUT = 10
+
+    def __init__(self, tab_count: int, default_duration: float = 60,
+                 clock: Optional[RealClock] = None):
+        """
+        初始化调度器
+        :param tab_count: 同时播放的标签页数量
+        :param default_duration: 无法获取时长的页面的预计耗时(秒)
+        :param clock: 计算预计完成时间使用的时钟，默认使用真实时钟
+        """
+        self.tab_count = max(tab_count, 1)
+        self.default_duration = default_duration
+        self.clock = clock or RealClock()
+        self.estimates: Dict[str, float] = {}
+        self._pending: List[str] = []
+        self._running: Dict[str, float] = {}
+
+    def estimate(self, link: str) -> float:
+        """视频的预计剩余时长(秒)"""
+        return self.estimates.get(link, self.default_duration)
+
+    async def probe_remaining(self, video_manager, video_links: List[str]) -> List[str]:
+        """
+        获取每个视频的剩余时长：优先使用进度记录中的时长，其余在临时标签页中探测
+        探测到已完成的视频会被记录并从列表中移除
+        :param video_manager: 视频管理器（提供上下文、选择器和进度记录）
+        :param video_links: 视频链接列表
+        :return: 仍需播放的视频链接列表
+        """
+        journal = video_manager.journal
+        unknown = []
+        for link in video_links:
+            record = journal.get(link) if journal else None
+            if record and record.duration:
+                self.estimates[link] = max(record.duration - (record.watched or 0), 0.0)
+            else:
+                unknown.append(link)
+
+        completed = set()
+        if unknown:
+            probe_count = min(self.tab_count, len(unknown))
+            print(f"\n📏 正在探测 {len(unknown)} 个视频的时长 (标签页 {probe_count})...")
+            queue: asyncio.Queue = asyncio.Queue()
+            for link in unknown:
+                queue.put_nowait(link)
+
+            async def prober():
+                page = await video_manager.page.context.new_page()
+                try:
+                    while not queue.empty():
+                        link = queue.get_nowait()
+                        if await self._probe_link(page, link, video_manager):
+                            completed.add(link)
+                finally:
+                    await page.close()
+
+            await asyncio.gather(*(prober() for _ in range(probe_count)))
+            if completed:
+                print(f"✓ 探测时发现 {len(completed)} 个已完成的视频")
+
+        return [link for link in video_links if link not in completed]
+
+    async def _probe_link(self, page: Page, link: str, video_manager) -> bool:
+        """
+        打开视频页面读取总时长和已观看时长
+        :return: 视频是否已完成
+        """
+        selectors: PageSelectors = video_manager.selectors
+        try:
+            with timings.phase("schedule_probe"):
+                await page.goto(link, wait_until='domcontentloaded')
+                await wait_for_video_page_ready(page, selectors, self.PROBE_READY_TIMEOUT)
+                state = await probe_page_state(page, selectors, self.PROBE_METADATA_TIMEOUT)
+        except Exception as e:
+            print(f"⚠ 探测视频时长失败 {link}: {e}")
+            return False
+
+        if state.guest_blocked:
+            video_manager.auth_manager.update_validity(False)
+            raise Exception("Cookie已失效，请重新获取Cookie")
+        if state.completed:
+            video_manager.record_progress(link, True, state.video_duration)
+            return True
+        if state.video_duration:
+            watched = parse_watched(state.watched_text)
+            self.estimates[link] = max(state.video_duration - watched, 0.0)
+            video_manager.record_progress(link, False, state.video_duration, watched or None)
+        return False
+
+    def plan(self, video_links: List[str]) -> List[str]:
+        """
+        按预计剩余时长从长到短排序（时长相同时保持原顺序），并打印预计完成时间
+        :param video_links: 视频链接列表
+        :return: 调度后的视频链接列表
+        """
+        ordered = sorted(video_links, key=self.estimate, reverse=True)
+        self._pending = list(ordered)
+        self._running.clear()
+
+        estimates = [self.estimate(link) for link in ordered]
+        makespan = projected_makespan(estimates, self.tab_count)
+        lower_bound = makespan_lower_bound(estimates, self.tab_count)
+        print(f"\n🗓️ 按剩余时长从长到短调度 {len(ordered)} 个视频 (标签页 {self.tab_count})")
+        print(f"   总时长 {format_time(sum(estimates))}, 理论最短 {format_time(lower_bound)}, "
+              f"预计耗时 {format_time(makespan)}")
+        self.print_projection()
+        return ordered
+
+    def start(self, link: str):
+        """标记视频开始播放"""
+        if link in self._pending:
+            self._pending.remove(link)
+        self._running[link] = self.clock.time()
+
+    def finish(self, link: str):
+        """标记视频播放结束（成功或失败）"""
+        self._running.pop(link, None)
+
+    def remaining_makespan(self) -> float:
+        """根据正在播放和尚未开始的视频，计算全部完成还需的时间(秒)"""
+        now = self.clock.time()
+        busy = [max(started + self.estimate(link) - now, 0.0) for link, started in self._running.items()]
+        return projected_makespan([self.estimate(link) for link in self._pending], self.tab_count, busy)
+
+    def print_projection(self):
+        """打印预计全部完成的时刻"""
+        remaining = self.remaining_makespan()
+        finish_at = datetime.fromtimestamp(self.clock.wall_time() + remaining)
+        print(f"📅 预计完成时间: {finish_at:%H:%M:%S} (还需 {format_time(remaining)})")
@@ -0,0 +1,211 @@
+"""
+会话快照模块
+基于 Playwright storage_state 在内存中保存一份登录状态（Cookie + localStorage），
+可直接用于创建任意数量的新上下文，无需重复读取文件或重新登录
+"""
+
+import json
+import os
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+from playwright.async_api import Browser, BrowserContext
+
+# 将快照中的 localStorage 写入对应源（用于无法在创建时传入 storage_state 的上下文）
+_LOCAL_STORAGE_SCRIPT = """
+(origins => {
+    const entry = origins.find(o => o.origin === location.origin);
+    if (!entry) return;
+    for (const item of entry.localStorage) {
+        if (localStorage.getItem(item.name) === null) localStorage.setItem(item.name, item.value);
+    }
+})(%s);
+"""
+
+# 会话检查结果及对应的进程退出码
+SESSION_VALID = "valid"
+SESSION_EXPIRED = "expired"
+SESSION_SSO_REDIRECT = "sso_redirect"
+SESSION_ERROR = "error"
+SESSION_EXIT_CODES = {
+    SESSION_VALID: 0,
+    SESSION_EXPIRED: 1,
+    SESSION_SSO_REDIRECT: 2,
+    SESSION_ERROR: 3,
+}
+
+
+def write_text_atomic(path: str, text: str):
+    """
+    原子地写入文本文件：先写临时文件再替换，避免并发写入、中途退出或其他进程读到写了一半的文件
+    :param path: 目标文件路径
+    :param text: 文件内容
+    """
+    target = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, target)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def write_json_atomic(path: str, data):
+    """
+    原子地写入JSON文件
+    :param path: 目标文件路径
+    :param data: 要写入的数据
+    """
+    write_text_atomic(path, json.dumps(data, indent=2, ensure_ascii=False))
+
+
+class SessionSnapshot:
+    """会话快照"""
+
+    def __init__(self, state: Optional[dict] = None):
+        """
+        初始化会话快照
+        :param state: storage_state 格式的状态 {cookies: [...], origins: [...]}
+        """
+        self.state = state or {'cookies': [], 'origins': []}
+
+    @classmethod
+    def load(cls, cookie_file: str) -> Optional['SessionSnapshot']:
+        """
+        从文件读取会话快照，兼容 cookies.json（Cookie列表）和 storage_state 两种格式
+        :param cookie_file: 文件路径
+        :return: 会话快照，文件不存在或格式错误时返回 None
+        """
+        path = Path(cookie_file)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ 读取Cookie文件失败: {e}")
+            return None
+        if isinstance(data, list):
+            return cls({'cookies': data, 'origins': []})
+        if isinstance(data, dict) and 'cookies' in data:
+            return cls({'cookies': data['cookies'], 'origins': data.get('origins', [])})
+        print(f"⚠ 无法识别的Cookie文件格式: {cookie_file}")
+        return None
+
+    @property
+    def cookies(self) -> list:
+        """快照中的Cookie列表"""
+        return self.state['cookies']
+
+    def cookie_header(self, url: str) -> str:
+        """
+        按域名、路径、secure 和过期时间筛选出发往该URL的Cookie，拼接为请求头
+        :param url: 请求URL
+        :return: Cookie 请求头的值
+        """
+        parsed = urlparse(url)
+        host = parsed.hostname or ''
+        path = parsed.path or '/'
+        now = time.time()
+        pairs = []
+        for cookie in self.cookies:
+            domain = (cookie.get('domain') or '').lstrip('.')
+            if not domain or not (host == domain or host.endswith('.' + domain)):
+                continue
+            if not path.startswith(cookie.get('path') or '/'):
+                continue
+            if cookie.get('secure') and parsed.scheme != 'https':
+                continue
+            expires = cookie.get('expires', -1)
+            if expires and 0 < expires < now:
+                continue
+            pairs.append(f"{cookie['name']}={cookie['value']}")
+        return '; '.join(pairs)
+
+    async def capture(self, context: BrowserContext):
+        """
+        从浏览器上下文更新快照
+        :param context: 浏览器上下文
+        """
+        self.state = await context.storage_state()
+
+    def save(self, cookie_file: str):
+        """
+        将快照中的Cookie原子地写入文件（保持 cookies.json 的Cookie列表格式）
+        :param cookie_file: 文件路径
+        """
+        write_json_atomic(cookie_file, self.cookies)
+
+    async def new_context(self, browser: Browser, **options) -> BrowserContext:
+        """
+        创建一个已应用此快照的新上下文
+        :param browser: 浏览器对象
+        :param options: 传给 browser.new_context 的其他参数
+        :return: 新的浏览器上下文
+        """
+        return await browser.new_context(storage_state=self.state, **options)
+
+    async def apply(self, context: BrowserContext):
+        """
+        将快照应用到已存在的上下文（如持久化上下文）
+        :param context: 浏览器上下文
+        """
+        if self.cookies:
+            await context.add_cookies(self.cookies)
+        if self.state.get('origins'):
+            await context.add_init_script(_LOCAL_STORAGE_SCRIPT % json.dumps(self.state['origins']))
+
+
+class _NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """不跟随重定向，让 3xx 响应以 HTTPError 的形式返回"""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def check_session_http(base_url: str, cookie_file: str, login_host: Optional[str] = None,
+                       guest_block_text: str = "访客不能访问此课程",
+                       timeout: float = 10) -> Tuple[str, str]:
+    """
+    不启动浏览器，直接用 cookies.json 请求 Moodle 页面判断会话状态（不跟随重定向）
+    :param base_url: 需要登录才能访问的页面URL
+    :param cookie_file: Cookie文件路径
+    :param login_host: SSO登录页所在主机名
+    :param guest_block_text: Cookie失效时页面显示的提示文字
+    :param timeout: 请求超时时间(秒)
+    :return: (会话状态, 说明)，会话状态为 SESSION_* 常量之一
+    """
+    session = SessionSnapshot.load(cookie_file)
+    if session is None:
+        return SESSION_EXPIRED, f"Cookie文件不存在或无法读取: {cookie_file}"
+    cookie_header = session.cookie_header(base_url)
+    if not cookie_header:
+        return SESSION_EXPIRED, "没有可用于该站点的Cookie（可能均已过期）"
+
+    request = urllib.request.Request(base_url, headers={
+        'Cookie': cookie_header,
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    })
+    opener = urllib.request.build_opener(_NoRedirectHandler)
+    try:
+        with opener.open(request, timeout=timeout) as response:
+            body = response.read().decode('utf-8', errors='replace')
+    except urllib.error.HTTPError as e:
+        if not 300 <= e.code < 400:
+            return SESSION_ERROR, f"HTTP {e.code}"
+        location = e.headers.get('Location', '')
+        if login_host and urlparse(location).netloc == login_host:
+            return SESSION_SSO_REDIRECT, f"被重定向到SSO登录页: {location}"
+        return SESSION_EXPIRED, f"被重定向到: {location}"
+    except (urllib.error.URLError, OSError) as e:
+        return SESSION_ERROR, f"请求失败: {e}"
+
+    if guest_block_text in body:
+        return SESSION_EXPIRED, "页面提示访客无法访问"
+    return SESSION_VALID, "会话有效"
@@ -0,0 +1,308 @@
+"""
+调度模拟模块
+在虚拟时钟上用合成的视频页面运行真实的多标签页调度（run_playback_workers、MakespanScheduler）
+和播放流程（play_video 的剩余时间计算、事件等待循环与默认等待），几秒内得到数百小时工作量的
+预计总耗时、标签页空闲时间和无效等待时间
+"""
+
+import asyncio
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+from .clock import VirtualClock
+from .scheduler import MakespanScheduler, makespan_lower_bound
+from .timing import OUTCOME_DEFAULT_WAIT, timings
+from .video import VideoManager
+
+
+@dataclass
+class SimulatedVideo:
+    """一个合成的视频页面"""
+    url: str
+    # 视频总时长(秒)，None 表示页面中没有视频（按默认等待时间处理）
+    duration: Optional[float]
+    watched: float = 0.0
+    completed: bool = False
+
+
+@dataclass
+class SimulationResult:
+    """一次模拟的结果"""
+    tab_count: int
+    scheduling: str
+    videos: int
+    makespan: float
+    lower_bound: float
+    tab_busy: List[float] = field(default_factory=list)
+    navigation_time: float = 0.0
+    default_wait_time: float = 0.0
+
+    @property
+    def idle_time(self) -> float:
+        """所有标签页空闲时间之和（通常集中在最后几个视频播放时）"""
+        return sum(self.makespan - busy for busy in self.tab_busy)
+
+    @property
+    def wasted_wait(self) -> float:
+        """没有播放任何视频的等待时间：页面导航开销与非视频页面的默认等待"""
+        return self.navigation_time + self.default_wait_time
+
+    @property
+    def efficiency(self) -> float:
+        """理论最短耗时与模拟耗时之比"""
+        return self.lower_bound / self.makespan if self.makespan else 1.0
+
+
+class _SimulatedContext:
+    """代替浏览器上下文：持有合成视频和模拟结果，负责创建模拟页面"""
+
+    browser = None
+
+    def __init__(self, videos: Dict[str, SimulatedVideo], clock: VirtualClock, result: SimulationResult,
+                 navigation_overhead: float):
+        self.videos = videos
+        self.clock = clock
+        self.result = result
+        self.navigation_overhead = navigation_overhead
+        self.pages = []
+        self.managers = []
+
+    async def new_page(self):
+        return _SimulatedPage(self)
+
+
+class _SimulatedPage:
+    """
+    代替浏览器页面，实现 VideoManager.play_video 用到的页面操作。
+    每次导航耗时 navigation_overhead，导航完成后视频从已观看位置开始播放，
+    播放到结尾时通过播放监听的页面绑定推送 ended 事件；视频元数据总是立即可用
+    """
+
+    # 播放位置距结尾不足该值(秒)即视为看完，与播放循环判断结束的容差一致
+    COMPLETION_TOLERANCE = 1
+
+    def __init__(self, context: _SimulatedContext):
+        self.context = context
+        self.url = "about:blank"
+        self._closed = False
+        self._binding = None
+        self._close_handlers = []
+        self._video: Optional[SimulatedVideo] = None
+        self._playback: Optional[asyncio.Task] = None
+        self._started_at = 0.0
+        self._watched_at_start = 0.0
+        context.pages.append(self)
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    async def close(self):
+        self._stop_playback()
+        self._closed = True
+        for handler in self._close_handlers:
+            handler(self)
+
+    async def expose_binding(self, name: str, callback):
+        self._binding = callback
+
+    async def add_init_script(self, script: str):
+        pass
+
+    def on(self, event: str, handler):
+        if event == "close":
+            self._close_handlers.append(handler)
+
+    async def title(self) -> str:
+        return ""
+
+    async def goto(self, url: str, wait_until: Optional[str] = None):
+        self._stop_playback()
+        clock = self.context.clock
+        await clock.sleep(self.context.navigation_overhead)
+        self.context.result.navigation_time += self.context.navigation_overhead
+        self.url = url
+        self._video = self.context.videos.get(url)
+        video = self._video
+        if video and video.duration is not None and not video.completed:
+            self._started_at = clock.time()
+            self._watched_at_start = video.watched
+            self._playback = asyncio.create_task(self._play(video))
+
+    async def wait_for_function(self, expression: str, arg=None, timeout: Optional[float] = None,
+                                polling=None) -> bool:
+        return True
+
+    async def evaluate(self, expression: str, arg=None) -> dict:
+        """只支持 probe_page_state 的页面状态探测脚本"""
+        video = self._video
+        state = self._video_state()
+        return {
+            'title': "",
+            'completionText': "已完成" if video and video.completed else None,
+            'hasPlayButton': False,
+            'hasVideo': state is not None,
+            'videoDuration': video.duration if state else None,
+            'currentTime': state['currentTime'] if state else 0,
+            'paused': state['paused'] if state else True,
+            'ended': state['ended'] if state else False,
+            'watchedText': f"{video.watched:g}" if state else None,
+            'guestBlocked': False,
+        }
+
+    def locator(self, selector: str) -> '_SimulatedVideoLocator':
+        return _SimulatedVideoLocator(self)
+
+    def _video_state(self) -> Optional[dict]:
+        """当前视频的播放状态，同时把已播放的时长计入合成视频（模拟服务器记录观看进度）"""
+        video = self._video
+        if video is None or video.duration is None:
+            return None
+        playing = self._playback is not None and not self._playback.done()
+        if playing:
+            elapsed = self.context.clock.time() - self._started_at
+            video.watched = min(self._watched_at_start + elapsed, video.duration)
+            if video.watched >= video.duration - self.COMPLETION_TOLERANCE:
+                video.completed = True
+        return {
+            'paused': not playing,
+            'currentTime': video.watched,
+            'duration': video.duration,
+            'ended': not playing and video.completed,
+        }
+
+    async def _play(self, video: SimulatedVideo):
+        await self.context.clock.sleep(video.duration - video.watched)
+        video.watched = video.duration
+        video.completed = True
+        if self._binding:
+            self._binding(None, {
+                'type': 'ended',
+                'currentTime': video.duration,
+                'duration': video.duration,
+                'paused': True,
+                'ended': True,
+            })
+
+    def _stop_playback(self):
+        if self._playback is not None and not self._playback.done():
+            self._video_state()
+            self._playback.cancel()
+        self._playback = None
+
+
+class _SimulatedVideoLocator:
+    """代替视频元素的定位器，供空闲时的播放状态检查使用"""
+
+    def __init__(self, page: _SimulatedPage):
+        self.page = page
+
+    async def count(self) -> int:
+        return 0 if self.page._video_state() is None else 1
+
+    async def evaluate(self, expression: str, arg=None) -> Optional[dict]:
+        return self.page._video_state()
+
+
+class _SimulatedAuth:
+    """代替认证管理器：模拟中会话始终有效"""
+
+    login_host = None
+
+    def for_page(self, page):
+        return self
+
+    def set_page(self, page):
+        pass
+
+    def close(self):
+        pass
+
+    def update_validity(self, valid: bool):
+        pass
+
+    async def refresh_cookies(self):
+        pass
+
+    async def check_cookie_validity(self) -> bool:
+        return True
+
+
+class SimulatedVideoManager(VideoManager):
+    """在模拟页面上运行真实 play_video 的视频管理器，额外统计每个标签页处理视频的累计时间"""
+
+    def __init__(self, page: _SimulatedPage, clock: VirtualClock,
+                 scheduler: Optional[MakespanScheduler] = None):
+        """
+        初始化模拟视频管理器
+        :param page: 模拟页面
+        :param clock: 虚拟时钟
+        :param scheduler: 调度器（可选）
+        """
+        super().__init__(page, _SimulatedAuth(), scheduler=scheduler, clock=clock)
+        self.busy = 0.0
+        page.context.managers.append(self)
+
+    def for_page(self, page) -> 'SimulatedVideoManager':
+        return SimulatedVideoManager(page, self.clock, self.scheduler)
+
+    async def play_video(self, video_url: str, video_selector: str = "video",
+                         play_button_selector: Optional[str] = None,
+                         default_wait_time: int = 60):
+        started_at = self.clock.time()
+        try:
+            await super().play_video(video_url, video_selector, play_button_selector, default_wait_time)
+        finally:
+            self.busy += self.clock.time() - started_at
+        if timings.videos.get(video_url, {}).get('outcome') == OUTCOME_DEFAULT_WAIT:
+            self.page.context.result.default_wait_time += default_wait_time
+
+
+async def simulate(videos: List[SimulatedVideo], tab_count: int, lpt: bool = False,
+                   default_wait_time: float = 60, navigation_overhead: float = 3.0) -> SimulationResult:
+    """
+    在虚拟时钟上模拟一次多标签页播放
+    :param videos: 待观看的合成视频（按原有顺序）
+    :param tab_count: 同时播放的标签页数量
+    :param lpt: 是否按剩余时长从长到短调度
+    :param default_wait_time: 非视频页面的默认等待时间(秒)
+    :param navigation_overhead: 每个视频的页面开销(秒)
+    :return: 模拟结果
+    """
+    clock = VirtualClock()
+    catalog = {video.url: replace(video) for video in videos}
+    links = [video.url for video in videos if not video.completed]
+    tab_count = max(1, min(tab_count, len(links) or 1))
+
+    estimates = {
+        url: navigation_overhead + (
+            default_wait_time if video.duration is None else max(video.duration - video.watched, 0.0)
+        )
+        for url, video in catalog.items() if not video.completed
+    }
+    result = SimulationResult(
+        tab_count=tab_count,
+        scheduling="LPT" if lpt else "顺序",
+        videos=len(links),
+        makespan=0.0,
+        lower_bound=makespan_lower_bound(list(estimates.values()), tab_count),
+    )
+
+    scheduler = None
+    if lpt:
+        scheduler = MakespanScheduler(tab_count, default_wait_time, clock)
+        scheduler.estimates = estimates
+        links = scheduler.plan(links)
+
+    context = _SimulatedContext(catalog, clock, result, navigation_overhead)
+    manager = SimulatedVideoManager(await context.new_page(), clock, scheduler)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, link in enumerate(links, 1):
+        queue.put_nowait((i, link))
+    for _ in range(tab_count):
+        queue.put_nowait(None)
+    await clock.run(manager.run_playback_workers(queue, tab_count, default_wait_time=default_wait_time,
+                                                 total=len(links)))
+
+    result.makespan = clock.time()
+    result.tab_busy = [tab.busy for tab in context.managers]
+    return result
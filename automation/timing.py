@@ -0,0 +1,220 @@
+"""
+阶段计时模块
+在浏览器启动、Cookie加载、登录检查、链接发现、页面导航、时长探测、播放等待、
+会话续期等阶段边界记录耗时，并为每个视频生成一条结构化记录，
+运行结束后输出JSON报告，可选输出 Prometheus textfile 格式的直方图
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from .session import write_json_atomic, write_text_atomic
+
+# Prometheus 直方图的桶上限(秒)，覆盖从单次页面操作到整个视频播放的耗时
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 1800, 3600)
+
+# 视频记录的结果
+OUTCOME_PENDING = "pending"
+OUTCOME_PLAYED = "played"
+OUTCOME_ALREADY_COMPLETED = "already_completed"
+OUTCOME_NO_WAIT = "no_wait"
+OUTCOME_DEFAULT_WAIT = "default_wait"
+OUTCOME_NOT_VIDEO = "not_video"
+OUTCOME_FAILED = "failed"
+
+
+class PhaseTimings:
+    """阶段耗时记录器"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.durations: Dict[str, List[float]] = {}
+        self.videos: Dict[str, dict] = {}
+
+    @contextmanager
+    def phase(self, name: str, video_url: Optional[str] = None):
+        """
+        记录一个阶段的耗时（阶段内抛出异常时同样记录）
+        :param name: 阶段名称
+        :param video_url: 所属视频（可选），耗时同时累加到该视频的记录中
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started, video_url)
+
+    def add(self, name: str, seconds: float, video_url: Optional[str] = None):
+        """
+        记录一次已测得的阶段耗时
+        :param name: 阶段名称
+        :param seconds: 耗时(秒)
+        :param video_url: 所属视频（可选）
+        """
+        self.durations.setdefault(name, []).append(seconds)
+        record = self.videos.get(video_url) if video_url else None
+        if record is not None:
+            phases = record['phases']
+            phases[name] = phases.get(name, 0.0) + seconds
+
+    def start_video(self, video_url: str):
+        """开始记录一个视频，同一视频重试时覆盖之前的记录"""
+        self.videos[video_url] = {
+            'url': video_url,
+            'started_at': time.time(),
+            'outcome': OUTCOME_PENDING,
+            'video_duration': None,
+            'remaining': None,
+            'total': None,
+            'phases': {},
+            '_started': time.perf_counter(),
+        }
+
+    def finish_video(self, video_url: str, outcome: str,
+                     video_duration: Optional[float] = None, remaining: Optional[float] = None):
+        """
+        结束一个视频的记录
+        :param video_url: 视频链接
+        :param outcome: 结果（OUTCOME_* 之一）
+        :param video_duration: 视频总时长(秒)
+        :param remaining: 开始播放时的剩余时长(秒)
+        """
+        record = self.videos.get(video_url)
+        if record is None:
+            return
+        record['outcome'] = outcome
+        record['video_duration'] = video_duration
+        record['remaining'] = remaining
+        record['total'] = time.perf_counter() - record['_started']
+
+    def fail_video(self, video_url: str, error: Exception):
+        """标记视频播放失败"""
+        record = self.videos.get(video_url)
+        if record is None:
+            return
+        record['outcome'] = OUTCOME_FAILED
+        record['error'] = str(error)
+        record['total'] = time.perf_counter() - record['_started']
+
+    def export(self) -> dict:
+        """导出可序列化的阶段耗时和视频记录（工作进程发回协调进程）"""
+        return {
+            'durations': self.durations,
+            'videos': [
+                {key: value for key, value in record.items() if not key.startswith('_')}
+                for record in self.videos.values()
+            ],
+        }
+
+    def merge(self, data: dict):
+        """
+        合并其他进程导出的记录
+        :param data: export() 的返回值
+        """
+        for name, values in data.get('durations', {}).items():
+            self.durations.setdefault(name, []).extend(values)
+        for record in data.get('videos', []):
+            self.videos[record['url']] = record
+
+    def summary(self) -> Dict[str, dict]:
+        """各阶段的次数、总耗时和分位数，按总耗时从高到低排列"""
+        result = {}
+        for name, values in sorted(self.durations.items(), key=lambda item: sum(item[1]), reverse=True):
+            ordered = sorted(values)
+            result[name] = {
+                'count': len(ordered),
+                'total': sum(ordered),
+                'mean': sum(ordered) / len(ordered),
+                'p50': ordered[len(ordered) // 2],
+                'p95': ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+                'max': ordered[-1],
+            }
+        return result
+
+    def report(self) -> dict:
+        """完整报告：运行时长、阶段汇总和每个视频的记录"""
+        return {
+            'started_at': self.started_at,
+            'wall': time.perf_counter() - self._started,
+            'phases': self.summary(),
+            'videos': [
+                {key: value for key, value in record.items() if not key.startswith('_')}
+                for record in self.videos.values()
+            ],
+        }
+
+    def write_json(self, path: str):
+        """将报告写入JSON文件"""
+        write_json_atomic(path, self.report())
+
+    def prometheus_text(self, prefix: str = "fly_video") -> str:
+        """
+        生成 Prometheus textfile 格式的指标：各阶段耗时直方图、按结果统计的视频数量和运行时长
+        :param prefix: 指标名前缀
+        :return: 指标文本
+        """
+        name = f"{prefix}_phase_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each phase.",
+            f"# TYPE {name} histogram",
+        ]
+        for phase, values in sorted(self.durations.items()):
+            for bucket in HISTOGRAM_BUCKETS:
+                count = sum(1 for value in values if value <= bucket)
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{bucket:g}"}} {count}')
+            lines.append(f'{name}_bucket{{phase="{phase}",le="+Inf"}} {len(values)}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {sum(values):.6f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {len(values)}')
+
+        outcomes: Dict[str, int] = {}
+        for record in self.videos.values():
+            outcomes[record['outcome']] = outcomes.get(record['outcome'], 0) + 1
+        lines += [
+            f"# HELP {prefix}_videos Videos handled in the last run by outcome.",
+            f"# TYPE {prefix}_videos gauge",
+        ]
+        lines += [f'{prefix}_videos{{outcome="{outcome}"}} {count}' for outcome, count in sorted(outcomes.items())]
+        lines += [
+            f"# HELP {prefix}_run_duration_seconds Wall-clock duration of the last run.",
+            f"# TYPE {prefix}_run_duration_seconds gauge",
+            f"{prefix}_run_duration_seconds {time.perf_counter() - self._started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """将指标写入 textfile（原子替换，node_exporter 不会读到写了一半的文件）"""
+        write_text_atomic(path, self.prometheus_text())
+
+    def print_summary(self, top: int = 8):
+        """打印耗时最多的阶段"""
+        summary = self.summary()
+        if not summary:
+            return
+        wall = time.perf_counter() - self._started
+        print(f"\n⏱️ 各阶段耗时 (运行 {wall:.1f} 秒):")
+        for name, stats in list(summary.items())[:top]:
+            share = stats['total'] / wall * 100 if wall else 0
+            print(f"   {name:<20} {stats['count']:>5} 次  共 {stats['total']:>9.1f} 秒 ({share:>5.1f}%)  "
+                  f"平均 {stats['mean']:.2f} 秒  p95 {stats['p95']:.2f} 秒")
+
+
+# 进程内共享的记录器，各模块直接在阶段边界调用 timings.phase(...)
+timings = PhaseTimings()
+
+
+def write_reports(json_file: Optional[str], prometheus_file: Optional[str] = None):
+    """
+    打印阶段耗时汇总并写入报告文件，写入失败只提示不影响退出
+    :param json_file: JSON报告文件路径（为空则不写入）
+    :param prometheus_file: Prometheus textfile 路径（为空则不写入）
+    """
+    timings.print_summary()
+    for path, write in ((json_file, timings.write_json), (prometheus_file, timings.write_prometheus)):
+        if not path:
+            continue
+        try:
+            write(path)
+            print(f"✓ 阶段耗时报告已写入: {path}")
+        except OSError as e:
+            print(f"⚠ 写入阶段耗时报告失败 {path}: {e}")
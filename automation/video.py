@@ -4,10 +4,25 @@
 """
 
 import asyncio
-from typing import List, Optional
-from playwright.async_api import Page
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import List, Optional, Tuple
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeElapsedColumn
 from rich.console import Console
+from .clock import RealClock, format_time
+from .discovery import LinkDiscovery, sort_links
+from .journal import ProgressJournal
+from .media import LowBitrateProfile
+from .metrics import TabFootprint
+from .monitor import PlaybackMonitor
+from .prescan import prescan_completion
+from .scheduler import MakespanScheduler
+from .watchdog import TabMemoryWatchdog
+from .probe import PageSelectors, PageState, probe_page_state, wait_for_video_page_ready
+from .timing import (
+    timings, OUTCOME_PLAYED, OUTCOME_ALREADY_COMPLETED, OUTCOME_NO_WAIT, OUTCOME_DEFAULT_WAIT, OUTCOME_NOT_VIDEO
+)
 
 console = Console()
 
@@ -15,30 +30,82 @@ console = Console()
 class VideoManager:
     """视频管理器"""
 
-    @staticmethod
-    def format_time(seconds: float) -> str:
-        """
-        将秒数格式化为友好的时分秒格式
-        :param seconds: 秒数
-        :return: 格式化后的字符串，如 "1:23:45" 或 "12:34"
-        """
-        seconds = int(seconds)
-        if seconds < 0:
-            return "0:00"
-        minutes, secs = divmod(seconds, 60)
-        hours, minutes = divmod(minutes, 60)
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{secs:02d}"
-        return f"{minutes}:{secs:02d}"
-
-    def __init__(self, page: Page, auth_manager):
+    # 播放期间超过该时间(秒)未收到任何播放事件时，主动查询一次视频状态
+    IDLE_CHECK_INTERVAL = 30
+    # 播放期间延长会话与检查Cookie有效性的间隔(秒)
+    SESSION_CHECK_INTERVAL = 60
+    # 视频页面关键元素出现的最长等待时间(秒)
+    VIDEO_PAGE_READY_TIMEOUT = 15
+    # 课程页面视频链接出现的最长等待时间(秒)
+    COURSE_PAGE_READY_TIMEOUT = 15
+
+    format_time = staticmethod(format_time)
+
+    def __init__(self, page: Page, auth_manager, selectors: Optional[PageSelectors] = None,
+                 journal: Optional[ProgressJournal] = None,
+                 media_profile: Optional[LowBitrateProfile] = None,
+                 report_footprint: bool = False,
+                 scheduler: Optional[MakespanScheduler] = None,
+                 clock: Optional[RealClock] = None,
+                 watchdog: Optional[TabMemoryWatchdog] = None):
         """
         初始化视频管理器
         :param page: Playwright页面对象
         :param auth_manager: 认证管理器实例
+        :param selectors: 页面选择器配置，默认使用 PageSelectors 的默认值
+        :param journal: 观看进度日志，用于断点续看（可选）
+        :param media_profile: 最低码率播放配置，启用后点击播放时切换到最低画质（可选）
+        :param report_footprint: 是否在每个视频结束后报告标签页的流量和CPU占用
+        :param scheduler: 多标签页播放时按剩余时长从长到短调度视频（可选）
+        :param clock: 计时与等待使用的时钟，默认使用真实时钟（模拟时注入虚拟时钟）
+        :param watchdog: 标签页内存看门狗，每个视频开始前检查并在需要时换用新页面（可选）
         """
         self.page = page
         self.auth_manager = auth_manager
+        self.selectors = selectors or PageSelectors()
+        self.clock = clock or RealClock()
+        self.monitor = PlaybackMonitor(page, self.clock)
+        self.journal = journal
+        self.media_profile = media_profile
+        self.footprint = TabFootprint(page) if report_footprint else None
+        self.scheduler = scheduler
+        self.watchdog = watchdog
+        # 并发模式下多个标签页同时播放，rich 同一时间只允许一个实时进度条
+        self.show_progress = True
+
+    def for_page(self, page: Page) -> 'VideoManager':
+        """
+        为同一上下文中的另一个页面创建视频管理器（沿用相同配置）
+        :param page: Playwright页面对象
+        :return: 新的视频管理器
+        """
+        return VideoManager(
+            page,
+            self.auth_manager.for_page(page),
+            self.selectors,
+            self.journal,
+            self.media_profile,
+            self.footprint is not None,
+            clock=self.clock,
+            watchdog=self.watchdog
+        )
+
+    def set_page(self, page: Page):
+        """
+        切换到新页面（如旧页面因内存占用过高被回收），播放监听和资源统计随之重建
+        :param page: Playwright页面对象
+        """
+        self.page = page
+        self.monitor.detach()
+        self.monitor = PlaybackMonitor(page, self.clock)
+        if self.footprint:
+            self.footprint = TabFootprint(page)
+        self.auth_manager.set_page(page)
+
+    def close(self):
+        """取消播放监听和保活通知（由 for_page 创建的视频管理器在关闭标签页前调用）"""
+        self.monitor.detach()
+        self.auth_manager.close()
 
     async def ensure_video_playing(self, video_selector: str = "video") -> dict:
         """
@@ -104,18 +171,35 @@ class VideoManager:
         :return: 视频链接列表
         """
         print(f"\n正在访问视频列表页面: {page_url}")
-        await self.page.goto(page_url, wait_until='networkidle')
+        await self.page.goto(page_url, wait_until='domcontentloaded')
 
-        # 等待页面加载完成
-        await asyncio.sleep(2)
+        # 等待视频链接出现
+        try:
+            await self.page.wait_for_selector(
+                f'a[href*="{url_pattern}"]',
+                state='attached',
+                timeout=self.COURSE_PAGE_READY_TIMEOUT * 1000
+            )
+        except PlaywrightTimeoutError:
+            pass
 
         # 获取所有链接
         links = await self.page.locator(f'a[href*="{url_pattern}"]').evaluate_all(
             'elements => elements.map(e => e.href)'
         )
-        # 去重并排序
-        links = sorted(list(set(links)))
+        # 去重并按资源ID的数值排序
+        links = sort_links(links)
+
+        self.print_link_summary(links, url_pattern)
+        return links
 
+    @staticmethod
+    def print_link_summary(links: List[str], url_pattern: str):
+        """
+        打印找到的链接数量及前5个示例
+        :param links: 视频链接列表
+        :param url_pattern: 视频链接的URL模式
+        """
         print(f"✓ 找到 {len(links)} 个匹配的视频链接")
 
         # 打印前5个链接作为示例
@@ -129,31 +213,168 @@ class VideoManager:
             print(f"\n⚠ 未找到匹配模式 '{url_pattern}' 的链接")
             print("💡 提示: 检查 URL_PATTERN 配置是否正确")
 
+    async def discover_video_links(self, course_urls: List[str], url_pattern: str,
+                                   cache_file: str = "link_cache.json",
+                                   cache_ttl: float = 3600) -> List[str]:
+        """
+        以纯HTTP方式并行获取多个课程页面的视频链接（带本地缓存），获取失败的课程改用浏览器渲染
+        :param course_urls: 课程页面URL列表
+        :param url_pattern: 视频链接的URL模式
+        :param cache_file: 链接缓存文件路径
+        :param cache_ttl: 缓存有效期(秒)
+        :return: 按课程、章节、资源ID排序的视频链接列表
+        """
+        print(f"\n正在获取 {len(course_urls)} 个课程页面的视频链接...")
+        discovery = LinkDiscovery(
+            self.page.context,
+            cache_file,
+            cache_ttl,
+            login_host=self.auth_manager.login_host,
+            guest_block_text=self.selectors.guest_block_text
+        )
+        links, failed = await discovery.discover(course_urls, url_pattern)
+
+        for course_url, reason in failed:
+            print(f"⚠ 无法直接获取课程页面 {course_url} ({reason})，改用浏览器加载")
+            for link in await self.get_video_links_by_pattern(course_url, url_pattern):
+                if link not in links:
+                    links.append(link)
+
+        self.print_link_summary(links, url_pattern)
         return links
 
-    async def get_video_duration(self, video_selector: str = "video") -> Optional[float]:
+    async def prescan_videos(self, video_links: List[str], concurrency: int = 8) -> List[str]:
         """
-        获取视频时长(秒)
-        :param video_selector: 视频元素的CSS选择器
-        :return: 视频时长(秒),如果获取失败返回None
+        以纯HTTP方式预扫描视频页面，筛除已完成的视频，仅保留需要打开标签页观看的链接
+        :param video_links: 视频链接列表
+        :param concurrency: 最大并发请求数
+        :return: 未完成的视频链接列表
+        """
+        print(f"\n🔎 正在预扫描 {len(video_links)} 个视频的完成状态 (并发 {concurrency})...")
+        results = await prescan_completion(
+            self.page.context,
+            video_links,
+            self.selectors,
+            concurrency,
+            self.auth_manager.login_host
+        )
+
+        pending = []
+        completed_count = 0
+        for link in video_links:
+            result = results[link]
+            if not result.session_valid:
+                self.auth_manager.update_validity(False)
+                print("⚠ 预扫描检测到Cookie已失效")
+                raise Exception("Cookie已失效，请重新获取Cookie")
+            if result.error:
+                # 预扫描失败的视频交给浏览器正常处理
+                print(f"⚠ 预扫描失败 {link}: {result.error}")
+                pending.append(link)
+            elif result.completed:
+                completed_count += 1
+                self.record_progress(link, True)
+            else:
+                try:
+                    watched = float((result.watched_text or '').strip())
+                    if watched > 0:
+                        self.record_progress(link, False, watched=watched)
+                except ValueError:
+                    pass
+                pending.append(link)
+
+        print(f"✓ 预扫描完成: {completed_count} 个已完成, {len(pending)} 个待观看")
+        return pending
+
+    async def probe_state(self, selectors: Optional[PageSelectors] = None,
+                          metadata_timeout: float = 0) -> PageState:
+        """
+        单次往返获取当前页面状态
+        页面已关闭时抛出与 check_browser_closed 相同的异常
+        :param selectors: 页面选择器配置，默认使用初始化时的配置
+        :param metadata_timeout: 视频元数据未加载时最多等待的时间(秒)
+        :return: 页面状态
         """
         try:
-            video = self.page.locator(video_selector)
-            await video.wait_for(timeout=10000)
+            return await probe_page_state(self.page, selectors or self.selectors, metadata_timeout)
+        except Exception:
+            if self.page.is_closed():
+                await self.check_browser_closed()
+            raise
 
-            # 获取视频时长
-            duration = await video.evaluate("el => el.duration || null")
+    def calculate_remaining(self, video_duration: float, watched_text: Optional[str]) -> float:
+        """
+        根据视频总时长和页面显示的已观看时长计算剩余需要等待的时间
+        :param video_duration: 视频总时长(秒)
+        :param watched_text: 已观看时长元素的文本，None表示未找到该元素
+        :return: 剩余时间(秒)，0表示无需等待
+        """
+        if watched_text is None:
+            print("⚠ 未找到已观看时长元素，使用视频总时长")
+            return video_duration
 
-            if duration:
-                print(f"✓ 视频时长: {self.format_time(duration)}")
-                return duration
-            else:
-                print("⚠ 无法获取视频时长,可能并非视频页，将在默认等待时间后跳转下一链接")
-                return None
+        # 尝试解析已观看时长（去除空格和可能的单位）
+        watched_text = watched_text.strip()
+        if not watched_text:
+            print("⚠ 已观看时长元素为空，使用视频总时长")
+            return video_duration
 
+        try:
+            watched_duration = float(watched_text)
+        except ValueError:
+            print(f"⚠ 无法解析已观看时长: '{watched_text}', 使用视频总时长")
+            return video_duration
+
+        # 计算剩余时间
+        remaining = video_duration - watched_duration
+
+        if remaining < 0:
+            print(f"⚠ 已观看时长({self.format_time(watched_duration)}) 大于总时长({self.format_time(video_duration)})，视频可能已完成")
+            return 0  # 视频已完成，无需等待
+        if remaining == 0:
+            print("✓ 视频已观看完毕")
+            return 0
+        print(f"✓ 总时长: {self.format_time(video_duration)}, 已观看: {self.format_time(watched_duration)}, 剩余: {self.format_time(remaining)}")
+        return remaining
+
+    def record_progress(self, video_url: str, completed: bool,
+                        duration: Optional[float] = None,
+                        watched: Optional[float] = None):
+        """
+        写入观看进度（未启用进度记录时不做任何事）
+        :param video_url: 视频页面URL
+        :param completed: 是否已完成
+        :param duration: 视频总时长(秒)
+        :param watched: 已观看时长(秒)
+        """
+        if self.journal:
+            self.journal.record(video_url, completed, duration, watched)
+
+    async def confirm_completion(self, video_url: str, selectors: PageSelectors,
+                                 video_duration: Optional[float]) -> bool:
+        """
+        播放结束后重新读取页面的完成状态：只有页面（服务器）标记为完成时才记录为已完成，
+        否则记录为部分进度，下次运行时排在最前并由预扫描向服务器重新确认
+        :param video_url: 视频页面URL
+        :param selectors: 页面选择器配置
+        :param video_duration: 视频总时长(秒)
+        :return: 页面是否已标记为完成
+        """
+        try:
+            with timings.phase("completion_probe", video_url):
+                completed = (await self.probe_state(selectors)).completed
         except Exception as e:
-            print(f"⚠ 获取视频时长失败: {e}")
-            return None
+            if "浏览器已被用户手动关闭" in str(e):
+                raise
+            print(f"⚠ 检查完成状态失败: {e}")
+            completed = False
+
+        if completed:
+            self.record_progress(video_url, True, video_duration, video_duration)
+        else:
+            print("⚠ 页面尚未显示完成状态，记为部分进度，下次运行时重新检查")
+            self.record_progress(video_url, False, video_duration, video_duration)
+        return completed
 
     async def play_video(self, video_url: str, video_selector: str = "video",
                         play_button_selector: Optional[str] = None,
@@ -167,86 +388,84 @@ class VideoManager:
         """
         print(f"\n{'='*60}")
         print(f"正在访问视频页面: {video_url}")
-        await self.page.goto(video_url, wait_until='networkidle')
-
-        # 等待页面加载
-        await asyncio.sleep(2)
+        timings.start_video(video_url)
+        # 只有显示进度条时才需要定期的播放进度，否则仅在长时间无事件时主动查询一次
+        await self.monitor.attach(self.IDLE_CHECK_INTERVAL if self.show_progress else 0)
+        selectors = replace(self.selectors, video=video_selector, play_button=play_button_selector)
+
+        # 等待页面关键元素出现，而不是等待网络空闲后再固定等待
+        clock = self.clock
+        navigation_started = clock.time()
+        with timings.phase("goto", video_url):
+            await self.page.goto(video_url, wait_until='domcontentloaded')
+        self.monitor.reset()
+        with timings.phase("page_ready", video_url):
+            ready = await wait_for_video_page_ready(self.page, selectors, self.VIDEO_PAGE_READY_TIMEOUT)
+        if ready:
+            print(f"✓ 页面就绪 ({clock.time() - navigation_started:.1f} 秒)")
+        else:
+            print(f"⚠ 等待页面就绪超时({self.VIDEO_PAGE_READY_TIMEOUT}秒)，继续检测页面状态")
 
-        # 检查浏览器是否已关闭
-        await self.check_browser_closed()
+        # 一次性获取页面状态（同时可检测浏览器是否已关闭）
+        with timings.phase("probe", video_url):
+            state = await self.probe_state(selectors)
 
-        # 尝试自动延长会话
-        await self.auth_manager.refresh_cookies()
+        with timings.phase("session_check", video_url):
+            # 尝试自动延长会话
+            await self.auth_manager.refresh_cookies()
 
-        # 检查Cookie是否有效
-        if not await self.auth_manager.check_cookie_validity():
+            # 检查Cookie是否有效（探测结果直接更新认证管理器的缓存判断）
+            self.auth_manager.update_validity(not state.guest_blocked)
+            session_valid = await self.auth_manager.check_cookie_validity()
+        if not session_valid:
             print("⚠ Cookie已失效，停止观看视频")
             raise Exception("Cookie已失效，请重新获取Cookie")
 
         # 检查视频是否已完成
-        tips_locator = self.page.locator(".tips-completion")
-        if await tips_locator.count() > 0:
-            # 获取文字内容
-            text = await tips_locator.text_content()
-            if text and "已完成" in text.strip():
-                print("✓ 该视频已标记为完成,跳过观看")
-                return
+        if state.completed:
+            print("✓ 该视频已标记为完成,跳过观看")
+            self.record_progress(video_url, True, state.video_duration)
+            timings.finish_video(video_url, OUTCOME_ALREADY_COMPLETED, state.video_duration, 0)
+            return
 
         # 如果需要点击播放按钮
         if play_button_selector:
             try:
-                await self.page.wait_for_selector(play_button_selector, timeout=5000)
-                await self.page.click(play_button_selector)
+                with timings.phase("click_play", video_url):
+                    if not state.has_play_button:
+                        await self.page.wait_for_selector(play_button_selector, timeout=5000)
+                    await self.page.click(play_button_selector)
                 print("✓ 已点击播放按钮")
             except:
                 print("⚠ 未找到播放按钮,可能并非视频页，即将自动跳转下一链接")
+                timings.finish_video(video_url, OUTCOME_NOT_VIDEO)
                 return
 
+        if self.media_profile and await self.media_profile.apply_player_quality(self.page):
+            print("✓ 已切换到最低画质")
+        if self.footprint:
+            await self.footprint.begin()
+
         # 智能计算视频剩余时间
         duration = None
 
         try:
-            # 获取视频总时长
-            video_duration = await self.get_video_duration(video_selector)
+            # 获取视频总时长（未加载元数据时在页面内等待，仍只需一次往返）
+            video_duration = state.video_duration
+            if video_duration is None:
+                with timings.phase("duration_probe", video_url):
+                    state = await self.probe_state(selectors, metadata_timeout=10)
+                video_duration = state.video_duration
 
             if video_duration is None:
-                print("⚠ 无法获取视频总时长")
+                print("⚠ 无法获取视频时长,可能并非视频页，将在默认等待时间后跳转下一链接")
             else:
-                # 尝试获取已观看时长
-                watched_locator = self.page.locator(".num-gksc > span")
-
-                if await watched_locator.count() > 0:
-                    watched_text = await watched_locator.text_content()
-
-                    if watched_text:
-                        # 尝试解析已观看时长（去除空格和可能的单位）
-                        watched_text = watched_text.strip()
-                        try:
-                            watched_duration = float(watched_text)
-
-                            # 计算剩余时间
-                            remaining = video_duration - watched_duration
-
-                            if remaining < 0:
-                                print(f"⚠ 已观看时长({self.format_time(watched_duration)}) 大于总时长({self.format_time(video_duration)})，视频可能已完成")
-                                duration = 0  # 视频已完成，无需等待
-                            elif remaining == 0:
-                                print("✓ 视频已观看完毕")
-                                duration = 0
-                            else:
-                                duration = remaining
-                                print(f"✓ 总时长: {self.format_time(video_duration)}, 已观看: {self.format_time(watched_duration)}, 剩余: {self.format_time(duration)}")
-                        except ValueError:
-                            print(f"⚠ 无法解析已观看时长: '{watched_text}', 使用视频总时长")
-                            duration = video_duration
-                    else:
-                        print("⚠ 已观看时长元素为空，使用视频总时长")
-                        duration = video_duration
-                else:
-                    print("⚠ 未找到已观看时长元素，使用视频总时长")
-                    duration = video_duration
+                print(f"✓ 视频时长: {self.format_time(video_duration)}")
+                duration = self.calculate_remaining(video_duration, state.watched_text)
 
         except Exception as e:
+            if "浏览器已被用户手动关闭" in str(e):
+                raise
             print(f"⚠ 计算剩余时间时出错: {e}")
             duration = None
 
@@ -257,7 +476,7 @@ class VideoManager:
             console.print(f"[cyan]⏳ 等待视频播放完成(预计 {self.format_time(duration)})...[/cyan]")
 
             # 使用 rich 进度条显示播放进度
-            with Progress(
+            with timings.phase("wait", video_url), Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(bar_width=40),
@@ -266,19 +485,30 @@ class VideoManager:
                 TimeElapsedColumn(),
                 console=console,
                 transient=True,
+                disable=not self.show_progress,
             ) as progress:
                 task = progress.add_task("播放中", total=100)
 
-                elapsed = 0
-                while elapsed < max_wait_time:
-                    await asyncio.sleep(5)  # 每5秒检查一次
-                    elapsed += 5
-
-                    # 检查浏览器是否已关闭
-                    await self.check_browser_closed()
-
-                    # 检查视频状态并恢复播放
-                    video_state = await self.ensure_video_playing(video_selector)
+                started_at = clock.time()
+                deadline = started_at + max_wait_time
+                last_session_check = started_at
+                finished = False
+                while (now := clock.time()) < deadline:
+                    # 等待页面推送播放事件；长时间无事件时才主动查询一次
+                    event = await self.monitor.next_event(min(self.IDLE_CHECK_INTERVAL, deadline - now))
+
+                    # 页面关闭或浏览器断开时立即退出
+                    if self.monitor.closed.is_set():
+                        await self.check_browser_closed()
+
+                    if event is None or event['type'] in ('pause', 'stalled'):
+                        if event and event['type'] == 'stalled':
+                            console.print("\n[yellow]⚠️ 视频缓冲停滞，正在检查播放状态...[/yellow]")
+                        # 检查视频状态并恢复播放
+                        with timings.phase("idle_check", video_url):
+                            video_state = await self.ensure_video_playing(video_selector)
+                    else:
+                        video_state = event
 
                     if video_state:
                         current_time = video_state.get('currentTime', 0)
@@ -288,6 +518,7 @@ class VideoManager:
                         # 视频已播放完毕
                         if ended or (video_duration > 0 and current_time >= video_duration - 1):
                             progress.update(task, completed=100, description="[green]播放完毕[/green]")
+                            finished = True
                             break
 
                         # 更新进度条
@@ -300,39 +531,84 @@ class VideoManager:
                             )
                     else:
                         # 无法获取视频状态时
-                        progress.update(task, description=f"[yellow]等待中 {self.format_time(elapsed)}[/yellow]")
+                        progress.update(task, description=f"[yellow]等待中 {self.format_time(clock.time() - started_at)}[/yellow]")
+
+                    # 会话维护不依赖播放事件，按固定间隔执行
+                    if clock.time() - last_session_check >= self.SESSION_CHECK_INTERVAL:
+                        last_session_check = clock.time()
+
+                        # 记录阶段性进度，进程意外退出后可优先续播
+                        watched = state.video_duration - duration + (last_session_check - started_at)
+                        self.record_progress(video_url, False, state.video_duration, min(watched, state.video_duration))
 
-                    # 尝试自动延长会话
-                    await self.auth_manager.refresh_cookies()
+                        with timings.phase("session_check", video_url):
+                            # 尝试自动延长会话
+                            await self.auth_manager.refresh_cookies()
 
-                    # 检查Cookie是否有效
-                    if not await self.auth_manager.check_cookie_validity():
-                        console.print("[red]⚠ Cookie已失效，停止观看视频[/red]")
-                        raise Exception("Cookie已失效，请重新获取Cookie")
+                            # 检查Cookie是否有效
+                            session_valid = await self.auth_manager.check_cookie_validity()
+                        if not session_valid:
+                            console.print("[red]⚠ Cookie已失效，停止观看视频[/red]")
+                            raise Exception("Cookie已失效，请重新获取Cookie")
 
-            console.print(f"[green]✓ 视频播放完毕[/green]")
+            if finished:
+                console.print(f"[green]✓ 视频播放完毕[/green]")
+            else:
+                console.print(f"[yellow]⚠ 等待超时({self.format_time(max_wait_time)})，未收到播放结束事件[/yellow]")
+            await self.confirm_completion(video_url, selectors, state.video_duration)
+            outcome = OUTCOME_PLAYED
         elif duration == 0:
-            # 视频已完成，无需等待
+            # 页面显示的已观看时长已达到总时长，但尚未标记为完成
             print("✓ 视频无需等待")
+            await self.confirm_completion(video_url, selectors, state.video_duration)
+            outcome = OUTCOME_NO_WAIT
         else:
             # 使用默认等待时间
             print("⚠ 无法获取视频时长，使用默认等待时间...")
             print(f"⏳ 等待 {self.format_time(default_wait_time)}...")
-            await asyncio.sleep(default_wait_time)
+            with timings.phase("default_wait", video_url):
+                await clock.sleep(default_wait_time)
+            outcome = OUTCOME_DEFAULT_WAIT
+
+        if self.footprint and (usage := await self.footprint.end()):
+            print(f"📊 标签页资源占用: 流量 {usage['bytes'] / 1024 / 1024:.1f} MB, CPU {usage['cpu_seconds']:.1f} 秒")
 
+        timings.finish_video(video_url, outcome, state.video_duration, duration)
         print("✓ 视频播放完成")
 
     async def watch_videos(self, video_links: List[str],
                           video_selector: str = "video",
                           play_button_selector: Optional[str] = None,
-                          default_wait_time: int = 60):
+                          default_wait_time: int = 60,
+                          concurrency: int = 1):
         """
         批量观看视频
         :param video_links: 视频链接列表
         :param video_selector: 视频元素的CSS选择器
         :param play_button_selector: 播放按钮的CSS选择器
         :param default_wait_time: 默认等待时间(秒)
+        :param concurrency: 同时播放的标签页数量，大于1时启用多标签页并发播放
         """
+        if self.journal:
+            planned = self.journal.plan(video_links)
+            skipped = len(video_links) - len(planned)
+            if skipped:
+                print(f"\n📒 根据进度记录跳过 {skipped} 个已完成的视频")
+            video_links = planned
+            if not video_links:
+                print("✓ 所有视频均已完成，无需观看")
+                return
+
+        if concurrency > 1 and len(video_links) > 1:
+            await self.watch_videos_concurrently(
+                video_links,
+                video_selector,
+                play_button_selector,
+                default_wait_time,
+                concurrency
+            )
+            return
+
         print(f"\n开始观看 {len(video_links)} 个视频")
 
         for i, link in enumerate(video_links, 1):
@@ -340,16 +616,182 @@ class VideoManager:
             await self.check_browser_closed()
 
             print(f"\n[{i}/{len(video_links)}] 当前视频:")
-            await self.play_video(
-                link,
-                video_selector,
-                play_button_selector,
-                default_wait_time
-            )
-
-            # 视频之间暂停2秒
-            if i < len(video_links):
-                await asyncio.sleep(2)
+            if self.watchdog:
+                await self.watchdog.check(self, "标签页 1")
+            try:
+                await self.play_video(
+                    link,
+                    video_selector,
+                    play_button_selector,
+                    default_wait_time
+                )
+            except Exception as e:
+                timings.fail_video(link, e)
+                raise
 
         print(f"\n{'='*60}")
         print(f"✓ 所有视频观看完成! 共完成 {len(video_links)} 个视频")
+
+    async def watch_videos_concurrently(self, video_links: List[str],
+                                        video_selector: str = "video",
+                                        play_button_selector: Optional[str] = None,
+                                        default_wait_time: int = 60,
+                                        concurrency: int = 2):
+        """
+        在同一浏览器上下文中打开多个标签页并发观看视频
+        每个标签页从共享队列中领取链接独立播放，单个视频失败不影响其他标签页
+        :param video_links: 视频链接列表
+        :param video_selector: 视频元素的CSS选择器
+        :param play_button_selector: 播放按钮的CSS选择器
+        :param default_wait_time: 默认等待时间(秒)
+        :param concurrency: 最大同时播放的标签页数量
+        """
+        if self.scheduler:
+            video_links = await self.scheduler.probe_remaining(self, video_links)
+            if not video_links:
+                print("✓ 所有视频均已完成，无需观看")
+                return
+            video_links = self.scheduler.plan(video_links)
+
+        tab_count = min(concurrency, len(video_links))
+        print(f"\n开始观看 {len(video_links)} 个视频 (并发标签页: {tab_count})")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i, link in enumerate(video_links, 1):
+            queue.put_nowait((i, link))
+        # 每个标签页一个结束标记
+        for _ in range(tab_count):
+            queue.put_nowait(None)
+
+        stop_event = asyncio.Event()
+        completed, failures = await self.run_playback_workers(
+            queue,
+            tab_count,
+            video_selector,
+            play_button_selector,
+            default_wait_time,
+            total=len(video_links),
+            stop_event=stop_event
+        )
+        self.print_playback_summary(completed, failures, stop_event)
+
+    async def run_playback_workers(self, queue: asyncio.Queue, tab_count: int,
+                                   video_selector: str = "video",
+                                   play_button_selector: Optional[str] = None,
+                                   default_wait_time: int = 60,
+                                   total: Optional[int] = None,
+                                   stop_event: Optional[asyncio.Event] = None,
+                                   tab_budget: Optional[asyncio.Semaphore] = None) -> Tuple[List[str], List[tuple]]:
+        """
+        启动多个标签页从队列中领取视频并播放，直到每个标签页都取到结束标记 None
+        :param queue: 视频队列，元素为 (序号, 视频链接) 或结束标记 None
+        :param tab_count: 标签页数量
+        :param video_selector: 视频元素的CSS选择器
+        :param play_button_selector: 播放按钮的CSS选择器
+        :param default_wait_time: 默认等待时间(秒)
+        :param total: 视频总数（未知时为 None，仅用于显示）
+        :param stop_event: 发生致命错误时置位，所有标签页停止领取新视频
+        :param tab_budget: 多个上下文共享的标签页名额，每个视频播放期间占用一个，额外的标签页只在占用名额时打开（可选）
+        :return: (成功的视频链接列表, [(失败的视频链接, 原因), ...])
+        """
+        context = self.page.context
+        stop_event = stop_event or asyncio.Event()
+        completed: List[str] = []
+        failures: List[tuple] = []
+
+        async def open_manager() -> 'VideoManager':
+            manager = self.for_page(await context.new_page())
+            manager.show_progress = False
+            return manager
+
+        async def close_manager(manager: 'VideoManager'):
+            if manager is self:
+                return
+            manager.close()
+            if self.watchdog:
+                await self.watchdog.release(manager.page)
+            if not manager.page.is_closed():
+                try:
+                    await manager.page.close()
+                except Exception:
+                    pass
+
+        async def worker(tab_index: int):
+            # 第一个标签页复用当前页面，其余标签页在同一上下文中新建（共享登录状态）
+            # 有共享播放名额时，新标签页在取得名额后才打开、归还名额前关闭，
+            # 因此多个上下文同时打开的额外标签页总数也不超过名额
+            if tab_index == 1:
+                manager = self
+                manager.show_progress = False
+            else:
+                manager = await open_manager() if tab_budget is None else None
+
+            try:
+                while not stop_event.is_set():
+                    item = await queue.get()
+                    if item is None or stop_event.is_set():
+                        return
+                    i, link = item
+
+                    print(f"\n[标签页 {tab_index}] [{i}/{total or '?'}] 开始播放: {link}")
+                    if self.scheduler:
+                        self.scheduler.start(link)
+                    page_lost = False
+                    try:
+                        async with tab_budget or nullcontext():
+                            # 刚打开的页面还没有积累内存，无需检查
+                            fresh = manager is None
+                            if fresh:
+                                manager = await open_manager()
+                            try:
+                                if self.watchdog and not fresh:
+                                    await self.watchdog.check(manager, f"标签页 {tab_index}")
+                                await manager.play_video(
+                                    link,
+                                    video_selector,
+                                    play_button_selector,
+                                    default_wait_time
+                                )
+                            finally:
+                                page_lost = manager.page.is_closed()
+                                if tab_budget is not None and manager is not self:
+                                    await close_manager(manager)
+                                    manager = None
+                        completed.append(link)
+                        print(f"[标签页 {tab_index}] ✓ 第 {i} 个视频完成")
+                    except Exception as e:
+                        failures.append((link, str(e)))
+                        timings.fail_video(link, e)
+                        print(f"[标签页 {tab_index}] ❌ 第 {i} 个视频失败: {e}")
+                        # 浏览器关闭或Cookie失效时其他标签页也无法继续，通知所有标签页停止
+                        if "浏览器已被用户手动关闭" in str(e) or "Cookie已失效" in str(e) or page_lost:
+                            stop_event.set()
+                            return
+                    finally:
+                        if self.scheduler:
+                            self.scheduler.finish(link)
+                    if self.scheduler and not stop_event.is_set():
+                        self.scheduler.print_projection()
+            finally:
+                if manager is not None:
+                    await close_manager(manager)
+
+        await asyncio.gather(*(worker(k) for k in range(1, tab_count + 1)))
+        return completed, failures
+
+    @staticmethod
+    def print_playback_summary(completed: List[str], failures: List[tuple],
+                               stop_event: Optional[asyncio.Event] = None):
+        """
+        打印并发播放的结果汇总，播放被中止时抛出最后一个失败原因
+        :param completed: 成功的视频链接列表
+        :param failures: [(失败的视频链接, 原因), ...]
+        :param stop_event: 播放中止标记
+        """
+        print(f"\n{'='*60}")
+        print(f"✓ 观看结束! 成功 {len(completed)} 个, 失败 {len(failures)} 个, "
+              f"共 {len(completed) + len(failures)} 个视频")
+        for link, reason in failures:
+            print(f"  ❌ {link}: {reason}")
+        if stop_event and stop_event.is_set():
+            raise Exception(failures[-1][1] if failures else "播放已中止")
@@ -0,0 +1,122 @@
+"""
+标签页内存看门狗模块
+长时间运行时同一标签页会导航数百次，播放器和页面脚本的内存泄漏使渲染进程的JS堆和DOM节点持续增长。
+每个视频开始前通过 CDP 会话读取页面的JS堆和DOM节点数量，超过阈值时关闭该页面并换用新页面，
+视频管理器和认证管理器随之切换到新页面继续工作（仅 Chromium 内核浏览器可用）
+"""
+
+from typing import Dict, Optional
+from playwright.async_api import CDPSession, Page
+from .timing import timings
+
+
+class TabMemoryWatchdog:
+    """标签页内存看门狗，可由多个标签页的视频管理器共用"""
+
+    def __init__(self, heap_limit_mb: float = 512, node_limit: int = 150000):
+        """
+        初始化看门狗
+        :param heap_limit_mb: 页面JS堆已用内存上限(MB)，0 表示不限制
+        :param node_limit: 页面DOM节点数量上限，0 表示不限制
+        """
+        self.heap_limit = heap_limit_mb * 1024 * 1024
+        self.node_limit = node_limit
+        self.recycled = 0
+        # {标签页名称: {heap, nodes, listeners}}，记录各标签页（含回收前的页面）的峰值
+        self.peaks: Dict[str, dict] = {}
+        self._sessions: Dict[Page, Optional[CDPSession]] = {}
+
+    async def sample(self, page: Page) -> dict:
+        """
+        读取页面的性能指标（JSHeapUsedSize、Nodes、JSEventListeners 等）
+        :param page: Playwright页面对象
+        :return: {指标名: 数值}，非 Chromium 浏览器或读取失败时返回空字典
+        """
+        if page not in self._sessions:
+            try:
+                session = await page.context.new_cdp_session(page)
+                await session.send("Performance.enable")
+            except Exception:
+                session = None
+            self._sessions[page] = session
+        session = self._sessions[page]
+        if session is None:
+            return {}
+        try:
+            result = await session.send("Performance.getMetrics")
+        except Exception:
+            return {}
+        return {metric['name']: metric['value'] for metric in result.get('metrics', [])}
+
+    async def release(self, page: Page):
+        """
+        断开并移除页面的 CDP 会话（页面关闭前调用）
+        :param page: Playwright页面对象
+        """
+        session = self._sessions.pop(page, None)
+        if session is None:
+            return
+        try:
+            await session.detach()
+        except Exception:
+            pass
+
+    def _record_peak(self, label: str, heap: float, nodes: int, listeners: int):
+        peak = self.peaks.setdefault(label, {'heap': 0, 'nodes': 0, 'listeners': 0})
+        peak['heap'] = max(peak['heap'], heap)
+        peak['nodes'] = max(peak['nodes'], nodes)
+        peak['listeners'] = max(peak['listeners'], listeners)
+
+    async def check(self, video_manager, label: str) -> bool:
+        """
+        检查视频管理器当前页面的内存占用，超过阈值时换用新页面（应在两个视频之间调用，刚打开的页面无需检查）
+        :param video_manager: 视频管理器
+        :param label: 标签页名称（如 "标签页 2"），同一标签页换用新页面后沿用同一名称
+        :return: 是否回收了页面
+        """
+        page = video_manager.page
+        if page.is_closed():
+            return False
+        with timings.phase("memory_check"):
+            metrics = await self.sample(page)
+        if not metrics:
+            return False
+
+        heap = metrics.get('JSHeapUsedSize', 0)
+        nodes = int(metrics.get('Nodes', 0))
+        self._record_peak(label, heap, nodes, int(metrics.get('JSEventListeners', 0)))
+
+        over_heap = self.heap_limit and heap > self.heap_limit
+        over_nodes = self.node_limit and nodes > self.node_limit
+        if not (over_heap or over_nodes):
+            return False
+
+        print(f"\n♻️ [{label}] 页面内存超过阈值 (JS堆 {heap / 1024 / 1024:.0f} MB, DOM节点 {nodes})，正在换用新页面...")
+        with timings.phase("tab_recycle"):
+            await self.recycle(video_manager)
+        return True
+
+    async def recycle(self, video_manager):
+        """
+        打开新页面替换视频管理器当前的页面，并关闭旧页面释放其渲染进程内存
+        :param video_manager: 视频管理器
+        """
+        old_page = video_manager.page
+        # 先打开新页面再关闭旧页面，避免上下文中短暂没有任何页面
+        new_page = await old_page.context.new_page()
+        video_manager.set_page(new_page)
+        await self.release(old_page)
+        try:
+            await old_page.close()
+        except Exception:
+            pass
+        self.recycled += 1
+
+    def print_report(self):
+        """打印各标签页的内存峰值"""
+        if not self.peaks:
+            return
+        print(f"\n🧠 标签页内存峰值 (已换用新页面 {self.recycled} 次):")
+        for label, peak in self.peaks.items():
+            print(f"   {label}: JS堆 {peak['heap'] / 1024 / 1024:.1f} MB, DOM节点 {peak['nodes']}, "
+                  f"事件监听器 {peak['listeners']}")
@@ -0,0 +1,4 @@
+"""
+性能基准测试脚本
+在仓库根目录下以模块方式运行，例如: uv run python -m benchmarks.navigation
+"""
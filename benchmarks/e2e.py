@@ -0,0 +1,208 @@
+"""
+端到端基准测试
+在本地模拟 Moodle 服务上运行完整流程，统计启动耗时、链接发现耗时，
+以及不同并发标签页数量下的每视频额外开销和吞吐量，结果可保存为JSON与其他版本对比
+用法: uv run python -m benchmarks.e2e [--videos 8] [--duration 5] [--concurrency 1,2,4]
+                                      [--output result.json] [--baseline old.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlparse
+from automation import AuthManager, BrowserManager, PageSelectors, SessionKeepAlive, SessionSnapshot, VideoManager
+from .fake_moodle import FakeMoodle, URL_PATTERN
+
+PLAY_BUTTON_SELECTOR = ".vjs-big-play-button"
+
+
+def git_revision() -> str:
+    """当前代码版本，写入结果便于对比"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool):
+    """屏蔽被测流程自身的输出，只保留基准测试结果"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+async def run(args: argparse.Namespace) -> dict:
+    courses = max(args.courses, 1)
+    fake = FakeMoodle(
+        courses=courses,
+        videos_per_course=math.ceil(args.videos / courses),
+        video_seconds=args.duration,
+        session_warning_after=args.duration / 2 if args.session_warning else None
+    )
+    fake.start()
+    workdir = Path(tempfile.mkdtemp(prefix="fly-bench-"))
+    cookie_file = str(workdir / "cookies.json")
+    fake.write_cookie_file(cookie_file)
+
+    result = {
+        'revision': git_revision(),
+        'timestamp': time.time(),
+        'platform': platform.platform(),
+        'browser': args.browser,
+        'videos': args.videos,
+        'video_seconds': args.duration,
+    }
+    browser_manager = None
+    keepalive = None
+    try:
+        session = SessionSnapshot.load(cookie_file)
+        browser_manager = BrowserManager(browser_type=args.browser, headless=not args.headed,
+                                         session=session, launch_profile=args.profile)
+        started_at = time.perf_counter()
+        with quiet(not args.verbose):
+            await browser_manager.setup()
+        result['browser_startup'] = time.perf_counter() - started_at
+
+        page = browser_manager.get_page()
+        context = browser_manager.get_context()
+        auth_manager = AuthManager(page, context, login_host=fake.sso_host, session=session)
+        started_at = time.perf_counter()
+        with quiet(not args.verbose):
+            logged_in = await auth_manager.login_with_cookies(fake.home_url, cookie_file, preloaded=True)
+        result['login'] = time.perf_counter() - started_at
+        if not logged_in:
+            raise Exception("登录模拟服务失败")
+
+        # 会话由保活任务续期并写入临时Cookie文件，不影响仓库中的 cookies.json
+        keepalive = SessionKeepAlive(context, session, cookie_file, interval=args.duration * 10,
+                                     session_host=urlparse(fake.base_url).hostname)
+        await keepalive.start()
+        auth_manager.use_keepalive(keepalive)
+
+        video_manager = VideoManager(page, auth_manager, PageSelectors(play_button=PLAY_BUTTON_SELECTOR))
+        video_manager.show_progress = False
+
+        started_at = time.perf_counter()
+        with quiet(not args.verbose):
+            links = await video_manager.get_video_links_by_pattern(fake.course_urls[0], URL_PATTERN)
+        result['discovery_browser'] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        with quiet(not args.verbose):
+            links = await video_manager.discover_video_links(
+                fake.course_urls, URL_PATTERN, str(workdir / "link_cache.json"), cache_ttl=0
+            )
+        result['discovery_http'] = time.perf_counter() - started_at
+        links = links[:args.videos]
+
+        result['runs'] = []
+        for concurrency in args.concurrency:
+            fake.reset()
+            started_at = time.perf_counter()
+            with quiet(not args.verbose):
+                await video_manager.watch_videos(
+                    links,
+                    "video",
+                    PLAY_BUTTON_SELECTOR,
+                    default_wait_time=args.duration,
+                    concurrency=concurrency
+                )
+            wall = time.perf_counter() - started_at
+            # 理想情况下每个标签页依次播放 rounds 个视频，没有任何额外开销
+            rounds = math.ceil(len(links) / min(concurrency, len(links)))
+            ideal = rounds * args.duration
+            result['runs'].append({
+                'concurrency': concurrency,
+                'wall': wall,
+                'ideal': ideal,
+                'overhead_per_video': (wall - ideal) / rounds,
+                'videos_per_minute': len(links) / wall * 60,
+                'completed': len(fake.completed),
+                'requests': dict(fake.request_counts),
+            })
+    finally:
+        if keepalive:
+            await keepalive.stop()
+        if browser_manager:
+            with quiet(not args.verbose):
+                await browser_manager.close()
+            if browser_manager.playwright:
+                await browser_manager.playwright.stop()
+        fake.stop()
+    return result
+
+
+def print_result(result: dict, baseline: dict = None):
+    """打印结果，提供基准结果时同时显示变化"""
+
+    def delta(value: float, old) -> str:
+        if old is None or not old:
+            return ""
+        return f"  ({(value - old) / old * 100:+.1f}% vs {baseline['revision']})"
+
+    baseline = baseline or {}
+    print(f"\n📊 端到端基准测试 (版本 {result['revision']}, {result['videos']} 个视频 × {result['video_seconds']} 秒)")
+    for key, label in (('browser_startup', '浏览器启动'), ('login', 'Cookie登录'),
+                       ('discovery_browser', '链接发现(浏览器)'), ('discovery_http', '链接发现(HTTP)')):
+        print(f"  {label:<16} {result[key]:.2f} 秒{delta(result[key], baseline.get(key))}")
+
+    old_runs = {run['concurrency']: run for run in baseline.get('runs', [])}
+    print(f"\n  {'并发':>4} {'总耗时':>8} {'理想':>8} {'每视频开销':>10} {'视频/分钟':>10} {'完成':>6}")
+    for run in result['runs']:
+        old = old_runs.get(run['concurrency'], {})
+        print(f"  {run['concurrency']:>4} {run['wall']:>7.1f}s {run['ideal']:>7.1f}s "
+              f"{run['overhead_per_video']:>9.2f}s {run['videos_per_minute']:>10.1f} "
+              f"{run['completed']:>3}/{result['videos']}"
+              f"{delta(run['overhead_per_video'], old.get('overhead_per_video'))}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    解析命令行参数
+    :param argv: 参数列表，默认读取 sys.argv
+    """
+    parser = argparse.ArgumentParser(description="在本地模拟服务上运行端到端基准测试")
+    parser.add_argument("--videos", type=int, default=8, help="视频数量 (默认8)")
+    parser.add_argument("--courses", type=int, default=2, help="课程数量 (默认2)")
+    parser.add_argument("--duration", type=float, default=5, help="每个视频的时长(秒) (默认5)")
+    parser.add_argument("--concurrency", default="1,2,4",
+                        type=lambda value: [int(v) for v in value.split(",") if v.strip()],
+                        help="依次测试的并发标签页数量，逗号分隔 (默认1,2,4)")
+    parser.add_argument("--browser", default=os.getenv("BROWSER", "msedge"), help="浏览器类型 (默认读取 BROWSER 环境变量)")
+    parser.add_argument("--profile", default="default", help="浏览器启动配置 (default/bulk)")
+    parser.add_argument("--headed", action="store_true", help="显示浏览器窗口")
+    parser.add_argument("--session-warning", action="store_true", help="视频播放到一半时出现\"延长会话\"按钮")
+    parser.add_argument("--output", help="将结果保存为JSON文件")
+    parser.add_argument("--baseline", help="与之前保存的JSON结果对比")
+    parser.add_argument("--verbose", action="store_true", help="显示被测流程的完整输出")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = asyncio.run(run(args))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_result(result, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"\n✓ 结果已保存到 {args.output}")
@@ -0,0 +1,351 @@
+"""
+本地模拟 Moodle/SSO 服务
+提供与砺儒云结构一致的课程页、视频页（短音频作为视频源）、SSO重定向和"延长会话"按钮，
+供基准测试离线运行，不访问真实站点
+用法: uv run python -m benchmarks.fake_moodle [--port 8765] [--videos 6] [--duration 5]
+"""
+
+import argparse
+import html
+import io
+import json
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse, parse_qs
+
+SESSION_COOKIE = "MoodleSession"
+URL_PATTERN = "fsresource/view.php?id="
+
+_COURSE_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>课程 {course}</title></head>
+<body><div id="region-main">
+<h2>模拟课程 {course}</h2>
+<ul class="topics">{sections}</ul>
+</div></body></html>
+"""
+
+_VIDEO_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>视频 {rid}</title>
+<script>var M = {{cfg: {{wwwroot: {wwwroot}, sesskey: {sesskey}}}}};</script>
+</head>
+<body><div id="region-main">
+<h2>视频 {rid}</h2>
+<div class="tips-completion">{completion}</div>
+<div class="num-gksc">已观看 <span>{watched}</span> 秒</div>
+<video id="player" src="/media/{rid}.wav" preload="metadata"></video>
+<button class="vjs-big-play-button" onclick="document.getElementById('player').play()">播放</button>
+</div>
+<script>
+document.getElementById('player').addEventListener('ended', () => {{
+    fetch('/mod/fsresource/track.php?id={rid}', {{ method: 'POST' }});
+}});
+const warningAfter = {warning_after};
+if (warningAfter >= 0) {{
+    setTimeout(() => {{
+        const button = document.createElement('button');
+        button.textContent = '延长会话';
+        button.onclick = () => {{
+            fetch('/lib/ajax/service.php?sesskey=' + M.cfg.sesskey + '&info=core_session_touch', {{ method: 'POST' }});
+            button.remove();
+        }};
+        document.body.appendChild(button);
+    }}, warningAfter * 1000);
+}}
+</script>
+</body></html>
+"""
+
+_HOME_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>控制面板</title></head>
+<body><div id="region-main"><h2>我的课程</h2>{links}</div></body></html>
+"""
+
+_LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>统一身份认证</title></head>
+<body><a id="login" href="{target}">登录</a></body></html>
+"""
+
+
+def silent_wav(seconds: float, sample_rate: int = 8000) -> bytes:
+    """
+    生成指定时长的静音WAV（8位单声道，每秒约8KB）
+    :param seconds: 时长(秒)
+    :param sample_rate: 采样率
+    :return: WAV文件内容
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(1)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b'\x80' * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+class FakeMoodle:
+    """模拟的 Moodle + SSO 服务"""
+
+    def __init__(self, courses: int = 1, videos_per_course: int = 6, video_seconds: float = 5,
+                 sections: int = 2, port: int = 0, session_warning_after: Optional[float] = None):
+        """
+        初始化模拟服务
+        :param courses: 课程数量
+        :param videos_per_course: 每个课程的视频数量
+        :param video_seconds: 每个视频的时长(秒)
+        :param sections: 每个课程的章节数量（视频平均分布在各章节中）
+        :param port: 监听端口，0表示自动分配
+        :param session_warning_after: 视频页打开多少秒后出现"延长会话"按钮，None表示不出现
+        """
+        self.courses = courses
+        self.videos_per_course = videos_per_course
+        self.video_seconds = video_seconds
+        self.sections = max(sections, 1)
+        self.session_warning_after = session_warning_after
+        self.session_token = "fake-moodle-session"
+        self.sesskey = "fakesesskey"
+        self.completed: Set[str] = set()
+        self.watched: Dict[str, float] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.session_touches = 0
+        self._lock = threading.Lock()
+        self._media = silent_wav(video_seconds)
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), _Handler)
+        self._server.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        """Moodle 站点地址"""
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def sso_host(self) -> str:
+        """SSO 主机（与 Moodle 使用不同的主机名，便于按主机识别登录页重定向）"""
+        return f"localhost:{self.port}"
+
+    @property
+    def home_url(self) -> str:
+        return f"{self.base_url}/my/"
+
+    @property
+    def login_url(self) -> str:
+        return f"http://{self.sso_host}/AccountService/user/login.html"
+
+    @property
+    def course_urls(self) -> List[str]:
+        return [f"{self.base_url}/course/view.php?id={course}" for course in range(1, self.courses + 1)]
+
+    def video_ids(self, course: int) -> List[str]:
+        """课程中的视频资源ID"""
+        return [str(course * 1000 + k) for k in range(1, self.videos_per_course + 1)]
+
+    def start(self):
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """在当前线程中运行服务，直到被中断"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        """停止后台线程中运行的服务"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self, completed: Optional[Set[str]] = None):
+        """
+        重置观看状态和请求计数
+        :param completed: 重置后标记为已完成的资源ID
+        """
+        with self._lock:
+            self.completed = set(completed or ())
+            self.watched.clear()
+            self.request_counts.clear()
+            self.session_touches = 0
+
+    def cookies(self) -> list:
+        """可直接写入 cookies.json 的有效会话Cookie"""
+        return [{
+            'name': SESSION_COOKIE,
+            'value': self.session_token,
+            'domain': '127.0.0.1',
+            'path': '/',
+            'expires': time.time() + 24 * 3600,
+            'httpOnly': True,
+            'secure': False,
+            'sameSite': 'Lax',
+        }]
+
+    def write_cookie_file(self, path: str):
+        """
+        写入包含有效会话的Cookie文件
+        :param path: Cookie文件路径
+        """
+        Path(path).write_text(json.dumps(self.cookies(), indent=2), encoding='utf-8')
+
+    def count(self, kind: str):
+        with self._lock:
+            self.request_counts[kind] = self.request_counts.get(kind, 0) + 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """请求处理：按路径分发到各模拟页面"""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def fake(self) -> FakeMoodle:
+        return self.server.fake
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self._dispatch()
+
+    def _dispatch(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        host = self.headers.get('Host', '')
+
+        if host == self.fake.sso_host:
+            self.fake.count('sso')
+            target = html.escape(f"{self.fake.base_url}/login/index.php?token={self.fake.session_token}")
+            return self._send(200, _LOGIN_PAGE.format(target=target))
+        if url.path == '/login/index.php':
+            self.fake.count('login')
+            return self._send(303, headers={
+                'Location': '/my/',
+                'Set-Cookie': f"{SESSION_COOKIE}={query.get('token', [''])[0]}; Path=/; HttpOnly",
+            })
+        if not self._authenticated():
+            self.fake.count('redirect')
+            return self._send(303, headers={'Location': self.fake.login_url})
+
+        if url.path == '/my/':
+            self.fake.count('home')
+            links = ''.join(f'<p><a href="{course_url}">课程 {k}</a></p>'
+                            for k, course_url in enumerate(self.fake.course_urls, 1))
+            return self._send(200, _HOME_PAGE.format(links=links))
+        if url.path == '/course/view.php':
+            self.fake.count('course')
+            return self._course_page(int(query.get('id', ['1'])[0]))
+        if url.path == '/mod/fsresource/view.php':
+            self.fake.count('video')
+            return self._video_page(query.get('id', [''])[0])
+        if url.path == '/mod/fsresource/track.php':
+            self.fake.count('track')
+            with self.fake._lock:
+                rid = query.get('id', [''])[0]
+                self.fake.completed.add(rid)
+                self.fake.watched[rid] = self.fake.video_seconds
+            return self._send(200, '{"status": true}', 'application/json')
+        if url.path == '/lib/ajax/service.php':
+            self.fake.count('session_touch')
+            with self.fake._lock:
+                self.fake.session_touches += 1
+            return self._send(200, '[{"error": false, "data": true}]', 'application/json')
+        if url.path.startswith('/media/'):
+            self.fake.count('media')
+            return self._media()
+        self._send(404, 'Not Found')
+
+    def _authenticated(self) -> bool:
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        return SESSION_COOKIE in cookie and cookie[SESSION_COOKIE].value == self.fake.session_token
+
+    def _course_page(self, course: int):
+        video_ids = self.fake.video_ids(course)
+        per_section = -(-len(video_ids) // self.fake.sections)
+        sections = []
+        for section in range(self.fake.sections):
+            items = ''.join(
+                f'<li class="activity"><a href="/mod/fsresource/view.php?id={rid}">视频 {rid}</a></li>'
+                for rid in video_ids[section * per_section:(section + 1) * per_section]
+            )
+            sections.append(f'<li id="section-{section}" class="section"><ul>{items}</ul></li>')
+        self._send(200, _COURSE_PAGE.format(course=course, sections=''.join(sections)))
+
+    def _video_page(self, rid: str):
+        with self.fake._lock:
+            completed = rid in self.fake.completed
+            watched = self.fake.watched.get(rid, 0)
+        warning_after = self.fake.session_warning_after
+        self._send(200, _VIDEO_PAGE.format(
+            rid=html.escape(rid),
+            wwwroot=json.dumps(self.fake.base_url),
+            sesskey=json.dumps(self.fake.sesskey),
+            completion="已完成" if completed else "未完成",
+            watched=int(watched),
+            warning_after=-1 if warning_after is None else warning_after,
+        ))
+
+    def _media(self):
+        data = self.fake._media
+        start, end = 0, len(data) - 1
+        status = 200
+        range_header = self.headers.get('Range', '')
+        if range_header.startswith('bytes='):
+            first, _, last = range_header[6:].partition('-')
+            start = int(first) if first else 0
+            end = min(int(last), end) if last else end
+            status = 206
+        headers = {'Accept-Ranges': 'bytes'}
+        if status == 206:
+            headers['Content-Range'] = f"bytes {start}-{end}/{len(data)}"
+        self._send(status, data[start:end + 1], 'audio/wav', headers)
+
+    def _send(self, status: int, body=b'', content_type: str = 'text/html; charset=utf-8',
+              headers: Optional[dict] = None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="启动本地模拟 Moodle/SSO 服务")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口 (默认8765)")
+    parser.add_argument("--courses", type=int, default=1, help="课程数量 (默认1)")
+    parser.add_argument("--videos", type=int, default=6, help="每个课程的视频数量 (默认6)")
+    parser.add_argument("--duration", type=float, default=5, help="每个视频的时长(秒) (默认5)")
+    parser.add_argument("--cookie-file", help="写入有效会话Cookie的文件路径 (可选)")
+    args = parser.parse_args()
+
+    fake = FakeMoodle(args.courses, args.videos, args.duration, port=args.port)
+    if args.cookie_file:
+        fake.write_cookie_file(args.cookie_file)
+        print(f"✓ 已写入Cookie文件: {args.cookie_file}")
+    print(f"✓ 模拟服务已启动: {fake.home_url}")
+    print(f"  课程页面: {', '.join(fake.course_urls)}")
+    print(f"  SSO登录页: {fake.login_url}")
+    print("💡 按下 Ctrl+C 停止")
+    try:
+        fake.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✓ 模拟服务已停止")
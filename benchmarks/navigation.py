@@ -0,0 +1,78 @@
+"""
+导航等待策略基准测试
+对比旧策略(networkidle + 固定等待2秒)与就绪条件等待在视频页面上的耗时
+用法: uv run python -m benchmarks.navigation [视频数量，默认10]
+"""
+
+import asyncio
+import statistics
+import sys
+from time import perf_counter
+from urllib.parse import urlparse
+from automation import BrowserManager, AuthManager, VideoManager, PageSelectors
+from automation.probe import wait_for_video_page_ready
+import config
+
+
+async def navigate_networkidle(page, url: str, selectors: PageSelectors):
+    """旧策略：等待网络空闲后再固定等待2秒"""
+    await page.goto(url, wait_until='networkidle')
+    await asyncio.sleep(2)
+
+
+async def navigate_ready(page, url: str, selectors: PageSelectors):
+    """新策略：DOM解析完成后等待关键元素出现"""
+    await page.goto(url, wait_until='domcontentloaded')
+    await wait_for_video_page_ready(page, selectors, VideoManager.VIDEO_PAGE_READY_TIMEOUT)
+
+
+STRATEGIES = {
+    'networkidle + sleep(2)': navigate_networkidle,
+    'readiness': navigate_ready,
+}
+
+
+async def main(count: int):
+    browser_manager = BrowserManager(browser_type=config.BROWSER, headless=True)
+    await browser_manager.setup()
+    try:
+        page = browser_manager.get_page()
+        auth_manager = AuthManager(page, browser_manager.get_context(),
+                                   login_host=urlparse(config.LOGIN_URL).netloc)
+        if not await auth_manager.login_with_cookies(config.BASE_URL, config.COOKIE_FILE):
+            print("❌ 登录失败，无法进行基准测试")
+            return
+
+        selectors = PageSelectors(
+            video=config.VIDEO_ELEMENT_SELECTOR,
+            play_button=config.PLAY_BUTTON_SELECTOR,
+            completion=config.COMPLETION_SELECTOR,
+            watched_time=config.WATCHED_TIME_SELECTOR,
+            guest_block_text=config.GUEST_BLOCK_TEXT
+        )
+        video_manager = VideoManager(page, auth_manager, selectors)
+        links = (await video_manager.get_video_links_by_pattern(config.VIDEO_LIST_URLS[0], config.URL_PATTERN))[:count]
+        if not links:
+            return
+
+        timings = {name: [] for name in STRATEGIES}
+        for i, link in enumerate(links):
+            # 交替执行顺序，避免缓存只偏向其中一种策略
+            names = list(STRATEGIES) if i % 2 == 0 else list(reversed(STRATEGIES))
+            for name in names:
+                start = perf_counter()
+                await STRATEGIES[name](page, link, selectors)
+                timings[name].append(perf_counter() - start)
+
+        print(f"\n📊 导航耗时对比 ({len(links)} 个视频页面)")
+        for name, values in timings.items():
+            print(f"  {name:<24} 平均 {statistics.mean(values):.2f} 秒, 中位数 {statistics.median(values):.2f} 秒")
+        saved = statistics.mean(timings['networkidle + sleep(2)']) - statistics.mean(timings['readiness'])
+        # 旧流程每个视频之间还有2秒固定间隔
+        print(f"  每个视频节省约 {saved + 2:.2f} 秒 (含视频间隔2秒)")
+    finally:
+        await browser_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
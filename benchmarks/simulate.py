@@ -0,0 +1,124 @@
+"""
+调度模拟
+在虚拟时钟上运行真实的多标签页调度与视频播放流程，几秒到十几秒内估算大批量视频的总耗时，
+用于在不实际播放的情况下比较不同并发数量和调度方式
+用法: uv run python -m benchmarks.simulate [--videos 300] [--hours 100] [--concurrency 1,2,4,8]
+      uv run python -m benchmarks.simulate --from-journal progress.jsonl
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import random
+import time
+from dataclasses import asdict
+from typing import List
+from automation import ProgressJournal
+from automation.simulation import SimulatedVideo, SimulationResult, simulate
+
+
+def synthetic_videos(count: int, hours: float, spread: float, partial: float,
+                     non_video: float, seed: int) -> List[SimulatedVideo]:
+    """
+    生成合成的视频列表
+    :param count: 视频数量
+    :param hours: 所有视频的总时长(小时)
+    :param spread: 单个视频时长相对平均值的浮动比例 (0~1)
+    :param partial: 已看过一部分的视频比例
+    :param non_video: 没有视频（按默认等待时间处理）的页面比例
+    :param seed: 随机种子
+    :return: 合成视频列表
+    """
+    rng = random.Random(seed)
+    mean = hours * 3600 / max(count, 1)
+    videos = []
+    for i in range(1, count + 1):
+        url = f"https://moodle.example/mod/fsresource/view.php?id={i}"
+        if rng.random() < non_video:
+            videos.append(SimulatedVideo(url, None))
+            continue
+        duration = rng.uniform(mean * (1 - spread), mean * (1 + spread))
+        watched = rng.uniform(0, duration) if rng.random() < partial else 0.0
+        videos.append(SimulatedVideo(url, duration, watched))
+    return videos
+
+
+def journal_videos(path: str) -> List[SimulatedVideo]:
+    """
+    使用进度记录中的真实时长作为模拟输入（没有时长的记录按非视频页面处理）
+    :param path: 进度记录文件路径
+    :return: 合成视频列表
+    """
+    journal = ProgressJournal(path)
+    return [
+        SimulatedVideo(record.url, record.duration, record.watched or 0.0, record.completed)
+        for record in journal.records.values()
+    ]
+
+
+def hours(seconds: float) -> str:
+    return f"{seconds / 3600:.2f}h"
+
+
+def print_results(results: List[SimulationResult], elapsed: float):
+    print(f"\n📊 调度模拟结果 (共 {results[0].videos} 个待观看视频, 实际耗时 {elapsed:.2f} 秒)")
+    print(f"  {'标签页':>4} {'调度':>4} {'预计耗时':>9} {'理论最短':>9} {'效率':>7} {'空闲合计':>9} {'无效等待':>9}")
+    for result in results:
+        print(f"  {result.tab_count:>6} {result.scheduling:>4} {hours(result.makespan):>11} "
+              f"{hours(result.lower_bound):>11} {result.efficiency:>8.1%} {hours(result.idle_time):>11} "
+              f"{hours(result.wasted_wait):>11}")
+
+
+async def run(args: argparse.Namespace) -> List[SimulationResult]:
+    if args.from_journal:
+        videos = journal_videos(args.from_journal)
+    else:
+        videos = synthetic_videos(args.videos, args.hours, args.spread, args.partial, args.non_video, args.seed)
+
+    results = []
+    for tab_count in args.concurrency:
+        for lpt in (False, True):
+            # 被测代码本身的逐个视频输出在模拟中没有意义
+            with contextlib.redirect_stdout(io.StringIO()):
+                results.append(await simulate(
+                    videos,
+                    tab_count,
+                    lpt=lpt,
+                    default_wait_time=args.default_wait,
+                    navigation_overhead=args.overhead
+                ))
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="在虚拟时钟上模拟多标签页播放调度")
+    parser.add_argument("--videos", type=int, default=300, help="合成视频数量 (默认300)")
+    parser.add_argument("--hours", type=float, default=100, help="合成视频总时长(小时) (默认100)")
+    parser.add_argument("--spread", type=float, default=0.8, help="单个视频时长的浮动比例 (默认0.8)")
+    parser.add_argument("--partial", type=float, default=0.1, help="已看过一部分的视频比例 (默认0.1)")
+    parser.add_argument("--non-video", type=float, default=0.05, help="没有视频的页面比例 (默认0.05)")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子 (默认1)")
+    parser.add_argument("--from-journal", metavar="PATH", help="改用进度记录文件中的真实视频时长")
+    parser.add_argument("--concurrency", default="1,2,4,8",
+                        type=lambda value: [int(v) for v in value.split(",") if v.strip()],
+                        help="依次模拟的并发标签页数量，逗号分隔 (默认1,2,4,8)")
+    parser.add_argument("--default-wait", type=float, default=60, help="非视频页面的默认等待时间(秒) (默认60)")
+    parser.add_argument("--overhead", type=float, default=3, help="每个视频的页面导航开销(秒) (默认3)")
+    parser.add_argument("--output", help="将结果保存为JSON文件")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    started_at = time.perf_counter()
+    results = asyncio.run(run(args))
+    if not results or not results[0].videos:
+        print("没有需要模拟的视频")
+    else:
+        print_results(results, time.perf_counter() - started_at)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([asdict(result) for result in results], f, indent=2, ensure_ascii=False)
+        print(f"\n✓ 结果已保存到 {args.output}")
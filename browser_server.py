@@ -0,0 +1,38 @@
+"""
+常驻浏览器服务
+启动一个开放远程调试端口的浏览器并保持运行，main.py 通过 BROWSER_ENDPOINT 连接即可复用，
+省去每次运行时启动 Playwright 驱动和浏览器的开销
+用法: uv run python browser_server.py [--port 9222]
+"""
+
+import argparse
+import asyncio
+from playwright.async_api import async_playwright
+from automation.browser import launch_args
+import config
+
+
+async def serve(port: int):
+    """启动浏览器并等待其被关闭"""
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            channel=config.BROWSER,
+            headless=config.HEADLESS,
+            args=launch_args(config.LAUNCH_PROFILE, config.HEADLESS) + [f'--remote-debugging-port={port}']
+        )
+        disconnected = asyncio.Event()
+        browser.on("disconnected", lambda _: disconnected.set())
+
+        print(f"✓ 浏览器已启动，连接地址: http://127.0.0.1:{port}")
+        print(f"💡 在 .env 中设置 BROWSER_ENDPOINT=http://127.0.0.1:{port} 后运行 main.py 即可复用此浏览器")
+        print("💡 按下 Ctrl+C 关闭浏览器")
+        await disconnected.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="启动供 main.py 连接的常驻浏览器")
+    parser.add_argument("--port", type=int, default=9222, help="远程调试端口 (默认9222)")
+    try:
+        asyncio.run(serve(parser.parse_args().port))
+    except KeyboardInterrupt:
+        print("\n✓ 浏览器已关闭")
@@ -12,8 +12,24 @@ load_dotenv()
 # ============= 从环境变量读取的配置 =============
 BROWSER = os.getenv("BROWSER", "msedge")  # 浏览器类型(msedge/chrome/firefox)
 HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"  # 是否使用无头模式
+CONCURRENCY = max(1, int(os.getenv("CONCURRENCY", "1")))  # 同时播放视频的标签页数量
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "false").lower() == "true"  # 是否拦截播放不需要的资源
+LOW_BITRATE = os.getenv("LOW_BITRATE", "false").lower() == "true"  # 是否强制使用最低码率播放
+PIPELINE = os.getenv("PIPELINE", "false").lower() == "true"  # 是否启用流水线模式(链接发现、预扫描与播放同时进行)
+TAB_BUDGET = max(1, int(os.getenv("TAB_BUDGET", "4")))  # 多账号批量模式下所有账号同时播放的标签页总数上限
+LPT_SCHEDULING = os.getenv("LPT_SCHEDULING", "false").lower() == "true"  # 多标签页播放时是否按剩余时长从长到短调度
+LAUNCH_PROFILE = os.getenv("LAUNCH_PROFILE", "default")  # 浏览器启动配置(default/bulk)，bulk 适用于多个标签页同时后台播放
+USER_DATA_DIR = os.getenv("USER_DATA_DIR") or None  # 持久化浏览器配置目录(留空则每次使用全新浏览器)
+BROWSER_CACHE_SIZE_MB = int(os.getenv("BROWSER_CACHE_SIZE_MB", "200"))  # 持久化配置下HTTP缓存上限(MB)
+BROWSER_ENDPOINT = os.getenv("BROWSER_ENDPOINT") or None  # 已运行浏览器的连接地址(见 browser_server.py，留空则每次启动新浏览器)
+REPORT_TAB_FOOTPRINT = os.getenv("REPORT_TAB_FOOTPRINT", "false").lower() == "true"  # 是否报告每个标签页的流量和CPU占用
+TAB_HEAP_LIMIT_MB = float(os.getenv("TAB_HEAP_LIMIT_MB", "0"))  # 单个标签页JS堆上限(MB)，超过后在下一个视频前换用新页面(默认0表示关闭)
+PROFILE = os.getenv("PROFILE", "false").lower() == "true"  # 是否在退出时报告事件循环延迟和 Playwright 调用耗时
+PROMETHEUS_TEXTFILE = os.getenv("PROMETHEUS_TEXTFILE") or None  # 阶段耗时直方图的 Prometheus textfile 路径(留空则不输出)
 if not (VIDEO_LIST_URL := os.getenv("VIDEO_LIST_URL")):
     raise ValueError("错误: 环境变量 'VIDEO_LIST_URL' 未设置或为空。请在 .env 文件中配置它。")
+# 支持以英文逗号分隔多个课程页面
+VIDEO_LIST_URLS = [url.strip() for url in VIDEO_LIST_URL.split(",") if url.strip()]
 
 
 # ============= 其他配置 =============
@@ -21,12 +37,29 @@ if not (VIDEO_LIST_URL := os.getenv("VIDEO_LIST_URL")):
 TEST_LOGIN_MODE = False  # 设置为True以启用登录测试模式（仅测试登录功能）
 # Cookie登录配置
 COOKIE_FILE = "cookies.json"  # Cookie文件路径
+KEEPALIVE_INTERVAL = 300  # 会话保活的最长间隔(秒)，Cookie临近过期时会提前续期
+PLAYBACK_SAMPLE_INTERVAL = 60  # bulk 启动配置下报告播放速率和内存占用的间隔(秒)
+TAB_DOM_NODE_LIMIT = 150000  # 单个标签页DOM节点数量上限，超过后在下一个视频前换用新页面(0表示不限制)
+PROFILE_TOP_N = 10  # PROFILE=true 时报告中显示的 Playwright 调用类型数量
+PROGRESS_FILE = "progress.jsonl"  # 观看进度记录文件路径(用于断点续看)
+TIMING_REPORT_FILE = "timing_report.json"  # 各阶段耗时与每个视频记录的JSON报告路径(运行结束时写入)
 BASE_URL = "https://moodle.scnu.edu.cn/my/"  # 网站首页URL(用于验证Cookie)
 SSO_INDEX_URL = "https://sso.scnu.edu.cn/AccountService/user/index.html"  # SSO主页URL
 LOGIN_URL = "https://sso.scnu.edu.cn/AccountService/user/login.html"
+LINK_CACHE_FILE = "link_cache.json"  # 视频链接缓存文件路径
+LINK_CACHE_TTL = 3600  # 视频链接缓存有效期(秒)，过期后向服务器重新验证
 # URL模式匹配（脚本会自动找到所有包含此模式的链接）
 URL_PATTERN = "https://moodle.scnu.edu.cn/mod/fsresource/view.php?id="  # 视频链接的URL模式
+# 预扫描配置（以纯HTTP方式批量检查视频完成状态，0表示关闭）
+PRESCAN_CONCURRENCY = 8  # 预扫描的最大并发请求数
+# 资源拦截配置（BLOCK_RESOURCES=true 时生效）
+BLOCKED_RESOURCE_TYPES = ["image", "font"]  # 拦截的资源类型(image/font/stylesheet/media等)
+BLOCKED_URL_PATTERNS = ["google-analytics.com", "googletagmanager.com", "hm.baidu.com", "cnzz.com"]  # URL包含任一片段即拦截
+ALLOWED_URL_PATTERNS = []  # URL包含任一片段即放行(优先于拦截规则)
 # 视频播放配置
 VIDEO_ELEMENT_SELECTOR = "video"  # 视频元素的CSS选择器
 PLAY_BUTTON_SELECTOR = ".vjs-big-play-button"  # 播放按钮的CSS选择器
+COMPLETION_SELECTOR = ".tips-completion"  # 完成状态提示的CSS选择器
+WATCHED_TIME_SELECTOR = ".num-gksc > span"  # 已观看时长(秒)的CSS选择器
+GUEST_BLOCK_TEXT = "访客不能访问此课程"  # Cookie失效时页面显示的提示文字
 DEFAULT_WAIT_TIME = 2  # 如果无法获取视频时长,默认等待时间(秒)
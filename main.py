@@ -3,11 +3,27 @@
 配置请在 config.py 中修改
 """
 
+import argparse
 import asyncio
+import multiprocessing
+import sys
+import time
 import traceback
 from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
 from cookie_fix import cookie_fix
-from automation import BrowserManager, AuthManager, VideoManager
+from automation import (
+    BrowserManager, AuthManager, VideoManager, PageSelectors, ProgressJournal,
+    ResourceBlocker, LowBitrateProfile, SessionSnapshot, SessionKeepAlive,
+    LinkDiscovery, PlaybackPipeline, MakespanScheduler, ShardCoordinator, ShardSettings,
+    AccountBatch, BatchSettings, TabMemoryWatchdog
+)
+from automation.batch import load_accounts
+from automation.metrics import PlaybackSampler
+from automation.profiler import RuntimeProfiler
+from automation.session import check_session_http, SESSION_VALID, SESSION_EXIT_CODES
+from automation.timing import timings, write_reports
 import config
 
 
@@ -32,7 +48,63 @@ def print_welcome():
     print("💡 提示: 可按下 Ctrl+C 结束程序\n")
 
 
-async def main():
+def parse_args() -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="FlyVedioAssignmentAway - 砺儒云视频自动观看工具")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="启动前清除持久化浏览器配置(USER_DATA_DIR)中的HTTP缓存")
+    parser.add_argument("--check", action="store_true",
+                        help="不启动浏览器，仅检查 cookies.json 是否仍然有效后退出 "
+                             "(退出码: 0=有效, 1=已过期, 2=被重定向到SSO, 3=检查出错)")
+    parser.add_argument("--shards", type=int, default=1, metavar="N",
+                        help="将待观看视频分给 N 个工作进程播放，每个进程运行独立的浏览器和 "
+                             "CONCURRENCY 个标签页 (默认 1，即不分片)")
+    parser.add_argument("--accounts", metavar="PATH",
+                        help="批量观看多个账号：PATH 为存放各账号Cookie文件(*.json)的目录或账号清单文件，"
+                             "所有账号共用一个浏览器，各自使用独立的上下文")
+    return parser.parse_args()
+
+
+def check_session() -> int:
+    """以纯HTTP方式检查会话是否有效，返回进程退出码"""
+    started_at = time.perf_counter()
+    status, detail = check_session_http(
+        config.BASE_URL,
+        config.COOKIE_FILE,
+        login_host=urlparse(config.LOGIN_URL).netloc,
+        guest_block_text=config.GUEST_BLOCK_TEXT
+    )
+    elapsed = time.perf_counter() - started_at
+    mark = "✓" if status == SESSION_VALID else "❌"
+    print(f"{mark} 会话状态: {status} - {detail} ({elapsed:.2f} 秒)")
+    return SESSION_EXIT_CODES[status]
+
+
+def new_watchdog() -> Optional[TabMemoryWatchdog]:
+    """TAB_HEAP_LIMIT_MB 大于0时创建标签页内存看门狗"""
+    if config.TAB_HEAP_LIMIT_MB <= 0:
+        return None
+    return TabMemoryWatchdog(config.TAB_HEAP_LIMIT_MB, config.TAB_DOM_NODE_LIMIT)
+
+
+def start_profiler() -> Optional[RuntimeProfiler]:
+    """启用 PROFILE 时开始分析事件循环延迟和 Playwright 调用耗时"""
+    if not config.PROFILE:
+        return None
+    profiler = RuntimeProfiler()
+    profiler.start()
+    print("🔬 已启用性能分析，退出时打印报告")
+    return profiler
+
+
+async def stop_profiler(profiler: Optional[RuntimeProfiler]):
+    """停止性能分析并打印报告"""
+    if profiler:
+        await profiler.stop()
+        profiler.print_report(config.PROFILE_TOP_N)
+
+
+async def main(args: argparse.Namespace):
     """主函数"""
     
     # 显示欢迎界面
@@ -41,20 +113,70 @@ async def main():
     # 从 config.py 读取配置
     print("📦 正在初始化浏览器...")
     browser_manager = None
+    keepalive = None
+    sampler = None
+    watchdog = new_watchdog()
+    profiler = start_profiler()
 
     try:
         # 1. 启动浏览器
+        resource_blocker = None
+        if config.BLOCK_RESOURCES:
+            resource_blocker = ResourceBlocker(
+                config.BLOCKED_RESOURCE_TYPES,
+                config.BLOCKED_URL_PATTERNS,
+                config.ALLOWED_URL_PATTERNS
+            )
+        media_profile = LowBitrateProfile() if config.LOW_BITRATE else None
+        # 启动前读取一次会话快照，创建上下文时直接应用，无需等页面创建后再加载Cookie
+        with timings.phase("cookie_load"):
+            session = None if config.TEST_LOGIN_MODE else SessionSnapshot.load(config.COOKIE_FILE)
+        if args.clear_cache and config.USER_DATA_DIR:
+            BrowserManager.clear_cache(config.USER_DATA_DIR)
         browser_manager = BrowserManager(
             browser_type=config.BROWSER,
-            headless=config.HEADLESS
+            headless=config.HEADLESS,
+            resource_blocker=resource_blocker,
+            media_profile=media_profile,
+            user_data_dir=config.USER_DATA_DIR,
+            cache_size_mb=config.BROWSER_CACHE_SIZE_MB,
+            endpoint=config.BROWSER_ENDPOINT,
+            session=session,
+            launch_profile=config.LAUNCH_PROFILE
         )
-        await browser_manager.setup()
+        started_at = time.perf_counter()
+        with timings.phase("browser_launch"):
+            await browser_manager.setup()
+        print(f"⏱️ 浏览器启动耗时 {time.perf_counter() - started_at:.1f} 秒")
         # 2. 初始化认证和视频管理器
         page = browser_manager.get_page()
         context = browser_manager.get_context()
 
-        auth_manager = AuthManager(page, context)
-        video_manager = VideoManager(page, auth_manager)
+        auth_manager = AuthManager(
+            page,
+            context,
+            login_host=urlparse(config.LOGIN_URL).netloc,
+            guest_block_text=config.GUEST_BLOCK_TEXT,
+            session=session
+        )
+        selectors = PageSelectors(
+            video=config.VIDEO_ELEMENT_SELECTOR,
+            play_button=config.PLAY_BUTTON_SELECTOR,
+            completion=config.COMPLETION_SELECTOR,
+            watched_time=config.WATCHED_TIME_SELECTOR,
+            guest_block_text=config.GUEST_BLOCK_TEXT
+        )
+        video_manager = VideoManager(
+            page,
+            auth_manager,
+            selectors,
+            ProgressJournal(config.PROGRESS_FILE),
+            media_profile,
+            config.REPORT_TAB_FOOTPRINT,
+            MakespanScheduler(config.CONCURRENCY, config.DEFAULT_WAIT_TIME)
+            if config.LPT_SCHEDULING and not config.PIPELINE else None,
+            watchdog=watchdog
+        )
         login_success = False
         # 测试模式下跳过尝试，进行登录凭证获取测试
         if not config.TEST_LOGIN_MODE:
@@ -64,7 +186,8 @@ async def main():
                 print(f"📂 检测到已有 Cookie 文件: {config.COOKIE_FILE}，尝试直接使用该文件登录...")
                 login_success = await auth_manager.login_with_cookies(
                     config.BASE_URL,
-                    config.COOKIE_FILE
+                    config.COOKIE_FILE,
+                    preloaded=session is not None
                 )
         if not login_success:
             print("登录凭证已失效或不存在")
@@ -110,22 +233,112 @@ async def main():
             print("\n❌ 登录失败!")
             return
 
+        # 启动上下文共享的会话保活任务
+        keepalive = SessionKeepAlive(
+            context,
+            auth_manager.session or SessionSnapshot(),
+            config.COOKIE_FILE,
+            interval=config.KEEPALIVE_INTERVAL,
+            session_host=urlparse(config.BASE_URL).hostname
+        )
+        await keepalive.start()
+        auth_manager.use_keepalive(keepalive)
+
+        # bulk 启动配置下定期报告各标签页的播放速率和内存占用
+        if config.LAUNCH_PROFILE == "bulk":
+            sampler = PlaybackSampler(
+                browser_manager.browser,
+                context,
+                config.VIDEO_ELEMENT_SELECTOR,
+                config.PLAYBACK_SAMPLE_INTERVAL
+            )
+            sampler.start()
+
+        # 流水线模式：链接发现、预扫描和播放同时进行
+        if config.PIPELINE:
+            discovery = LinkDiscovery(
+                context,
+                config.LINK_CACHE_FILE,
+                config.LINK_CACHE_TTL,
+                login_host=auth_manager.login_host,
+                guest_block_text=config.GUEST_BLOCK_TEXT
+            )
+            pipeline = PlaybackPipeline(
+                video_manager,
+                discovery,
+                config.URL_PATTERN,
+                tab_count=config.CONCURRENCY,
+                prescan_concurrency=config.PRESCAN_CONCURRENCY
+            )
+            await pipeline.run(
+                config.VIDEO_LIST_URLS,
+                config.VIDEO_ELEMENT_SELECTOR,
+                config.PLAY_BUTTON_SELECTOR,
+                config.DEFAULT_WAIT_TIME
+            )
+            return
+
         # 4. 通过URL模式获取视频链接
         print(f"\n正在提取视频链接...")
         print(f"URL模式: {config.URL_PATTERN}")
 
-        video_links = await video_manager.get_video_links_by_pattern(
-            config.VIDEO_LIST_URL,
-            config.URL_PATTERN
-        )
+        with timings.phase("link_discovery"):
+            video_links = await video_manager.discover_video_links(
+                config.VIDEO_LIST_URLS,
+                config.URL_PATTERN,
+                config.LINK_CACHE_FILE,
+                config.LINK_CACHE_TTL
+            )
+
+        # 5. 先按进度记录跳过已完成的视频（与批量模式一致），再预扫描其余视频的完成状态，仅为未完成的视频打开标签页
+        if video_links and video_manager.journal:
+            planned = video_manager.journal.plan(video_links)
+            skipped = len(video_links) - len(planned)
+            if skipped:
+                print(f"\n📒 根据进度记录跳过 {skipped} 个已完成的视频")
+            video_links = planned
+            if not video_links:
+                print("✓ 所有视频均已完成，无需观看")
+                return
+
+        if video_links and config.PRESCAN_CONCURRENCY > 0:
+            with timings.phase("prescan"):
+                video_links = await video_manager.prescan_videos(video_links, config.PRESCAN_CONCURRENCY)
+            if not video_links:
+                print("✓ 所有视频均已完成，无需观看")
+                return
 
-        # 5. 观看所有视频
-        if video_links:
+        # 6. 观看所有视频
+        if video_links and args.shards > 1 and len(video_links) > 1:
+            settings = ShardSettings(
+                browser_type=config.BROWSER,
+                headless=config.HEADLESS,
+                cookie_file=config.COOKIE_FILE,
+                progress_file=config.PROGRESS_FILE,
+                base_url=config.BASE_URL,
+                login_host=auth_manager.login_host,
+                selectors=selectors,
+                default_wait_time=config.DEFAULT_WAIT_TIME,
+                tabs=config.CONCURRENCY,
+                keepalive_interval=config.KEEPALIVE_INTERVAL,
+                block_rules=(
+                    config.BLOCKED_RESOURCE_TYPES,
+                    config.BLOCKED_URL_PATTERNS,
+                    config.ALLOWED_URL_PATTERNS
+                ) if config.BLOCK_RESOURCES else None,
+                low_bitrate=config.LOW_BITRATE,
+                launch_profile=config.LAUNCH_PROFILE,
+                tab_heap_limit_mb=config.TAB_HEAP_LIMIT_MB,
+                tab_node_limit=config.TAB_DOM_NODE_LIMIT
+            )
+            await ShardCoordinator(settings, args.shards, video_manager.journal).run(video_links)
+        elif video_links:
             await video_manager.watch_videos(
                 video_links,
                 config.VIDEO_ELEMENT_SELECTOR,
                 config.PLAY_BUTTON_SELECTOR,
-                config.DEFAULT_WAIT_TIME
+                config.DEFAULT_WAIT_TIME,
+                config.CONCURRENCY
             )
         else:
             print("❌ 未找到任何视频链接。")
@@ -136,18 +349,91 @@ async def main():
         traceback.print_exc()
         suggestions()
     finally:
-        # 6. 关闭浏览器
+        if sampler:
+            await sampler.stop()
+        if watchdog:
+            watchdog.print_report()
+        if keepalive:
+            await keepalive.stop()
+        write_reports(config.TIMING_REPORT_FILE, config.PROMETHEUS_TEXTFILE)
+        await stop_profiler(profiler)
+        # 7. 关闭浏览器
         if browser_manager:
             try:
                 # 检查浏览器是否仍在运行
-                browser = browser_manager.browser
-                if browser and browser.is_connected():
+                if browser_manager.is_attached():
+                    # 连接的是常驻浏览器，无需等待确认
+                    await browser_manager.close()
+                elif browser_manager.is_connected():
                     input("\n按回车键退出并关闭浏览器...")
                     await browser_manager.close()
             except Exception:
                 # 浏览器已被手动关闭或其他错误，静默处理
                 pass
 
+async def run_accounts(args: argparse.Namespace):
+    """多账号批量模式"""
+    print_welcome()
+    accounts = load_accounts(args.accounts)
+    if not accounts:
+        print(f"❌ 未在 {args.accounts} 中找到任何账号")
+        return
+
+    browser_manager = BrowserManager(
+        browser_type=config.BROWSER,
+        headless=config.HEADLESS,
+        resource_blocker=ResourceBlocker(
+            config.BLOCKED_RESOURCE_TYPES,
+            config.BLOCKED_URL_PATTERNS,
+            config.ALLOWED_URL_PATTERNS
+        ) if config.BLOCK_RESOURCES else None,
+        media_profile=LowBitrateProfile() if config.LOW_BITRATE else None,
+        endpoint=config.BROWSER_ENDPOINT,
+        launch_profile=config.LAUNCH_PROFILE
+    )
+    watchdog = new_watchdog()
+    profiler = start_profiler()
+    try:
+        started_at = time.perf_counter()
+        with timings.phase("browser_launch"):
+            await browser_manager.setup()
+        print(f"⏱️ 浏览器启动耗时 {time.perf_counter() - started_at:.1f} 秒")
+        settings = BatchSettings(
+            base_url=config.BASE_URL,
+            course_urls=config.VIDEO_LIST_URLS,
+            url_pattern=config.URL_PATTERN,
+            login_host=urlparse(config.LOGIN_URL).netloc,
+            selectors=PageSelectors(
+                video=config.VIDEO_ELEMENT_SELECTOR,
+                play_button=config.PLAY_BUTTON_SELECTOR,
+                completion=config.COMPLETION_SELECTOR,
+                watched_time=config.WATCHED_TIME_SELECTOR,
+                guest_block_text=config.GUEST_BLOCK_TEXT
+            ),
+            default_wait_time=config.DEFAULT_WAIT_TIME,
+            tabs_per_account=config.CONCURRENCY,
+            tab_budget=config.TAB_BUDGET,
+            prescan_concurrency=config.PRESCAN_CONCURRENCY,
+            link_cache_ttl=config.LINK_CACHE_TTL,
+            keepalive_interval=config.KEEPALIVE_INTERVAL,
+            media_profile=browser_manager.media_profile,
+            watchdog=watchdog
+        )
+        await AccountBatch(browser_manager, settings).run(accounts)
+    except Exception as e:
+        print(f"\n❌ 发生错误: {e}")
+        traceback.print_exc()
+    finally:
+        if watchdog:
+            watchdog.print_report()
+        write_reports(config.TIMING_REPORT_FILE, config.PROMETHEUS_TEXTFILE)
+        await stop_profiler(profiler)
+        try:
+            await browser_manager.close()
+        except Exception:
+            pass
+
+
 def suggestions():
     print("\n💡 故障排查建议:")
     print("  1. 检查 config.py 中是否正确配置了课程链接")
@@ -157,4 +443,12 @@ def suggestions():
     print("  5. 如仍有问题，请提交 issue 至 GitHub 仓库：github.com/YewFence/fly_vedio_assignment_away\n")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 打包为可执行文件后，分片模式的工作进程需要由此进入
+    multiprocessing.freeze_support()
+    args = parse_args()
+    if args.check:
+        sys.exit(check_session())
+    if args.accounts:
+        asyncio.run(run_accounts(args))
+    else:
+        asyncio.run(main(args))
@@ -0,0 +1,92 @@
+"""
+基准测试冒烟测试：检查命令行参数，并在本地模拟 Moodle 服务上以纯HTTP方式运行链接发现与预扫描（无需浏览器）
+用法: uv run python -m unittest discover tests
+"""
+
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+from playwright.async_api import async_playwright
+from automation.discovery import LinkDiscovery
+from automation.prescan import fetch_prescan_result
+from automation.probe import PageSelectors
+from benchmarks import e2e
+from benchmarks.fake_moodle import FakeMoodle, URL_PATTERN
+
+
+class E2EArgumentsTest(unittest.TestCase):
+
+    def test_defaults(self):
+        args = e2e.parse_args([])
+        self.assertEqual((args.videos, args.courses, args.duration), (8, 2, 5))
+        self.assertEqual(args.concurrency, [1, 2, 4])
+        self.assertEqual(args.profile, "default")
+
+    def test_concurrency_list(self):
+        args = e2e.parse_args(["--videos", "3", "--concurrency", "1, 3,", "--browser", "chromium"])
+        self.assertEqual(args.videos, 3)
+        self.assertEqual(args.concurrency, [1, 3])
+        self.assertEqual(args.browser, "chromium")
+
+    def test_print_result_with_baseline(self):
+        run = {'concurrency': 2, 'wall': 12.0, 'ideal': 10.0, 'overhead_per_video': 0.5,
+               'videos_per_minute': 40.0, 'completed': 8, 'requests': {}}
+        result = {'revision': 'new', 'videos': 8, 'video_seconds': 5, 'browser_startup': 1.0, 'login': 0.2,
+                  'discovery_browser': 0.5, 'discovery_http': 0.1, 'runs': [run]}
+        baseline = dict(result, revision='old', runs=[dict(run, overhead_per_video=1.0)])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            e2e.print_result(result, baseline)
+        self.assertIn("-50.0% vs old", output.getvalue())
+
+
+class FakeMoodleHttpTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.fake = FakeMoodle(courses=2, videos_per_course=3)
+        self.fake.start()
+        self.playwright = await async_playwright().start()
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    async def asyncTearDown(self):
+        await self.playwright.stop()
+        self.fake.stop()
+        self.cache_dir.cleanup()
+
+    async def request_context(self, cookies: list):
+        api = await self.playwright.request.new_context(storage_state={'cookies': cookies, 'origins': []})
+        self.addAsyncCleanup(api.dispose)
+        return SimpleNamespace(request=api)
+
+    def discovery(self, context) -> LinkDiscovery:
+        return LinkDiscovery(context, str(Path(self.cache_dir.name) / "link_cache.json"), ttl=0,
+                             login_host=self.fake.sso_host)
+
+    async def test_discovery_and_prescan(self):
+        context = await self.request_context(self.fake.cookies())
+        links, failed = await self.discovery(context).discover(self.fake.course_urls, URL_PATTERN)
+        self.assertEqual(failed, [])
+        self.assertEqual([link.rsplit("=", 1)[1] for link in links], ["1001", "1002", "1003", "2001", "2002", "2003"])
+
+        self.fake.reset(completed={"1002"})
+        selectors = PageSelectors()
+        pending = await fetch_prescan_result(context, links[0], selectors, self.fake.sso_host)
+        done = await fetch_prescan_result(context, links[1], selectors, self.fake.sso_host)
+        self.assertTrue(pending.session_valid)
+        self.assertFalse(pending.completed)
+        self.assertTrue(done.completed)
+
+    async def test_expired_session(self):
+        context = await self.request_context([])
+        with self.assertRaisesRegex(Exception, "Cookie已失效"):
+            await self.discovery(context).discover(self.fake.course_urls, URL_PATTERN)
+        result = await fetch_prescan_result(context, f"{self.fake.base_url}/mod/fsresource/view.php?id=1001",
+                                            PageSelectors(), self.fake.sso_host)
+        self.assertFalse(result.session_valid)
+
+
+if __name__ == "__main__":
+    unittest.main()
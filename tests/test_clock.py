@@ -0,0 +1,79 @@
+"""
+虚拟时钟与调度模拟测试
+用法: uv run python -m unittest discover tests
+"""
+
+import asyncio
+import io
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+from automation.clock import VirtualClock, format_time
+from automation.scheduler import MakespanScheduler
+from automation.simulation import SimulatedVideo, simulate
+
+
+class VirtualClockTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_wait_for_times_out_in_virtual_time(self):
+        clock = VirtualClock()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def wait():
+            with self.assertRaises(asyncio.TimeoutError):
+                await clock.wait_for(queue.get(), 30)
+            return clock.time()
+
+        self.assertEqual(await clock.run(wait()), 30)
+
+    async def test_wait_for_returns_before_timeout(self):
+        clock = VirtualClock()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def put_later():
+            await clock.sleep(5)
+            queue.put_nowait("ended")
+
+        async def wait():
+            asyncio.create_task(put_later())
+            event = await clock.wait_for(queue.get(), 30)
+            return event, clock.time()
+
+        self.assertEqual(await clock.run(wait()), ("ended", 5))
+
+
+class SchedulerProjectionTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_projection_follows_virtual_clock(self):
+        clock = VirtualClock()
+        scheduler = MakespanScheduler(1, clock=clock)
+        scheduler.estimates = {"a": 600, "b": 300}
+        with redirect_stdout(io.StringIO()):
+            scheduler.plan(["b", "a"])
+        scheduler.start("a")
+        await clock.run(clock.sleep(100))
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            scheduler.print_projection()
+        finish_at = datetime.fromtimestamp(clock.wall_time() + 800)
+        self.assertIn(f"预计完成时间: {finish_at:%H:%M:%S} (还需 {format_time(800)})", output.getvalue())
+        self.assertEqual(format_time(800), "13:20")
+
+
+class SimulationTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_simulation_plays_videos_through_play_video(self):
+        videos = [
+            SimulatedVideo("https://example.test/mod/fsresource/view.php?id=1", 600),
+            SimulatedVideo("https://example.test/mod/fsresource/view.php?id=2", 300, watched=100),
+            SimulatedVideo("https://example.test/mod/fsresource/view.php?id=3", None),
+        ]
+        result = await simulate(videos, tab_count=1, default_wait_time=60, navigation_overhead=3)
+        # 3 次导航 + 600 秒 + 剩余 200 秒 + 非视频页面默认等待 60 秒
+        self.assertAlmostEqual(result.makespan, 9 + 600 + 200 + 60)
+        self.assertAlmostEqual(result.default_wait_time, 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+链接发现测试
+用法: uv run python -m unittest discover tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from automation.discovery import LinkDiscovery, extract_video_links, sort_links
+
+COURSE_URL = "https://example.test/course/view.php?id=1"
+URL_PATTERN = "fsresource/view.php?id="
+
+
+class _FakeResponse:
+    def __init__(self, html: str):
+        self.status = 200
+        self.ok = True
+        self.headers = {}
+        self._html = html
+
+    async def text(self) -> str:
+        return self._html
+
+
+class _FakeRequest:
+    """按顺序返回给定页面的 APIRequestContext 替身"""
+
+    def __init__(self, *pages: str):
+        self.pages = list(pages)
+
+    async def get(self, url, headers=None, max_redirects=None):
+        return _FakeResponse(self.pages.pop(0))
+
+
+def _discovery(cache_dir: str, *pages: str) -> LinkDiscovery:
+    context = SimpleNamespace(request=_FakeRequest(*pages))
+    return LinkDiscovery(context, str(Path(cache_dir) / "link_cache.json"))
+
+
+class SortLinksTest(unittest.TestCase):
+
+    def test_sorts_by_numeric_resource_id(self):
+        links = [f"https://example.test/mod/fsresource/view.php?id={rid}" for rid in (10, 9, 100, 9)]
+        self.assertEqual([link.rsplit("=", 1)[1] for link in sort_links(links)], ["9", "10", "100"])
+
+    def test_extract_records_sections(self):
+        html = (
+            '<li id="section-0"><a href="/mod/fsresource/view.php?id=3">a</a></li>'
+            '<li id="section-2"><a href="view.php?id=4">b</a><a href="/mod/fsresource/view.php?id=2">c</a></li>'
+        )
+        self.assertEqual(extract_video_links(html, "https://example.test/course/view.php?id=1", URL_PATTERN), [
+            ("https://example.test/mod/fsresource/view.php?id=3", 0),
+            ("https://example.test/mod/fsresource/view.php?id=2", 2),
+        ])
+
+
+class LinkDiscoveryTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_guest_page_raises_and_is_not_cached(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            discovery = _discovery(cache_dir, '<div role="main">访客不能访问此课程</div>')
+            with self.assertRaisesRegex(Exception, "Cookie已失效"):
+                await discovery.discover([COURSE_URL], URL_PATTERN)
+            self.assertNotIn(COURSE_URL, discovery.cache)
+
+    async def test_empty_result_is_refetched(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            links_page = '<a href="/mod/fsresource/view.php?id=7">视频</a>'
+            discovery = _discovery(cache_dir, "<p>暂无内容</p>", links_page)
+            self.assertEqual(await discovery.discover([COURSE_URL], URL_PATTERN), ([], []))
+            self.assertNotIn(COURSE_URL, discovery.cache)
+
+            links, _ = await discovery.discover([COURSE_URL], URL_PATTERN)
+            self.assertEqual(links, ["https://example.test/mod/fsresource/view.php?id=7"])
+
+
+if __name__ == "__main__":
+    unittest.main()
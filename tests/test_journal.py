@@ -0,0 +1,51 @@
+"""
+观看进度日志测试
+用法: uv run python -m unittest discover tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from automation.journal import ProgressJournal, resource_id
+
+
+def _link(rid: int) -> str:
+    return f"https://example.test/mod/fsresource/view.php?id={rid}"
+
+
+class ProgressJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.directory.name) / "progress.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_plan_skips_completed_and_puts_partial_first(self):
+        journal = ProgressJournal(self.path)
+        journal.record(_link(1), True, 600, 600)
+        journal.record(_link(3), False, 600, 120)
+        journal.record(_link(4), False, 600, 0)
+        self.assertEqual(journal.plan([_link(rid) for rid in (1, 2, 3, 4)]), [_link(3), _link(2), _link(4)])
+
+    def test_latest_record_wins_after_reload(self):
+        journal = ProgressJournal(self.path)
+        journal.record(_link(1), False, 600, 300)
+        journal.record(_link(1), True, watched=600)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"resource_id": "2", "url"')  # 进程中途退出留下的不完整行
+
+        reloaded = ProgressJournal(self.path)
+        record = reloaded.get(_link(1))
+        self.assertTrue(record.completed)
+        self.assertEqual(record.duration, 600)
+        self.assertEqual(reloaded.plan([_link(1), _link(2)]), [_link(2)])
+
+    def test_resource_id(self):
+        self.assertEqual(resource_id(_link(42)), "42")
+        self.assertIsNone(resource_id("https://example.test/my/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
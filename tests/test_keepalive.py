@@ -0,0 +1,51 @@
+"""
+会话保活测试
+用法: uv run python -m unittest discover tests
+"""
+
+import time
+import unittest
+from types import SimpleNamespace
+from automation.keepalive import SessionKeepAlive
+
+
+def _keepalive(*cookies: dict, session_host: str = "moodle.scnu.edu.cn") -> SessionKeepAlive:
+    session = SimpleNamespace(cookies=list(cookies))
+    return SessionKeepAlive(None, session, interval=300, expiry_margin=120, session_host=session_host)
+
+
+def _cookie(name: str, expires_in: float, domain: str = "moodle.scnu.edu.cn") -> dict:
+    return {'name': name, 'domain': domain, 'expires': time.time() + expires_in}
+
+
+class NextDelayTest(unittest.TestCase):
+
+    def test_no_expiry_uses_interval(self):
+        session_cookie = {'name': "MoodleSession", 'domain': "moodle.scnu.edu.cn", 'expires': -1}
+        self.assertEqual(_keepalive(session_cookie).next_delay(), 300)
+
+    def test_renews_before_session_cookie_expires(self):
+        delay = _keepalive(_cookie("MoodleSession", 200)).next_delay()
+        self.assertAlmostEqual(delay, 80, delta=1)
+
+    def test_ignores_other_cookies(self):
+        # 其他主机的会话Cookie和同主机的非会话Cookie都不影响续期时间
+        keepalive = _keepalive(
+            _cookie("MoodleSession", 150, domain="sso.scnu.edu.cn"),
+            _cookie("_ga", 130),
+        )
+        self.assertEqual(keepalive.next_delay(), 300)
+
+    def test_matches_parent_domain_cookie(self):
+        delay = _keepalive(_cookie("MoodleSession", 200, domain=".scnu.edu.cn")).next_delay()
+        self.assertAlmostEqual(delay, 80, delta=1)
+
+    def test_expired_cookie_does_not_spin(self):
+        self.assertEqual(_keepalive(_cookie("MoodleSession", -60)).next_delay(), 300)
+
+    def test_floor(self):
+        self.assertEqual(_keepalive(_cookie("MoodleSession", 121)).next_delay(), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+最低码率清单改写测试
+用法: uv run python -m unittest discover tests
+"""
+
+import unittest
+from types import SimpleNamespace
+from automation.media import LowBitrateProfile, select_lowest_dash_representation, select_lowest_hls_variant
+
+_MASTER_PLAYLIST = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-STREAM-INF:BANDWIDTH=2800000,RESOLUTION=1280x720
+720p.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=400000,RESOLUTION=416x234
+234p.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=1400000,RESOLUTION=842x480
+480p.m3u8
+"""
+
+_MEDIA_PLAYLIST = """#EXTM3U
+#EXT-X-TARGETDURATION:10
+#EXTINF:10.0,
+segment0.ts
+#EXT-X-ENDLIST
+"""
+
+_MPD = """<?xml version="1.0"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011"><Period>
+  <AdaptationSet contentType="video">
+    <Representation id="hi" bandwidth="3000000"/>
+    <Representation id="lo" bandwidth="300000"/>
+  </AdaptationSet>
+  <AdaptationSet contentType="audio">
+    <Representation id="a1" bandwidth="128000"/>
+    <Representation id="a2" bandwidth="64000"/>
+  </AdaptationSet>
+</Period></MPD>
+"""
+
+
+class SelectLowestVariantTest(unittest.TestCase):
+
+    def test_hls_keeps_lowest_bandwidth(self):
+        playlist = select_lowest_hls_variant(_MASTER_PLAYLIST)
+        self.assertEqual(playlist, "#EXTM3U\n#EXT-X-VERSION:3\n"
+                                   "#EXT-X-STREAM-INF:BANDWIDTH=400000,RESOLUTION=416x234\n234p.m3u8\n")
+
+    def test_hls_media_playlist_unchanged(self):
+        self.assertEqual(select_lowest_hls_variant(_MEDIA_PLAYLIST), _MEDIA_PLAYLIST)
+
+    def test_dash_only_rewrites_video(self):
+        manifest = select_lowest_dash_representation(_MPD)
+        self.assertNotIn('id="hi"', manifest)
+        self.assertIn('id="lo"', manifest)
+        self.assertIn('id="a1"', manifest)
+        self.assertIn('id="a2"', manifest)
+
+    def test_rewritten_headers_drop_length_and_encoding(self):
+        response = SimpleNamespace(headers={
+            'content-type': 'application/vnd.apple.mpegurl',
+            'content-length': '512',
+            'content-encoding': 'gzip',
+        })
+        self.assertEqual(LowBitrateProfile._rewritten_headers(response),
+                         {'content-type': 'application/vnd.apple.mpegurl'})
+
+
+if __name__ == "__main__":
+    unittest.main()
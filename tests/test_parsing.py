@@ -0,0 +1,44 @@
+"""
+HTML解析测试
+用法: uv run python -m unittest discover tests
+"""
+
+import unittest
+from automation.parsing import extract_texts
+from automation.probe import PageSelectors
+
+_VIDEO_PAGE = """
+<div id="region-main">
+  <p class="tips-completion"> 已完成 </p>
+  <img src="x.png">
+  <div class="num-gksc"><b>已观看</b><span>12<br>3.5</span></div>
+  <span>0</span>
+  <ul><li class="item">未闭合
+</div>
+"""
+
+
+class ExtractTextsTest(unittest.TestCase):
+
+    def test_page_selectors(self):
+        selectors = PageSelectors()
+        texts = extract_texts(_VIDEO_PAGE, {
+            'completion': selectors.completion,
+            'watched': selectors.watched_time,
+        })
+        self.assertEqual(texts['completion'].strip(), "已完成")
+        self.assertEqual(texts['watched'], "123.5")
+
+    def test_child_combinator_and_missing(self):
+        texts = extract_texts(_VIDEO_PAGE, {
+            'direct': "#region-main > span",
+            'descendant': "#region-main span",
+            'missing': ".not-there",
+        })
+        self.assertEqual(texts['direct'], "0")
+        self.assertEqual(texts['descendant'], "123.5")
+        self.assertIsNone(texts['missing'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+流水线回归测试
+用法: uv run python -m unittest discover tests
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from automation.pipeline import PlaybackPipeline
+from automation.prescan import PrescanResult
+
+
+class _FakeDiscovery:
+    """一个课程页面返回指定数量链接的链接发现器"""
+
+    concurrency = 2
+
+    def __init__(self, link_count: int):
+        self.link_count = link_count
+
+    async def fetch_course(self, course_url: str, url_pattern: str):
+        return [(f"{course_url}/view.php?id={i}", 0) for i in range(self.link_count)]
+
+    def save_cache(self):
+        pass
+
+
+class _FakeVideoManager:
+    """只从队列领取视频、不真正播放的视频管理器"""
+
+    def __init__(self):
+        self.page = SimpleNamespace(context=None)
+        self.selectors = None
+        self.journal = None
+        self.auth_manager = SimpleNamespace(login_host=None, update_validity=lambda valid: None)
+        self.played = []
+
+    async def run_playback_workers(self, queue, tab_count, video_selector="video", play_button_selector=None,
+                                   default_wait_time=60, total=None, stop_event=None, tab_budget=None):
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None or stop_event.is_set():
+                    return
+                self.played.append(item[1])
+
+        await asyncio.gather(*(worker() for _ in range(tab_count)))
+        return self.played, []
+
+    def record_progress(self, *args):
+        pass
+
+    def print_playback_summary(self, completed, failures, stop_event=None):
+        pass
+
+
+def _prescan_result(valid: bool):
+    async def fetch(context, url, selectors, login_host):
+        return PrescanResult(url=url, session_valid=valid)
+    return fetch
+
+
+class PlaybackPipelineTest(unittest.IsolatedAsyncioTestCase):
+
+    async def run_pipeline(self, link_count: int, session_valid: bool):
+        video_manager = _FakeVideoManager()
+        pipeline = PlaybackPipeline(video_manager, _FakeDiscovery(link_count), "view.php?id=",
+                                    tab_count=2, prescan_concurrency=4)
+        with mock.patch("automation.pipeline.fetch_prescan_result", _prescan_result(session_valid)):
+            await asyncio.wait_for(pipeline.run(["https://example.test/course"]), timeout=5)
+        return video_manager
+
+    async def test_plays_all_links(self):
+        video_manager = await self.run_pipeline(60, session_valid=True)
+        self.assertEqual(len(video_manager.played), 60)
+
+    async def test_prescan_failure_with_full_queue_stops_pipeline(self):
+        # 链接数量超过队列容量(16)时，预扫描全部出错后发现阶段会阻塞在已满的队列上
+        with self.assertRaisesRegex(Exception, "Cookie已失效"):
+            await self.run_pipeline(60, session_valid=False)
+
+    async def test_prescan_failure_with_few_links_stops_pipeline(self):
+        with self.assertRaisesRegex(Exception, "Cookie已失效"):
+            await self.run_pipeline(5, session_valid=False)
+
+
+if __name__ == "__main__":
+    unittest.main()